@@ -0,0 +1,68 @@
+"""
+Exécution des intentions système pour Jarvis Commander.
+
+Intention -> appel du contrôleur système -> réponse vocale. Partagé par
+JarvisController (vrai SystemController) et par le rejeu hors ligne
+(contrôleur enregistreur) : les deux suivent exactement les mêmes branches.
+"""
+
+import random
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Réponses aux salutations (tirées au hasard)
+GREETINGS = ["Bonjour commandant.", "Salut.", "Je suis à l'écoute.", "Systèmes prêts."]
+
+
+def execute_intent(controller, intent: str, params: Dict[str, Any]) -> Optional[Tuple[bool, str]]:
+    """
+    Exécute une intention système sur le contrôleur.
+
+    Args:
+        controller: SystemController (ou objet exposant get_app_path,
+            open_app, close_app et web_search)
+        intent: Intention analysée (ex: "open_app")
+        params: Paramètres de l'intention
+
+    Returns:
+        (succès, réponse à prononcer), ou None si l'intention n'est pas une
+        commande système (l'appelant passe la main au cerveau)
+    """
+    if intent == 'open_app':
+        app_name = params.get('app_name', '')
+        # Vérifier si l'app est connue avant de tenter l'ouverture
+        if not controller.get_app_path(app_name):
+            logger.warning(f"App inconnue demandée : {app_name}")
+            return False, f"Je ne connais pas l'application {app_name}."
+        success, real_name = controller.open_app(app_name)
+        return success, f"J'ouvre {real_name} immédiatement." if success else f"Je n'arrive pas à lancer {real_name}."
+
+    if intent == 'close_app':
+        success, real_name = controller.close_app(params.get('app_name', ''))
+        return success, f"Je ferme {real_name} pour vous." if success else f"Je ne peux pas fermer {real_name}."
+
+    if intent == 'web_search':
+        query = params.get('query', '')
+        if not query:
+            return False, "Que voulez-vous que je cherche ?"
+        success = controller.web_search(query)
+        return success, f"Je recherche '{query}' sur Comet." if success else "Impossible de lancer la recherche."
+
+    if intent == 'small_talk':
+        st_type = params.get('type', 'unknown')
+        if st_type == 'greeting':
+            response = random.choice(GREETINGS)
+        elif st_type == 'thanks':
+            response = "Je vous en prie."
+        elif st_type == 'goodbye':
+            response = "Au revoir, à bientôt."
+        elif st_type == 'status':
+            response = "Tous les systèmes sont opérationnels et prêts."
+        else:
+            response = "Je suis là."
+        return True, response
+
+    # ... Ajouter les autres intents ici ...
+    return None
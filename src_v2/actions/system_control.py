@@ -8,32 +8,48 @@ import sys
 import logging
 import subprocess
 import psutil
-import pyautogui
 import webbrowser
 import time
 from typing import Optional, List, Dict, Tuple
 from pathlib import Path
 import threading
-import difflib
+
+from utils.tracing import tracer
+from nlu.app_registry import AppRegistry
 
 logger = logging.getLogger(__name__)
 
+# Import conditionnel de pyautogui (nécessite un affichage : absent en CI / headless)
+try:
+    import pyautogui
+    PYAUTOGUI_AVAILABLE = True
+except Exception:
+    PYAUTOGUI_AVAILABLE = False
+    logger.warning("pyautogui non disponible. Contrôle clavier/souris désactivé.")
+
 
 class SystemController:
     """Contrôleur d'actions système Windows."""
     
-    def __init__(self, app_paths: Optional[Dict[str, str]] = None):
+    def __init__(self, app_paths: Optional[Dict[str, str]] = None, registry: Optional[AppRegistry] = None):
         """
         Initialise le contrôleur système.
         
         Args:
             app_paths: Dictionnaire des applications et leurs chemins
+            registry: Registre partagé avec le parseur (prioritaire sur app_paths)
         """
-        self.app_paths = app_paths or {}
+        self.registry = registry or AppRegistry(app_paths)
         
         # Configuration pyautogui pour plus de sécurité
-        pyautogui.FAILSAFE = True  # Bouger souris dans coin = arrêt
-        pyautogui.PAUSE = 0.1  # Pause entre les actions
+        if PYAUTOGUI_AVAILABLE:
+            pyautogui.FAILSAFE = True  # Bouger souris dans coin = arrêt
+            pyautogui.PAUSE = 0.1  # Pause entre les actions
+    
+    @property
+    def app_paths(self) -> Dict[str, str]:
+        """Applications connues (nom -> chemin), lues dans le registre."""
+        return self.registry.apps
     
     def set_app_paths(self, app_paths: Dict[str, str]):
         """
@@ -42,7 +58,7 @@ class SystemController:
         Args:
             app_paths: Dictionnaire {nom_app: chemin_executable}
         """
-        self.app_paths = app_paths
+        self.registry.update(apps=app_paths)
         logger.info(f"Chemins d'applications configurés : {len(app_paths)} entrées")
 
     def get_app_path(self, app_name: str) -> Optional[str]:
@@ -70,32 +86,12 @@ class SystemController:
         Returns:
             Nom exact de l'application ou None
         """
-        app_name_lower = app_name.lower().strip()
-        
-        # 1. Correspondance exacte
-        if app_name_lower in self.app_paths:
-            return app_name_lower
-        
-        # 2. Correspondance partielle (contient le mot)
-        for app_key in self.app_paths.keys():
-            if app_name_lower in app_key or app_key in app_name_lower:
-                logger.info(f"Correspondance partielle : '{app_name}' → '{app_key}'")
-                return app_key
-        
-        # 3. Correspondance floue (similitude)
-        best_match = difflib.get_close_matches(
-            app_name_lower, 
-            self.app_paths.keys(), 
-            n=1, 
-            cutoff=0.6  # 60% de similarité minimum
-        )
-        
-        if best_match:
-            logger.info(f"Correspondance floue : '{app_name}' → '{best_match[0]}'")
-            return best_match[0]
-        
-        return None
+        # Résolution partagée avec le parseur (alias, exacte, phonétique,
+        # partielle puis floue), déjà en cache si le parseur a vu ce nom
+        matched_app = self.registry.resolve(app_name)
+        return matched_app if matched_app in self.registry.apps else None
     
+    @tracer.traced('action')
     def open_app(self, app_name: str) -> Tuple[bool, str]:
         """
         Ouvre une application.
@@ -149,6 +145,7 @@ class SystemController:
             logger.error(f"Erreur lors de l'ouverture de '{matched_app}' : {e}")
             return False, matched_app
     
+    @tracer.traced('action')
     def close_app(self, app_name: str) -> Tuple[bool, str]:
         """
         Ferme une application.
@@ -219,26 +216,9 @@ class SystemController:
         Returns:
             Liste des noms de processus à rechercher
         """
-        # Mapping personnalisé
-        mapping = {
-            'chrome': ['chrome.exe'],
-            'firefox': ['firefox.exe'],
-            'edge': ['msedge.exe'],
-            'bambu_studio': ['bambustudio.exe', 'bambu'],
-            'fusion_360': ['fusion360.exe', 'fusion'],
-            'discord': ['discord.exe'],
-            'vscode': ['code.exe'],
-            'notepad': ['notepad.exe'],
-            'explorer': ['explorer.exe'],
-            'calculator': ['calc.exe', 'calculator.exe'],
-        }
-        
-        if app_name in mapping:
-            return mapping[app_name]
-        
-        # Par défaut, essayer le nom + .exe
-        return [f"{app_name}.exe", app_name]
+        return self.registry.process_names(app_name)
     
+    @tracer.traced('action')
     def scroll_down(self, amount: int = 3) -> bool:
         """
         Défile vers le bas.
@@ -257,6 +237,7 @@ class SystemController:
             logger.error(f"Erreur lors du scroll : {e}")
             return False
     
+    @tracer.traced('action')
     def scroll_up(self, amount: int = 3) -> bool:
         """
         Défile vers le haut.
@@ -275,6 +256,7 @@ class SystemController:
             logger.error(f"Erreur lors du scroll : {e}")
             return False
     
+    @tracer.traced('action')
     def type_text(self, text: str) -> bool:
         """
         Tape du texte (dictée).
@@ -299,6 +281,7 @@ class SystemController:
             logger.error(f"Erreur lors de la saisie de texte : {e}")
             return False
     
+    @tracer.traced('action')
     def close_active_window(self) -> bool:
         """
         Ferme la fenêtre active (Alt+F4).
@@ -314,6 +297,7 @@ class SystemController:
             logger.error(f"Erreur lors de la fermeture de fenêtre : {e}")
             return False
     
+    @tracer.traced('action')
     def web_search(self, query: str) -> bool:
         """
         Ouvre une recherche web (via Comet si disponible, sinon défaut).
@@ -348,12 +332,14 @@ class SystemController:
             logger.error(f"Erreur lors de la recherche web : {e}")
             return False
     
+    @tracer.traced('action')
     def search_files(
         self,
         query: str,
         extension: Optional[str] = None,
         drive: Optional[str] = None,
-        max_results: int = 50
+        max_results: int = 50,
+        roots: Optional[List[str]] = None
     ) -> List[str]:
         """
         Recherche des fichiers sur le(s) disque(s).
@@ -363,6 +349,7 @@ class SystemController:
             extension: Extension à rechercher (ex: "stl")
             drive: Lettre de lecteur (ex: "A") ou None pour tous
             max_results: Nombre maximum de résultats
+            roots: Dossiers à parcourir à la place des lecteurs
             
         Returns:
             Liste des chemins de fichiers trouvés
@@ -371,7 +358,9 @@ class SystemController:
         query_lower = query.lower()
         
         # Déterminer les lecteurs à parcourir
-        if drive:
+        if roots:
+            drives = list(roots)
+        elif drive:
             drives = [f"{drive.upper()}:\\"]
         else:
             # Tous les lecteurs disponibles
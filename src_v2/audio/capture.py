@@ -0,0 +1,445 @@
+"""
+Service de capture audio partagé pour Jarvis Commander.
+
+Un seul flux d'entrée reste ouvert en permanence et alimente un buffer
+circulaire. Le wake word, l'enregistreur STT et le visualiseur s'y abonnent
+chacun avec leur propre curseur : le passage wake word -> commande ne
+réouvre plus le micro et aucun échantillon n'est perdu entre les deux.
+
+La source peut être le micro (sounddevice), un fichier WAV ou un signal
+synthétique, ce qui permet de faire tourner le pipeline sans matériel.
+
+Le callback audio ne prend aucun verrou partagé avec les lecteurs : il écrit
+dans le buffer (sans verrou), puis lève l'Event de chaque abonné. La liste
+des Events est remplacée (copie) à chaque abonnement, jamais modifiée en place.
+"""
+
+import logging
+import threading
+import time
+import wave
+import numpy as np
+from typing import Optional, Callable, List, Tuple
+
+from .ring_buffer import AudioRingBuffer
+
+logger = logging.getLogger(__name__)
+
+# Tentatives de relecture quand l'écrivain écrase la zone lue (lecteur en retard)
+OVERRUN_RETRIES = 3
+
+# Import conditionnel de sounddevice (absent sur une machine sans PortAudio)
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError):
+    SOUNDDEVICE_AVAILABLE = False
+    logger.warning("sounddevice non disponible. Seules les sources fichier/synthétiques fonctionneront.")
+
+
+def load_wav(path: str, sample_rate: int = 16000) -> np.ndarray:
+    """
+    Charge un fichier WAV PCM en float32 mono à la fréquence demandée.
+
+    Args:
+        path: Chemin du fichier WAV
+        sample_rate: Fréquence d'échantillonnage cible
+
+    Returns:
+        Échantillons float32 dans [-1, 1]
+    """
+    with wave.open(path, 'rb') as wf:
+        channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        rate = wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+
+    if width == 2:
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype=np.int32).astype(np.float32) / 2147483648.0
+    elif width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    else:
+        raise ValueError(f"Format WAV non supporté ({width * 8} bits)")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+
+    if rate != sample_rate and len(samples) > 0:
+        # Rééchantillonnage linéaire (suffisant pour de la voix)
+        duration = len(samples) / rate
+        target_len = int(round(duration * sample_rate))
+        samples = np.interp(
+            np.linspace(0.0, len(samples) - 1, target_len),
+            np.arange(len(samples)),
+            samples
+        ).astype(np.float32)
+
+    return samples
+
+
+class MicrophoneSource:
+    """Source micro via un unique sd.InputStream."""
+
+    def __init__(self, device_index: Optional[int] = None):
+        self.device_index = device_index
+        self.stream = None
+
+    def start(self, push: Callable[[np.ndarray], None], sample_rate: int, blocksize: int):
+        if not SOUNDDEVICE_AVAILABLE:
+            raise RuntimeError("sounddevice non disponible")
+
+        def audio_callback(indata, frames, time_info, status):
+            if status:
+                logger.warning(f"Status audio : {status}")
+            push(indata[:, 0])
+
+        logger.info(f"🔍 Ouverture du flux audio partagé sur le device #{self.device_index}")
+        self.stream = sd.InputStream(
+            samplerate=sample_rate,
+            channels=1,
+            dtype='float32',
+            callback=audio_callback,
+            device=self.device_index,
+            blocksize=blocksize
+        )
+        self.stream.start()
+
+    def stop(self):
+        if self.stream is not None:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            finally:
+                self.stream = None
+
+
+class ArraySource:
+    """Source synthétique : rejoue un tableau d'échantillons bloc par bloc."""
+
+    def __init__(self, samples: np.ndarray, realtime: bool = True, loop: bool = False, pad_silence: float = 0.0):
+        """
+        Args:
+            samples: Échantillons float32 mono
+            realtime: Respecter la cadence réelle (sinon aussi vite que possible)
+            loop: Reboucler à la fin
+            pad_silence: Secondes de silence ajoutées à la fin (laisse finir l'endpointing)
+        """
+        self.samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        self.realtime = realtime
+        self.loop = loop
+        self.pad_silence = pad_silence
+        self.finished = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, push: Callable[[np.ndarray], None], sample_rate: int, blocksize: int):
+        samples = self.samples
+        if self.pad_silence > 0:
+            samples = np.concatenate([samples, np.zeros(int(self.pad_silence * sample_rate), dtype=np.float32)])
+
+        def run():
+            block_duration = blocksize / sample_rate
+            next_time = time.monotonic()
+            while not self._stop.is_set():
+                for start in range(0, len(samples), blocksize):
+                    if self._stop.is_set():
+                        break
+                    block = samples[start:start + blocksize]
+                    if len(block) < blocksize:
+                        block = np.pad(block, (0, blocksize - len(block)))
+                    push(block)
+                    if self.realtime:
+                        next_time += block_duration
+                        delay = next_time - time.monotonic()
+                        if delay > 0:
+                            time.sleep(delay)
+                if not self.loop:
+                    break
+            self.finished.set()
+
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=run, daemon=True, name="AudioSource")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+
+class WavFileSource(ArraySource):
+    """Source fichier WAV (tests sans micro)."""
+
+    def __init__(self, path: str, sample_rate: int = 16000, **kwargs):
+        self.path = path
+        super().__init__(load_wav(path, sample_rate), **kwargs)
+
+
+class AudioSubscription:
+    """Lecteur abonné au flux partagé, avec son propre curseur."""
+
+    def __init__(self, service: 'AudioCaptureService', name: str, position: int):
+        self.service = service
+        self.name = name
+        self.position = position
+        # Retards (buffer écrasé avant lecture) et échantillons perdus en tout
+        self.overruns = 0
+        self.lost_samples = 0
+        # Levé par le callback audio à chaque bloc (réveil sans verrou partagé)
+        self.data_ready = threading.Event()
+
+    def available(self) -> int:
+        """Nombre d'échantillons prêts à être lus."""
+        return self.service.ring.write_position - self.position
+
+    def skip_to_end(self):
+        """Abandonne les échantillons en attente."""
+        self.position = self.service.ring.write_position
+
+    def read(
+        self,
+        count: Optional[int] = None,
+        timeout: Optional[float] = None,
+        out: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Lit les prochains échantillons du flux.
+
+        Args:
+            count: Nombre exact d'échantillons (None = tout ce qui est disponible, au moins 1)
+            timeout: Attente maximale en secondes (None = infini)
+            out: Tableau de destination préalloué (avec `count`), évite une allocation
+
+        Returns:
+            Échantillons float32, ou None si le délai est écoulé (ou le service
+            arrêté). Un retard ne renvoie pas None : la lecture reprend au plus
+            ancien échantillon intact, et la perte est comptée dans `overruns`
+            et `lost_samples`.
+        """
+        ring = self.service.ring
+        needed = count or 1
+
+        if self.available() < needed:
+            if not self.service.wait_for_data(self.position + needed, timeout, self.data_ready):
+                return None
+
+        for _ in range(OVERRUN_RETRIES):
+            # Lecteur trop lent : le buffer a tourné, on repart du plus ancien échantillon
+            if self.position < ring.oldest_position:
+                self._skip_lost(ring.oldest_position)
+
+            size = count if count else ring.write_position - self.position
+            samples = ring.read(self.position, size, out if count else None)
+            if samples is not None:
+                self.position += size
+                return samples
+            # Zone écrasée pendant la copie : relire après la zone en cours d'écriture
+            self._skip_lost(max(ring.intact_position, self.position + 1))
+        return None
+
+    def _skip_lost(self, position: int):
+        """Saute à `position` en comptant les échantillons perdus."""
+        lost = position - self.position
+        self.overruns += 1
+        self.lost_samples += lost
+        logger.warning(f"Abonné '{self.name}' en retard, {lost} échantillons perdus")
+        self.position = position
+
+    def close(self):
+        """Se désabonne du flux."""
+        self.service.unsubscribe(self)
+
+
+class AudioCaptureService:
+    """Capture audio persistante partagée entre wake word, STT et visualiseur."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        blocksize: int = 512,
+        device_index: Optional[int] = None,
+        buffer_duration: float = 10.0,
+        source=None,
+        level_callback: Optional[Callable[[float], None]] = None
+    ):
+        """
+        Initialise le service de capture.
+
+        Args:
+            sample_rate: Fréquence d'échantillonnage (16 kHz pour Porcupine et Whisper)
+            blocksize: Taille des blocs du flux (512 = une frame Porcupine)
+            device_index: Index du périphérique d'entrée (source micro)
+            buffer_duration: Historique conservé dans le buffer circulaire (secondes)
+            source: Source alternative (ArraySource, WavFileSource), micro si None
+            level_callback: Fonction appelée avec le niveau audio (0.0 à 1.0)
+        """
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self.device_index = device_index
+        self.source = source or MicrophoneSource(device_index)
+        self.level_callback = level_callback
+        self.ring = AudioRingBuffer(int(buffer_duration * sample_rate))
+        self.subscribers: List[AudioSubscription] = []
+        self.is_running = False
+        self.blocks_received = 0
+        self.last_push_time = 0.0
+        # Events levés à chaque bloc : tuple remplacé (copie) à chaque modification,
+        # le callback audio le parcourt sans verrou
+        self._wakeups: Tuple[threading.Event, ...] = ()
+        self._wakeups_lock = threading.Lock()
+
+    @property
+    def position(self) -> int:
+        """Position absolue courante du flux (en échantillons)."""
+        return self.ring.write_position
+
+    def time_at(self, position: int) -> float:
+        """
+        Estime l'instant (time.monotonic) où l'échantillon `position` a été reçu.
+
+        Args:
+            position: Position absolue dans le flux
+
+        Returns:
+            Instant estimé, à partir du dernier bloc reçu
+        """
+        return self.last_push_time - (self.ring.write_position - position) / self.sample_rate
+
+    def start(self) -> bool:
+        """
+        Ouvre la source audio une fois pour toutes.
+
+        Returns:
+            True si démarré avec succès, False sinon
+        """
+        if self.is_running:
+            return True
+
+        try:
+            self.source.start(self._push, self.sample_rate, self.blocksize)
+            self.is_running = True
+            logger.info("✅ Capture audio partagée démarrée")
+            return True
+        except Exception as e:
+            logger.error(f"Erreur démarrage capture audio : {e}")
+            self.is_running = False
+            return False
+
+    def stop(self):
+        """Ferme la source audio et réveille les lecteurs en attente."""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        try:
+            self.source.stop()
+        except Exception as e:
+            logger.error(f"Erreur arrêt capture audio : {e}")
+
+        self._wake_all()
+        logger.info("Capture audio partagée arrêtée")
+
+    def subscribe(self, name: str, start_position: Optional[int] = None) -> AudioSubscription:
+        """
+        Crée un abonné au flux.
+
+        Args:
+            name: Nom de l'abonné (pour les logs)
+            start_position: Position de départ (None = maintenant). Une position
+                passée relit l'historique encore présent dans le buffer.
+
+        Returns:
+            L'abonnement
+        """
+        if start_position is None:
+            position = self.ring.write_position
+        else:
+            position = max(self.ring.oldest_position, min(start_position, self.ring.write_position))
+
+        subscription = AudioSubscription(self, name, position)
+        self.subscribers.append(subscription)
+        self._add_wakeup(subscription.data_ready)
+        logger.debug(f"Abonné audio ajouté : {name} (position {position})")
+        return subscription
+
+    def unsubscribe(self, subscription: AudioSubscription):
+        """Retire un abonné."""
+        try:
+            self.subscribers.remove(subscription)
+        except ValueError:
+            pass
+        self._remove_wakeup(subscription.data_ready)
+
+    def _add_wakeup(self, event: threading.Event):
+        """Inscrit un Event à lever à chaque bloc."""
+        with self._wakeups_lock:
+            self._wakeups = self._wakeups + (event,)
+
+    def _remove_wakeup(self, event: threading.Event):
+        """Désinscrit un Event."""
+        with self._wakeups_lock:
+            self._wakeups = tuple(e for e in self._wakeups if e is not event)
+
+    def _wake_all(self):
+        """Lève l'Event de chaque lecteur (aucun verrou partagé avec les lecteurs)."""
+        for event in self._wakeups:
+            # Déjà levé (lecteur pas encore réveillé) : inutile de reprendre son verrou interne
+            if not event.is_set():
+                event.set()
+
+    def wait_for_data(self, position: int, timeout: Optional[float] = None,
+                      event: Optional[threading.Event] = None) -> bool:
+        """
+        Bloque jusqu'à ce que le flux ait atteint `position`.
+
+        Args:
+            position: Position absolue attendue
+            timeout: Attente maximale en secondes (None = infini)
+            event: Event de l'abonné (None = Event temporaire inscrit le temps de l'attente)
+
+        Returns:
+            True si les données sont disponibles, False si délai écoulé ou service arrêté
+        """
+        if self.ring.write_position >= position:
+            return True
+        temporary = event is None
+        if temporary:
+            event = threading.Event()
+            self._add_wakeup(event)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while self.ring.write_position < position:
+                if not self.is_running:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                # Baisser l'Event puis revérifier : un bloc (ou un arrêt) arrivé
+                # entre-temps ne doit pas être manqué
+                event.clear()
+                if self.ring.write_position >= position or not self.is_running:
+                    continue
+                event.wait(remaining)
+            return True
+        finally:
+            if temporary:
+                self._remove_wakeup(event)
+
+    def _push(self, block: np.ndarray):
+        """Reçoit un bloc de la source (thread audio)."""
+        self.ring.write(block)
+        self.last_push_time = time.monotonic()
+        self.blocks_received += 1
+
+        self._wake_all()
+
+        if self.level_callback:
+            rms = float(np.sqrt(np.mean(np.square(block))))
+            try:
+                self.level_callback(min(1.0, rms * 10))
+            except Exception:
+                pass
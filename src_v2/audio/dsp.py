@@ -0,0 +1,290 @@
+"""
+Traitements audio en flux pour Jarvis Commander.
+
+Les filtres sont appliqués bloc par bloc pendant la capture, avec un état
+conservé d'un bloc à l'autre : quand l'enregistrement s'arrête, l'audio est
+déjà filtré et aucune passe supplémentaire n'est nécessaire.
+"""
+
+import logging
+import numpy as np
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Import conditionnel de scipy pour filtrage audio
+try:
+    from scipy import signal
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+    logger.warning("scipy non installé. Filtres audio désactivés (pip install scipy)")
+
+# Bande de la voix humaine
+VOICE_LOWCUT = 300.0    # Supprime les basses (< 300 Hz) = musique de film
+VOICE_HIGHCUT = 3400.0  # Supprime les aigus (> 3400 Hz) = bruits parasites
+# Ordre 5 = bon compromis entre performance et qualité
+BANDPASS_ORDER = 5
+
+
+@lru_cache(maxsize=8)
+def design_bandpass(
+    sample_rate: int,
+    lowcut: float = VOICE_LOWCUT,
+    highcut: float = VOICE_HIGHCUT,
+    order: int = BANDPASS_ORDER
+) -> Optional[np.ndarray]:
+    """
+    Calcule (une seule fois par jeu de paramètres) un passe-bande Butterworth.
+
+    Args:
+        sample_rate: Fréquence d'échantillonnage
+        lowcut: Fréquence de coupure basse (Hz)
+        highcut: Fréquence de coupure haute (Hz)
+        order: Ordre du filtre
+
+    Returns:
+        Coefficients en sections du second ordre (SOS), None sans scipy
+    """
+    if not SCIPY_AVAILABLE:
+        return None
+
+    nyquist = sample_rate / 2.0
+    # La coupure haute doit rester sous Nyquist (ex: 8 kHz)
+    high = min(highcut, nyquist * 0.99) / nyquist
+    return signal.butter(order, [lowcut / nyquist, high], btype='band', output='sos')
+
+
+class StreamingBandpass:
+    """
+    Passe-bande causal appliqué bloc par bloc.
+
+    L'état interne du filtre est conservé entre les blocs : filtrer un
+    enregistrement morceau par morceau donne le même résultat qu'en une fois.
+    """
+
+    def __init__(self, sample_rate: int):
+        """
+        Initialise le filtre.
+
+        Args:
+            sample_rate: Fréquence d'échantillonnage
+        """
+        self.sample_rate = sample_rate
+        self.sos = design_bandpass(sample_rate)
+        self._zi = None
+
+    @property
+    def enabled(self) -> bool:
+        """True si le filtrage est actif (scipy disponible)."""
+        return self.sos is not None
+
+    def reset(self):
+        """Oublie l'état du filtre (nouvel enregistrement)."""
+        self._zi = None
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """
+        Filtre un bloc audio.
+
+        Args:
+            chunk: Bloc float32 (N,) ou (N, 1)
+
+        Returns:
+            Bloc filtré float32, de même forme (inchangé si scipy est absent)
+        """
+        if self.sos is None or len(chunk) == 0:
+            return chunk
+
+        samples = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        if self._zi is None:
+            # Démarrage en régime établi sur le premier échantillon (pas de claquement)
+            self._zi = signal.sosfilt_zi(self.sos) * samples[0]
+
+        filtered, self._zi = signal.sosfilt(self.sos, samples, zi=self._zi)
+        return filtered.astype(np.float32).reshape(np.shape(chunk))
+
+
+# Taille des trames STFT (32 ms à 16 kHz), recouvrement de 50 %
+NOISE_FFT_SIZE = 512
+
+
+def _analysis_window(fft_size: int) -> np.ndarray:
+    """Racine d'une fenêtre de Hann périodique (reconstruction parfaite à 50 %)."""
+    return np.sqrt(0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(fft_size) / fft_size)).astype(np.float32)
+
+
+class NoiseProfile:
+    """
+    Spectre de puissance moyen du bruit de fond, mis à jour en continu.
+
+    Alimenté par l'audio écouté au repos (wake word) et par les blocs sans
+    parole des commandes. Les trames nettement plus fortes que le profil
+    (parole probable) sont ignorées, sauf si le niveau reste élevé : le
+    fond sonore a alors réellement changé (film plus fort) et le profil suit.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        fft_size: int = NOISE_FFT_SIZE,
+        time_constant: float = 4.0,
+        speech_ratio: float = 4.0,
+        min_frames: int = 8
+    ):
+        """
+        Initialise le profil.
+
+        Args:
+            sample_rate: Fréquence d'échantillonnage
+            fft_size: Taille des trames d'analyse
+            time_constant: Constante de temps de la moyenne glissante (secondes)
+            speech_ratio: Rapport d'énergie au-delà duquel une trame est ignorée
+            min_frames: Trames nécessaires avant que le profil soit utilisable
+        """
+        self.sample_rate = sample_rate
+        self.fft_size = fft_size
+        self.speech_ratio = speech_ratio
+        self.min_frames = min_frames
+        self.window = _analysis_window(fft_size)
+        # Poids de chaque nouvelle trame dans la moyenne exponentielle
+        self._alpha = min(1.0, fft_size / (time_constant * sample_rate))
+        # Trames rejetées consécutives tolérées avant d'accepter un nouveau niveau (3 s)
+        self._max_rejected = int(3.0 * sample_rate / fft_size)
+        self._rejected = 0
+        self.power: Optional[np.ndarray] = None
+        self.frames = 0
+
+    @property
+    def ready(self) -> bool:
+        """True quand assez de bruit a été observé pour débruiter."""
+        return self.power is not None and self.frames >= self.min_frames
+
+    def update(self, samples: np.ndarray):
+        """
+        Intègre des échantillons de bruit de fond au profil.
+
+        Args:
+            samples: Audio float32 (seules les trames complètes sont utilisées)
+        """
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        count = len(samples) // self.fft_size
+        if count == 0:
+            return
+
+        frames = samples[:count * self.fft_size].reshape(count, self.fft_size)
+        spectra = np.fft.rfft(frames * self.window, axis=1)
+        powers = spectra.real ** 2 + spectra.imag ** 2
+
+        # Le tableau est remplacé (jamais modifié en place) : un lecteur
+        # concurrent voit toujours un profil complet
+        power = self.power
+        for frame_power in powers:
+            if power is None:
+                power = frame_power
+            else:
+                if self.ready and frame_power.sum() > self.speech_ratio * power.sum():
+                    self._rejected += 1
+                    if self._rejected < self._max_rejected:
+                        continue
+                self._rejected = 0
+                power = power + self._alpha * (frame_power - power)
+            self.frames += 1
+        self.power = power
+
+
+class StreamingNoiseSuppressor:
+    """
+    Soustraction spectrale en flux (STFT, recouvrement-addition).
+
+    Chaque bloc est traité dès son arrivée avec le profil de bruit courant ;
+    la sortie a la même longueur que l'entrée, retardée de `latency`
+    échantillons (32 ms). Tant que le profil n'est pas prêt, le signal
+    traverse sans modification.
+    """
+
+    def __init__(
+        self,
+        profile: NoiseProfile,
+        over_subtraction: float = 1.5,
+        prop_decrease: float = 0.8,
+        gain_floor: float = 0.1
+    ):
+        """
+        Initialise le débruiteur.
+
+        Args:
+            profile: Profil de bruit partagé
+            over_subtraction: Facteur appliqué au bruit estimé
+            prop_decrease: Agressivité (0 = aucun effet, 1 = soustraction complète)
+            gain_floor: Gain minimal par fréquence (évite le bruit musical)
+        """
+        self.profile = profile
+        self.fft_size = profile.fft_size
+        self.hop = self.fft_size // 2
+        self.window = profile.window
+        self.over_subtraction = over_subtraction
+        self.prop_decrease = prop_decrease
+        self.gain_floor = gain_floor
+        self.latency = self.fft_size
+        self.reset()
+
+    def reset(self):
+        """Réinitialise l'état du flux (nouvel enregistrement)."""
+        # Fin de l'entrée pas encore analysée
+        self._history = np.zeros(self.fft_size - self.hop, dtype=np.float32)
+        # Recouvrement de la trame précédente
+        self._overlap = np.zeros(self.fft_size - self.hop, dtype=np.float32)
+        # Sortie prête ; démarre par un saut de silence pour rendre des blocs complets
+        self._output = np.zeros(self.hop, dtype=np.float32)
+
+    def _gains(self, powers: np.ndarray) -> Optional[np.ndarray]:
+        """Gain spectral par trame et par fréquence (None = pas de débruitage)."""
+        noise = self.profile.power
+        if noise is None or not self.profile.ready:
+            return None
+        ratio = 1.0 - self.over_subtraction * noise / np.maximum(powers, 1e-12)
+        gains = np.sqrt(np.clip(ratio, self.gain_floor ** 2, 1.0))
+        return 1.0 - self.prop_decrease * (1.0 - gains)
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """
+        Débruite un bloc audio.
+
+        Args:
+            chunk: Bloc float32 (N,) ou (N, 1)
+
+        Returns:
+            Bloc débruité float32 de même forme
+        """
+        if len(chunk) == 0:
+            return chunk
+
+        samples = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        buffer = np.concatenate([self._history, samples])
+        count = (len(buffer) - self.fft_size) // self.hop + 1 if len(buffer) >= self.fft_size else 0
+
+        produced = [self._output]
+        if count > 0:
+            # Toutes les trames du bloc en une seule FFT
+            frames = np.lib.stride_tricks.sliding_window_view(buffer, self.fft_size)[::self.hop][:count]
+            spectra = np.fft.rfft(frames * self.window, axis=1)
+            gains = self._gains(spectra.real ** 2 + spectra.imag ** 2)
+            if gains is not None:
+                spectra *= gains
+            synthesized = np.fft.irfft(spectra, n=self.fft_size, axis=1).astype(np.float32) * self.window
+
+            overlap = self._overlap
+            for segment in synthesized:
+                segment[:len(overlap)] += overlap
+                produced.append(segment[:self.hop])
+                overlap = segment[self.hop:]
+            self._overlap = overlap.copy()
+            self._history = buffer[count * self.hop:]
+        else:
+            self._history = buffer
+
+        output = np.concatenate(produced)
+        self._output = output[len(samples):]
+        return output[:len(samples)].reshape(np.shape(chunk))
@@ -0,0 +1,101 @@
+"""
+Détection adaptative de fin de commande pour Jarvis Commander.
+
+Au lieu d'attendre toujours `silence_duration` (0.8 s) de silence, la durée
+exigée dépend de ce que l'on sait déjà de la phrase :
+- l'hypothèse partielle du décodage en streaming couvre toute la parole et
+  forme une commande complète de la grammaire ("ouvre chrome") : silence court ;
+- ce texte n'est pas une commande complète ("ouvre", "cherche ...") :
+  silence complet, l'utilisateur hésite ou dicte un texte libre ;
+- sans vérification de grammaire (pas de streaming) : si la phrase est
+  brève et que la VAD ne voit plus aucune trace de voix (probabilité
+  retombée à zéro, pas de reprise), silence réduit ;
+- sinon : silence complet. Avec la grammaire, on attend le texte partiel
+  plutôt que de parier sur la VAD : une hésitation ("ouvre... chrome")
+  dépasse souvent le silence réduit.
+"""
+
+import logging
+from typing import Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+# Marge (secondes) qu'une hypothèse doit couvrir après la dernière parole
+TRANSCRIPT_MARGIN = 0.15
+
+
+class AdaptiveEndpointer:
+    """Calcule le silence nécessaire pour clore un enregistrement."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        silence_duration: float = 0.8,
+        short_silence: float = 0.6,
+        command_silence: float = 0.3,
+        short_utterance: float = 1.2,
+        quiet_probability: float = 0.02,
+        command_checker: Optional[Callable[[str], bool]] = None
+    ):
+        """
+        Initialise l'endpointer.
+
+        Args:
+            sample_rate: Fréquence d'échantillonnage
+            silence_duration: Silence exigé par défaut (secondes)
+            short_silence: Silence exigé après une phrase brève, sans reprise de voix
+            command_silence: Silence exigé quand le texte partiel est une commande complète
+            short_utterance: Durée de voix (secondes) en dessous de laquelle une phrase est brève
+            quiet_probability: Probabilité VAD lissée sous laquelle la voix est considérée éteinte
+            command_checker: Fonction texte -> bool indiquant une commande complète
+                (ex: IntentParser.is_complete_command)
+        """
+        self.sample_rate = sample_rate
+        self.silence_duration = silence_duration
+        self.short_silence = min(short_silence, silence_duration)
+        self.command_silence = min(command_silence, silence_duration)
+        self.short_utterance = short_utterance
+        self.quiet_probability = quiet_probability
+        self.command_checker = command_checker
+        self._checked_text: Optional[str] = None
+        self._checked_result = False
+
+    def _is_complete(self, texte: str) -> bool:
+        """Vérifie la grammaire (résultat mémorisé pour le dernier texte)."""
+        if texte != self._checked_text:
+            self._checked_text = texte
+            try:
+                self._checked_result = bool(self.command_checker(texte))
+            except Exception as e:
+                logger.warning(f"Erreur de vérification de commande : {e}")
+                self._checked_result = False
+        return self._checked_result
+
+    def required_silence(self, session) -> int:
+        """
+        Silence (en échantillons) à atteindre pour terminer la session.
+
+        Args:
+            session: _RecordingSession en cours (VAD, hypothèse partielle)
+
+        Returns:
+            Nombre d'échantillons de silence requis
+        """
+        vad = session.vad
+
+        # 1. Texte partiel couvrant toute la parole : la grammaire décide
+        #    ("ouvre chrome" -> silence court, "ouvre" -> on attend la suite)
+        if self.command_checker and session.partial_text is not None:
+            margin = int(TRANSCRIPT_MARGIN * self.sample_rate)
+            if session.partial_samples >= session.last_speech_end + margin:
+                if self._is_complete(session.partial_text):
+                    return int(self.command_silence * self.sample_rate)
+                return int(self.silence_duration * self.sample_rate)
+
+        # 2. Sans grammaire : phrase brève et voix complètement éteinte (tendance VAD)
+        if not self.command_checker:
+            voiced = vad.speech_frames * vad.frame_length / self.sample_rate
+            if voiced <= self.short_utterance and vad.probability <= self.quiet_probability:
+                return int(self.short_silence * self.sample_rate)
+
+        return int(self.silence_duration * self.sample_rate)
@@ -0,0 +1,161 @@
+"""
+Buffer circulaire audio préalloué pour Jarvis Commander.
+
+Un seul écrivain (le callback de capture) et plusieurs lecteurs, chacun avec
+son propre curseur. L'écrivain ne prend jamais de verrou (principe du
+seqlock) : il annonce d'abord jusqu'où il va écrire, copie les échantillons,
+puis publie la nouvelle position d'écriture. Un lecteur vérifie après sa
+copie que la zone lue n'a pas été, ni n'est en train d'être, écrasée.
+"""
+
+import logging
+import numpy as np
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AudioRingBuffer:
+    """Buffer circulaire NumPy (un écrivain, lecteurs multiples, sans verrou)."""
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        """
+        Initialise le buffer.
+
+        Args:
+            capacity: Nombre d'échantillons conservés
+            dtype: Type NumPy des échantillons (float32 par défaut)
+        """
+        if capacity <= 0:
+            raise ValueError("La capacité du buffer doit être positive")
+
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self._data = np.zeros(self.capacity, dtype=self.dtype)
+        # Nombre total d'échantillons écrits depuis la création (position absolue)
+        self._write_pos = 0
+        # Fin de la zone en cours d'écriture (annoncée avant la copie)
+        self._writing_pos = 0
+
+    @property
+    def write_position(self) -> int:
+        """Position absolue du prochain échantillon écrit."""
+        return self._write_pos
+
+    @property
+    def oldest_position(self) -> int:
+        """Position absolue du plus ancien échantillon encore disponible."""
+        return max(0, self._write_pos - self.capacity)
+
+    @property
+    def intact_position(self) -> int:
+        """Première position qu'aucune écriture, terminée ou en cours, n'a écrasée."""
+        return max(0, self._writing_pos - self.capacity)
+
+    def write(self, samples: np.ndarray) -> int:
+        """
+        Ajoute des échantillons (appelé uniquement par l'écrivain).
+
+        Args:
+            samples: Échantillons mono à ajouter
+
+        Returns:
+            Nouvelle position d'écriture
+        """
+        samples = np.asarray(samples).reshape(-1)
+        count = len(samples)
+        if count == 0:
+            return self._write_pos
+
+        # Si le bloc dépasse la capacité, seuls les derniers échantillons comptent
+        if count > self.capacity:
+            samples = samples[-self.capacity:]
+
+        # Annonce avant la copie : un lecteur de la zone écrasée saura qu'elle est en cours d'écriture
+        self._writing_pos = self._write_pos + count
+
+        start = (self._write_pos + count - len(samples)) % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        if first < len(samples):
+            self._data[:len(samples) - first] = samples[first:]
+
+        # Publication après la copie : les lecteurs ne voient que des données complètes
+        self._write_pos += count
+        return self._write_pos
+
+    def read(self, position: int, count: int, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Copie les échantillons [position, position + count).
+
+        Args:
+            position: Position absolue du premier échantillon
+            count: Nombre d'échantillons à lire
+            out: Tableau de destination optionnel (évite une allocation)
+
+        Returns:
+            Les échantillons, ou None s'ils ont été écrasés ou ne sont pas encore écrits
+        """
+        if count <= 0:
+            return np.zeros(0, dtype=self.dtype) if out is None else out[:0]
+
+        if position < self.intact_position or position + count > self._write_pos:
+            return None
+
+        if out is None:
+            out = np.empty(count, dtype=self.dtype)
+
+        start = position % self.capacity
+        first = min(count, self.capacity - start)
+        out[:first] = self._data[start:start + first]
+        if first < count:
+            out[first:count] = self._data[:count - first]
+
+        # L'écrivain a pu avancer pendant la copie : vérifier que rien n'a été
+        # écrasé, y compris par une écriture encore en cours
+        if position < self.intact_position:
+            return None
+
+        return out[:count]
+
+    def view(self, position: int, count: int, scratch: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Retourne les échantillons [position, position + count) sans copie si possible.
+
+        La vue pointe directement dans le buffer : elle n'est valable que tant
+        que l'écrivain n'a pas fait un tour complet. Si la zone chevauche la fin
+        du buffer, les échantillons sont copiés dans `scratch`.
+
+        Args:
+            position: Position absolue du premier échantillon
+            count: Nombre d'échantillons
+            scratch: Tableau de secours pour le cas non contigu
+
+        Returns:
+            Vue (ou copie) des échantillons, None s'ils ne sont pas disponibles
+        """
+        if position < self.intact_position or position + count > self._write_pos:
+            return None
+
+        start = position % self.capacity
+        if start + count <= self.capacity:
+            return self._data[start:start + count]
+        return self.read(position, count, scratch)
+
+    def latest(self, count: int) -> np.ndarray:
+        """
+        Retourne une copie des `count` derniers échantillons disponibles.
+
+        Args:
+            count: Nombre d'échantillons souhaités
+
+        Returns:
+            Les échantillons (éventuellement moins si le buffer n'est pas plein)
+        """
+        for _ in range(3):
+            end = self._write_pos
+            start = max(self.intact_position, end - int(count))
+            samples = self.read(start, end - start)
+            if samples is not None:
+                return samples
+        return np.zeros(0, dtype=self.dtype)
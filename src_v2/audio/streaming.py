@@ -0,0 +1,165 @@
+"""
+Transcription en streaming pour Jarvis Commander.
+
+Pendant l'enregistrement d'une commande, un thread décode régulièrement
+l'audio déjà capté et publie des hypothèses partielles. Dès que l'utilisateur
+se tait, un décodage "spéculatif" est lancé sur l'audio complet : quand la fin
+de parole est confirmée (silence), le texte final est en général déjà prêt et
+aucun décodage supplémentaire n'est nécessaire.
+"""
+
+import logging
+import threading
+import time
+import numpy as np
+from typing import Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+# Marge de silence (secondes) qu'une hypothèse doit couvrir après la parole
+# pour être réutilisée comme texte final
+SPEECH_END_MARGIN = 0.15
+
+
+class StreamingTranscriber:
+    """Décodage incrémental d'une session d'enregistrement STT."""
+
+    def __init__(
+        self,
+        engine,
+        partial_interval: float = 0.5,
+        partial_callback: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Initialise le transcripteur.
+
+        Args:
+            engine: STTEngine fournissant le prétraitement et le décodage
+            partial_interval: Intervalle minimal entre deux hypothèses (secondes)
+            partial_callback: Fonction appelée avec chaque hypothèse partielle
+        """
+        self.engine = engine
+        self.partial_interval = partial_interval
+        self.partial_callback = partial_callback
+        self.session = None
+
+        # Dernière hypothèse et nombre d'échantillons qu'elle couvre
+        self.last_text: Optional[str] = None
+        self.decoded_samples = 0
+        # La dernière hypothèse a-t-elle eu droit à la cascade de modèles ?
+        self.last_final = False
+        self.partial_count = 0
+        # Dernière hypothèse périodique (toujours décodée par Whisper, jamais
+        # lue dans le cache) : garde-fou des succès du cache de transcriptions
+        self.last_partial: Optional[str] = None
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, session):
+        """
+        Commence à suivre une session d'enregistrement.
+
+        Args:
+            session: _RecordingSession alimentée par l'enregistreur
+        """
+        self.session = session
+        session.on_chunk = self._wake.set
+        self._thread = threading.Thread(target=self._run, daemon=True, name="STT_Streaming")
+        self._thread.start()
+
+    def _speech_covered(self) -> bool:
+        """True si la dernière hypothèse couvre toute la parole et vaut texte final."""
+        margin = int(SPEECH_END_MARGIN * self.engine.sample_rate)
+        return (
+            self.last_text is not None
+            and self.last_final
+            and self.decoded_samples >= self.session.last_speech_end + margin
+        )
+
+    def _run(self):
+        """Boucle du thread de décodage."""
+        interval_samples = int(self.partial_interval * self.engine.sample_rate)
+        last_decode_time = 0.0
+
+        while not self._stop.is_set():
+            self._wake.wait(timeout=self.partial_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+
+            session = self.session
+            if not session.has_speech:
+                continue
+
+            # Silence après la parole (au-delà de la marge) : décodage
+            # spéculatif du texte final, qui couvrira toute la parole
+            in_silence = session.silent_count >= int(SPEECH_END_MARGIN * self.engine.sample_rate)
+            speculative = in_silence and not self._speech_covered()
+            periodic = (
+                session.total_samples - self.decoded_samples >= interval_samples
+                and time.monotonic() - last_decode_time >= self.partial_interval
+            )
+            if not (speculative or periodic):
+                continue
+
+            audio = session.snapshot()
+            try:
+                # Seul le décodage spéculatif (futur texte final) passe par la cascade
+                texte = self.engine._decode(
+                    self.engine._preprocess_audio(audio), cascade=speculative, partial=self.last_partial
+                )
+            except Exception as e:
+                logger.warning(f"Erreur de décodage partiel : {e}")
+                continue
+            last_decode_time = time.monotonic()
+
+            if texte is None:
+                continue
+            self.last_text = texte
+            if not speculative:
+                self.last_partial = texte
+            self.last_final = speculative or self.engine.fallback_model is None
+            self.decoded_samples = len(audio)
+            # Exposé à l'endpointer (vérification de la grammaire)
+            session.partial_text = texte
+            session.partial_samples = len(audio)
+            self.partial_count += 1
+
+            if texte and self.partial_callback:
+                try:
+                    self.partial_callback(texte)
+                except Exception as e:
+                    logger.error(f"Erreur dans le callback partiel : {e}")
+
+    def _stop_worker(self):
+        """Arrête le thread (attend la fin du décodage en cours)."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.engine.max_duration)
+        if self.session is not None:
+            self.session.on_chunk = None
+
+    def cancel(self):
+        """Abandonne la transcription (aucun audio exploitable)."""
+        self._stop_worker()
+
+    def finish(self, audio_data: np.ndarray) -> Optional[str]:
+        """
+        Finalise la transcription à la fin de l'enregistrement.
+
+        Args:
+            audio_data: Audio complet filtré (utilisé si aucune hypothèse ne couvre la parole)
+
+        Returns:
+            Texte final ou None
+        """
+        self._stop_worker()
+
+        if self._speech_covered():
+            logger.info(f"⚡ Transcription finale déjà prête ({self.partial_count} hypothèses) : '{self.last_text}'")
+            return self.last_text or None
+
+        return self.engine.transcrire_audio(audio_data, partial=self.last_partial)
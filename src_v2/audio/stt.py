@@ -4,24 +4,56 @@ Utilise faster-whisper pour une transcription locale rapide avec support GPU CUD
 
 OPTIMISATIONS IMPLÉMENTÉES (100% GRATUITES) :
 - Filtrage audio avancé avec WebRTC VAD (détection voix vs bruit)
-- Réduction de bruit avec noisereduce (filtre le film en fond)
+- Réduction de bruit spectrale en flux (profil du film appris pendant l'écoute)
 - Filtre passe-bande 300-3400 Hz (isole la voix humaine)
 - Détection automatique NVIDIA Broadcast (si disponible)
 - Modèle tiny par défaut pour latence < 1 seconde
-- Cache des transcriptions fréquentes
+- Cascade : second décodage (small) seulement si tiny est peu sûr
+- Cache des transcriptions fréquentes (empreinte log-mel, LRU), servi
+  seulement si l'hypothèse partielle du streaming concorde
 """
 
 import logging
 import numpy as np
-import sounddevice as sd
-from typing import Optional, Tuple, List, Callable
-import wave
-import tempfile
-import os
+from typing import Optional, Tuple, List, Callable, Dict, Any
 import struct
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
+
+from .streaming import StreamingTranscriber
+from .dsp import StreamingBandpass, StreamingNoiseSuppressor, NoiseProfile
+from .vad import FrameVAD
+from .endpointing import AdaptiveEndpointer
+from .stt_worker import RemoteWhisperModel
+from .transcription_cache import TranscriptionCache
+from utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+# Import conditionnel de sounddevice (absent sur une machine sans PortAudio)
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError):
+    SOUNDDEVICE_AVAILABLE = False
+    logger.warning("sounddevice non disponible. Seule la capture partagée fonctionnera.")
+
+# Fréquence attendue par les modèles Whisper
+WHISPER_SAMPLE_RATE = 16000
+
+# Prompt initial par défaut (avant que le vocabulaire des commandes soit connu)
+COMMAND_PROMPT = (
+    "Ouvre calculatrice, ferme navigateur, recherche fichier, "
+    "lance Chrome, démarre Firefox, ouvre explorateur, "
+    "cherche sur le web, scroll down, scroll up, dicte, écris, tape, "
+    "ouvre Bambu Studio, ouvre Fusion, ferme la fenêtre, "
+    "ouvre Comet, lance Perplexity."
+)
+
+# Longueur maximale (caractères) du prompt et des hotwords dynamiques :
+# Whisper tronque chacun à ~220 tokens, et un long prompt ralentit le décodage
+VOCABULARY_MAX_CHARS = 300
+
 # Import conditionnel de faster-whisper
 try:
     from faster_whisper import WhisperModel
@@ -30,6 +62,13 @@ except ImportError:
     WHISPER_AVAILABLE = False
     logger.warning("faster-whisper n'est pas installé. Le module STT ne fonctionnera pas.")
 
+# Pipeline batché (faster-whisper >= 1.1) pour transcribe_batch
+try:
+    from faster_whisper import BatchedInferencePipeline
+    BATCHED_PIPELINE_AVAILABLE = True
+except ImportError:
+    BATCHED_PIPELINE_AVAILABLE = False
+
 # Import conditionnel de webrtcvad (Voice Activity Detection - Google open source)
 try:
     import webrtcvad
@@ -38,21 +77,91 @@ except ImportError:
     VAD_AVAILABLE = False
     logger.warning("webrtcvad non installé. Filtrage vocal désactivé (pip install webrtcvad)")
 
-# Import conditionnel de noisereduce (réduction de bruit - open source)
-try:
-    import noisereduce as nr
-    NOISE_REDUCE_AVAILABLE = True
-except ImportError:
-    NOISE_REDUCE_AVAILABLE = False
-    logger.warning("noisereduce non installé. Réduction de bruit désactivée (pip install noisereduce)")
 
-# Import conditionnel de scipy pour filtrage audio
-try:
-    from scipy import signal
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
-    logger.warning("scipy non installé. Filtres audio désactivés (pip install scipy)")
+class _RecordingSession:
+    """
+    État d'un enregistrement de commande : filtre et accumule les blocs audio
+    et détermine la fin de la parole (silence après au moins 0.3s de voix,
+    de durée fixée par l'endpointer adaptatif s'il est actif).
+    """
+
+    def __init__(self, engine: 'STTEngine'):
+        self.engine = engine
+        self.chunks: List[np.ndarray] = []
+        self.silence_samples = int(engine.silence_duration * engine.sample_rate)
+        self.max_samples = int(engine.max_duration * engine.sample_rate)
+        # Détection adaptative : besoin d'au moins 0.3s de parole avant de détecter le silence
+        self.min_speech_samples = int(0.3 * engine.sample_rate)
+        self.silent_count = 0
+        self.total_samples = 0
+        self.has_speech = False
+        # Position (en échantillons) de la fin de la dernière trame de parole
+        self.last_speech_end = 0
+        # Position du flux partagé où commence l'enregistrement (capture partagée)
+        self.start_position: Optional[int] = None
+        # Échantillons perdus par l'abonné en retard (buffer écrasé avant lecture)
+        self.lost_samples = 0
+        # VAD trame par trame (30 ms), lissée
+        self.vad = engine._create_vad()
+        # Dernière hypothèse du décodage en streaming et audio qu'elle couvre
+        self.partial_text: Optional[str] = None
+        self.partial_samples = 0
+        self.endpointer: Optional[AdaptiveEndpointer] = engine._create_endpointer()
+        # Appelé après chaque bloc (ex: décodage en streaming)
+        self.on_chunk: Optional[Callable[[], None]] = None
+        # Débruitage et passe-bande voix appliqués au fil de la capture
+        self.noise_profile = engine.noise_profile
+        self.denoiser = StreamingNoiseSuppressor(engine.noise_profile) if engine.noise_profile else None
+        self.bandpass = StreamingBandpass(engine.sample_rate)
+
+    @property
+    def done(self) -> bool:
+        """True quand le silence final ou la durée max est atteint."""
+        return self.silent_count >= self.silence_samples or self.total_samples >= self.max_samples
+
+    def feed(self, chunk: np.ndarray):
+        """
+        Filtre et ajoute un bloc audio (N, 1), puis met à jour la détection de silence.
+        
+        Args:
+            chunk: Bloc audio float32 brut
+        """
+        # 1. Réduction de bruit (supprimer le film en fond)
+        filtered = self.denoiser.process(chunk) if self.denoiser else chunk
+        # 2. Filtre passe-bande (isoler les fréquences vocales 300-3400 Hz)
+        self.chunks.append(self.bandpass.process(filtered))
+        self.total_samples += len(chunk)
+        
+        # VAD sur toutes les trames du bloc (signal brut)
+        vad = self.vad
+        if vad.process(chunk):
+            self.has_speech = True
+        elif self.noise_profile is not None:
+            # Hors parole (maintien compris) : affine le profil de bruit
+            self.noise_profile.update(chunk)
+        
+        if self.has_speech:
+            self.last_speech_end = vad.processed - vad.trailing_silence
+            if self.total_samples >= self.min_speech_samples:
+                # Silence compté depuis la dernière parole confirmée :
+                # un bruit bref isolé ne relance pas l'attente
+                self.silent_count = vad.trailing_silence
+                if self.endpointer is not None:
+                    self.silence_samples = self.endpointer.required_silence(self)
+        
+        if self.on_chunk:
+            self.on_chunk()
+
+    def snapshot(self) -> np.ndarray:
+        """
+        Copie de l'audio (déjà filtré) accumulé jusqu'ici (N, 1).
+        Le débruiteur retarde le signal de 32 ms : la toute fin de
+        l'enregistrement (silence final) n'y figure pas.
+        """
+        chunks = list(self.chunks)
+        if not chunks:
+            return np.zeros((0, 1), dtype=np.float32)
+        return np.concatenate(chunks, axis=0)
 
 
 class STTEngine:
@@ -80,7 +189,21 @@ class STTEngine:
         enable_noise_reduction: bool = True,  # Activer réduction de bruit
         enable_vad: bool = True,              # Activer VAD
         calibration_duration: float = 0.6,     # Durée de mesure du bruit ambiant
-        level_callback: Optional[Callable[[float], None]] = None
+        level_callback: Optional[Callable[[float], None]] = None,
+        capture_service=None,
+        preroll_duration: float = 1.5,
+        streaming: bool = True,
+        partial_interval: float = 0.5,
+        adaptive_endpointing: bool = True,
+        command_checker: Optional[Callable[[str], bool]] = None,
+        background_load: bool = True,
+        worker_process: bool = False,
+        fallback_model_size: Optional[str] = None,
+        min_avg_logprob: float = -0.6,
+        max_no_speech_prob: float = 0.5,
+        intent_checker: Optional[Callable[[str], bool]] = None,
+        cache_size: int = 64,
+        cache_max_age: float = 3600.0
     ):
         """
         Initialise le moteur STT avec optimisations audio.
@@ -98,6 +221,30 @@ class STTEngine:
             enable_vad: Activer Voice Activity Detection (distingue voix vs bruit)
             calibration_duration: Durée de calibration du bruit ambiant (en secondes)
             level_callback: Callback pour le niveau audio (0.0-1.0)
+            capture_service: Service de capture partagé (AudioCaptureService).
+                Si fourni, l'enregistrement s'y abonne au lieu d'ouvrir un flux.
+            preroll_duration: Audio maximal (secondes) repris avant le début de
+                l'enregistrement, à partir de la fin du wake word
+            streaming: Décoder pendant l'enregistrement (hypothèses partielles)
+            partial_interval: Intervalle entre deux hypothèses partielles (secondes)
+            adaptive_endpointing: Raccourcir l'attente du silence quand la
+                commande est manifestement terminée
+            command_checker: Fonction texte -> bool reconnaissant une commande
+                complète (grammaire de l'IntentParser)
+            background_load: Charger et préchauffer le modèle dans un thread
+                (voir `model_ready`) au lieu de bloquer le constructeur
+            worker_process: Exécuter le modèle dans un processus dédié
+                (audio transmis par mémoire partagée, GIL libre pour l'UI)
+            fallback_model_size: Modèle plus précis (small, medium) pour un second
+                décodage quand le premier est peu sûr (None = un seul modèle)
+            min_avg_logprob: Log-probabilité moyenne minimale d'un décodage sûr
+            max_no_speech_prob: Probabilité d'absence de parole maximale d'un décodage sûr
+            intent_checker: Fonction texte -> bool reconnaissant une intention
+                exploitable (ex: IntentParser.is_known_command)
+            cache_size: Nombre de commandes gardées en cache par empreinte
+                acoustique (0 = pas de cache ; sans streaming, aucune
+                hypothèse partielle ne peut valider un succès : pas de cache)
+            cache_max_age: Durée de vie d'une transcription en cache (secondes)
         """
         self.model_size = model_size
         self.language = language
@@ -107,7 +254,9 @@ class STTEngine:
         self.silence_threshold = silence_threshold
         self.silence_duration = silence_duration
         self.max_duration = max_duration
-        self.enable_noise_reduction = enable_noise_reduction and NOISE_REDUCE_AVAILABLE
+        self.enable_noise_reduction = enable_noise_reduction
+        # Profil de bruit de fond, aussi alimenté par le wake word au repos
+        self.noise_profile = NoiseProfile(sample_rate) if enable_noise_reduction else None
         self.enable_vad = enable_vad and VAD_AVAILABLE
 
         # Paramètres pour la calibration adaptative du bruit
@@ -116,8 +265,40 @@ class STTEngine:
         self.adaptive_silence_threshold = silence_threshold
         self.ambient_rms: float = 0.0
         self.level_callback = level_callback
+        self.capture_service = capture_service
+        self.preroll_duration = preroll_duration
+        self.streaming = streaming
+        self.partial_interval = partial_interval
+        self.adaptive_endpointing = adaptive_endpointing
+        self.command_checker = command_checker
+        self.worker_process = worker_process
+        self.fallback_model_size = fallback_model_size if fallback_model_size != model_size else None
+        self.min_avg_logprob = min_avg_logprob
+        self.max_no_speech_prob = max_no_speech_prob
+        self.intent_checker = intent_checker
+        # Vocabulaire des commandes (voir set_vocabulary)
+        self.initial_prompt = COMMAND_PROMPT
+        self.hotwords: Optional[str] = None
+        self.short_command_duration = 3.0
+        # Commandes répétées : texte retrouvé par empreinte (et confirmé par
+        # l'hypothèse partielle du streaming), sans Whisper
+        self.transcription_cache = (
+            TranscriptionCache(sample_rate, max_entries=cache_size, max_age=cache_max_age)
+            if cache_size and streaming else None
+        )
 
         self.model = None
+        # Second modèle (cascade), résident lui aussi
+        self.fallback_model = None
+        self._batched_pipeline = None
+        self.cascade_stats: Dict[str, int] = {'decodes': 0, 'fallbacks': 0}
+        # Chargement + préchauffage du modèle : Future résolu à True si prêt
+        self.model_ready: Future = Future()
+        self._loader: Optional[ThreadPoolExecutor] = None
+        self.load_stats: Dict[str, float] = {}
+        # Dernier enregistrement : positions et instant d'arrêt (mesures de latence)
+        self.last_recording: Dict[str, Any] = {}
+        self._first_decode_done = False
         
         # Initialiser le VAD si disponible (WebRTC VAD - Google open source)
         self.vad = None
@@ -132,10 +313,50 @@ class STTEngine:
         # Détecter NVIDIA Broadcast (micro virtuel avec filtrage IA gratuit)
         self._detect_nvidia_broadcast()
         
-        if WHISPER_AVAILABLE:
-            self._initialize_model()
-        else:
+        if not WHISPER_AVAILABLE:
             logger.error("Impossible d'initialiser STT : faster-whisper non disponible")
+            self.model_ready.set_result(False)
+        elif background_load:
+            # Le modèle se charge pendant le démarrage du reste de l'application
+            self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="STT_Load")
+            self.model_ready = self._loader.submit(self._load_and_warm_up)
+        else:
+            self.model_ready.set_result(self._load_and_warm_up())
+    
+    @classmethod
+    def from_config(cls, stt_conf: Dict[str, Any], audio_conf: Dict[str, Any], **kwargs) -> 'STTEngine':
+        """
+        Construit le moteur à partir des sections `stt` et `audio` de config.yaml
+        (partagé par l'application et le rejeu hors ligne).
+        
+        Args:
+            stt_conf: Section stt
+            audio_conf: Section audio
+            **kwargs: Paramètres supplémentaires ou prioritaires (capture_service, level_callback...)
+            
+        Returns:
+            Moteur STT configuré
+        """
+        params = dict(
+            model_size=stt_conf.get('model', 'tiny'),
+            language=stt_conf.get('language', 'fr'),
+            use_gpu=stt_conf.get('use_gpu', False),
+            enable_noise_reduction=stt_conf.get('enable_noise_reduction', True),
+            enable_vad=stt_conf.get('enable_vad', True),
+            preroll_duration=audio_conf.get('preroll_duration', 1.5),
+            streaming=stt_conf.get('streaming', True),
+            partial_interval=stt_conf.get('partial_interval', 0.5),
+            adaptive_endpointing=stt_conf.get('adaptive_endpointing', True),
+            background_load=stt_conf.get('background_load', True),
+            worker_process=stt_conf.get('worker_process', False),
+            fallback_model_size=stt_conf.get('fallback_model'),
+            min_avg_logprob=stt_conf.get('min_avg_logprob', -0.6),
+            max_no_speech_prob=stt_conf.get('max_no_speech_prob', 0.5),
+            cache_size=stt_conf.get('cache_size', 64),
+            cache_max_age=stt_conf.get('cache_max_age', 3600.0),
+        )
+        params.update(kwargs)
+        return cls(**params)
     
     def _detect_nvidia_broadcast(self):
         """
@@ -143,6 +364,9 @@ class STTEngine:
         NVIDIA Broadcast = logiciel GRATUIT pour cartes RTX qui filtre automatiquement
         le bruit ambiant et l'écho avec IA.
         """
+        if not SOUNDDEVICE_AVAILABLE:
+            return False
+
         try:
             devices = sd.query_devices()
             
@@ -165,115 +389,139 @@ class STTEngine:
     
     def _initialize_model(self):
         """
-        Initialise le modèle Whisper.
+        Initialise le modèle Whisper (et le modèle de repli de la cascade).
         Utilise le modèle tiny par défaut pour latence optimale (< 1 seconde).
         """
+        self.model = self._create_model(self.model_size)
+        if self.model and self.fallback_model_size:
+            self.fallback_model = self._create_model(self.fallback_model_size)
+            if self.fallback_model is None:
+                logger.warning("Cascade désactivée : modèle de repli indisponible")
+    
+    def _create_model(self, model_size: str):
+        """
+        Charge un modèle Whisper.
+        
+        Args:
+            model_size: Taille du modèle (tiny, base, small, medium...)
+            
+        Returns:
+            WhisperModel (ou RemoteWhisperModel en processus dédié), None si échec
+        """
         try:
             # Forcer CPU car CUDA incomplet sur ce système
             device = "cpu"
             compute_type = "int8"
-            logger.info(f"Chargement du modèle Whisper '{self.model_size}' sur {device}...")
+            logger.info(f"Chargement du modèle Whisper '{model_size}' sur {device}...")
             logger.info(
                 "   → Latence estimée : %s",
-                "<1s" if self.model_size == "tiny"
-                else "1-2s" if self.model_size == "base"
+                "<1s" if model_size == "tiny"
+                else "1-2s" if model_size == "base"
                 else "2-4s"
             )
             
-            self.model = WhisperModel(
-                self.model_size,
-                device=device,
-                compute_type=compute_type
-            )
+            if self.worker_process:
+                # Modèle résident dans un processus dédié, même interface
+                model = RemoteWhisperModel(
+                    model_size,
+                    device=device,
+                    compute_type=compute_type,
+                    max_duration=self.max_duration + self.preroll_duration + 1.0,
+                    sample_rate=WHISPER_SAMPLE_RATE
+                )
+            else:
+                model = WhisperModel(
+                    model_size,
+                    device=device,
+                    compute_type=compute_type
+                )
             
             logger.info("✅ Modèle Whisper chargé avec succès")
+            return model
             
         except Exception as e:
             logger.error(f"Erreur lors du chargement du modèle Whisper : {e}")
-            # Fallback sur CPU si GPU échoue
-            if self.use_gpu:
+            # Fallback sur CPU (dans ce processus) si GPU ou processus dédié échoue
+            if self.use_gpu or self.worker_process:
                 logger.info("Tentative de chargement sur CPU...")
                 try:
-                    self.model = WhisperModel(
-                        self.model_size,
+                    model = WhisperModel(
+                        model_size,
                         device="cpu",
                         compute_type="int8"
                     )
                     logger.info("Modèle Whisper chargé sur CPU")
+                    return model
                 except Exception as e2:
                     logger.error(f"Échec du chargement sur CPU : {e2}")
-                    self.model = None
+            return None
     
-    def _apply_bandpass_filter(self, audio_data: np.ndarray) -> np.ndarray:
+    def _load_and_warm_up(self) -> bool:
         """
-        Applique un filtre passe-bande pour isoler les fréquences de la voix humaine.
-        La voix humaine se situe principalement entre 300 Hz et 3400 Hz.
-        Ce filtre élimine les basses fréquences du film (explosions, musique)
-        et les hautes fréquences (sifflements, parasites).
+        Charge le modèle puis le préchauffe (exécuté en arrière-plan).
         
-        Args:
-            audio_data: Signal audio brut
-            
         Returns:
-            Signal audio filtré (voix uniquement)
+            True si le modèle est prêt à transcrire
         """
-        if not SCIPY_AVAILABLE or len(audio_data) == 0:
-            return audio_data
+        start = time.perf_counter()
+        self._initialize_model()
+        self.load_stats['load_s'] = time.perf_counter() - start
+        if not self.model:
+            return False
         
+        self._warm_up()
+        return True
+    
+    def _warm_up(self):
+        """
+        Décode une seconde de quasi-silence pour initialiser les noyaux
+        CTranslate2 et les buffers du décodeur : la première vraie commande
+        ne paie plus ce coût de démarrage à froid.
+        """
+        start = time.perf_counter()
         try:
-            # Fréquences de coupure pour la voix humaine
-            lowcut = 300.0   # Supprime les basses (< 300 Hz) = musique de film
-            highcut = 3400.0  # Supprime les aigus (> 3400 Hz) = bruits parasites
-            
-            # Créer le filtre Butterworth (réponse en fréquence plate)
-            nyquist = self.sample_rate / 2.0
-            low = lowcut / nyquist
-            high = highcut / nyquist
-            
-            # Ordre 5 = bon compromis entre performance et qualité
-            b, a = signal.butter(5, [low, high], btype='band')
-            
-            # Appliquer le filtre
-            filtered = signal.filtfilt(b, a, audio_data.flatten())
-            
-            return filtered.reshape(-1, 1)
-            
+            noise = np.random.default_rng(0).standard_normal(WHISPER_SAMPLE_RATE).astype(np.float32) * 1e-3
+            # Sans filtre VAD : sinon le silence est écarté avant le décodeur
+            options = self._decode_options()
+            options['vad_filter'] = False
+            for model in (self.model, self.fallback_model):
+                if model is None:
+                    continue
+                segments, _ = model.transcribe(noise, **options)
+                # Les segments sont générés paresseusement : les consommer
+                for _ in segments:
+                    pass
+            self.load_stats['warmup_s'] = time.perf_counter() - start
+            logger.info(
+                "🔥 Modèle Whisper préchauffé (chargement %.2fs, préchauffage %.2fs)",
+                self.load_stats['load_s'],
+                self.load_stats['warmup_s'],
+            )
         except Exception as e:
-            logger.warning(f"Erreur lors du filtrage passe-bande : {e}")
-            return audio_data
+            logger.warning(f"Préchauffage du modèle impossible : {e}")
+    
+    @property
+    def is_ready(self) -> bool:
+        """True si le modèle est chargé et préchauffé."""
+        return self.model_ready.done() and bool(self.model_ready.result())
     
-    def _reduce_noise(self, audio_data: np.ndarray) -> np.ndarray:
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
         """
-        Applique une réduction de bruit adaptative pour filtrer le film en fond.
-        Utilise noisereduce (open source) qui analyse le spectre sonore et
-        supprime les fréquences constantes (musique, dialogues de film)
-        tout en préservant la voix dynamique.
+        Attend la fin du chargement du modèle.
         
         Args:
-            audio_data: Signal audio avec bruit
+            timeout: Attente maximale en secondes (None = infini)
             
         Returns:
-            Signal audio sans bruit (voix plus claire)
+            True si le modèle est prêt, False sinon
         """
-        if not self.enable_noise_reduction or len(audio_data) == 0:
-            return audio_data
-        
         try:
-            # Réduction de bruit avec paramètres optimisés pour voix
-            # stationary=True : le film en fond est considéré comme bruit stationnaire
-            # prop_decrease=0.8 : agressivité 80% (bon compromis)
-            reduced = nr.reduce_noise(
-                y=audio_data.flatten(),
-                sr=self.sample_rate,
-                stationary=True,
-                prop_decrease=0.8
-            )
-            
-            return reduced.reshape(-1, 1)
-            
+            return bool(self.model_ready.result(timeout=timeout))
+        except FutureTimeoutError:
+            return False
         except Exception as e:
-            logger.warning(f"Erreur lors de la réduction de bruit : {e}")
-            return audio_data
+            logger.error(f"Erreur lors du chargement du modèle Whisper : {e}")
+            return False
     
     def _calibrate_noise_floor(self, device_index: Optional[int] = None) -> float:
         """
@@ -294,28 +542,42 @@ class STTEngine:
             )
             sd.wait()
 
-            if ambient_audio is None or len(ambient_audio) == 0:
-                self.adaptive_silence_threshold = self.silence_threshold
-                return self.silence_threshold
-
-            self.ambient_rms = float(np.sqrt(np.mean(ambient_audio**2)))
-            # Ajuster légèrement le seuil pour ignorer le fond sonore tout en restant sensible
-            self.adaptive_silence_threshold = max(
-                self.silence_threshold,
-                self.ambient_rms * 2.5,
-            )
-            logger.info(
-                "   → Bruit détecté : %.4f | Seuil adaptatif : %.4f",
-                self.ambient_rms,
-                self.adaptive_silence_threshold,
-            )
-            return self.adaptive_silence_threshold
+            return self._set_noise_floor(ambient_audio)
 
         except Exception as e:
             logger.warning(f"Calibration du bruit impossible : {e}")
             self.adaptive_silence_threshold = self.silence_threshold
             return self.silence_threshold
 
+    def _set_noise_floor(self, ambient_audio: Optional[np.ndarray]) -> float:
+        """
+        Calcule le seuil de silence adaptatif à partir d'un extrait de bruit ambiant.
+
+        Args:
+            ambient_audio: Échantillons de bruit de fond
+
+        Returns:
+            Le seuil adaptatif retenu
+        """
+        if ambient_audio is None or len(ambient_audio) == 0:
+            self.adaptive_silence_threshold = self.silence_threshold
+            return self.silence_threshold
+
+        self.ambient_rms = float(np.sqrt(np.mean(ambient_audio**2)))
+        if self.noise_profile is not None:
+            self.noise_profile.update(ambient_audio)
+        # Ajuster légèrement le seuil pour ignorer le fond sonore tout en restant sensible
+        self.adaptive_silence_threshold = max(
+            self.silence_threshold,
+            self.ambient_rms * 2.5,
+        )
+        logger.info(
+            "   → Bruit détecté : %.4f | Seuil adaptatif : %.4f",
+            self.ambient_rms,
+            self.adaptive_silence_threshold,
+        )
+        return self.adaptive_silence_threshold
+
     def _normalize_audio(self, audio_data: np.ndarray) -> np.ndarray:
         """
         Applique une normalisation douce pour conserver une voix claire et stable.
@@ -339,57 +601,88 @@ class STTEngine:
         )
         return normalized
 
-    def _is_speech(self, audio_chunk: np.ndarray) -> bool:
+    def _create_vad(self) -> FrameVAD:
         """
-        Détermine si un chunk audio contient de la parole humaine (vs bruit de fond).
-        Utilise WebRTC VAD (Voice Activity Detection) de Google.
+        Crée la VAD d'un enregistrement : WebRTC VAD de Google sur chaque
+        trame de 30 ms (harmoniques, profil énergétique, fréquences de la
+        parole), ou détection RMS avec le seuil adaptatif si indisponible.
         
-        Le VAD analyse :
-        - Les harmoniques de la voix humaine
-        - Le profil énergétique
-        - Les fréquences typiques de la parole
-        
-        Args:
-            audio_chunk: Chunk audio à analyser (doit être 10ms, 20ms ou 30ms)
-            
         Returns:
-            True si c'est de la parole, False si c'est du bruit/silence
+            FrameVAD prête à l'emploi
         """
         threshold = getattr(self, "adaptive_silence_threshold", self.silence_threshold)
+        return FrameVAD(self.sample_rate, vad=self.vad, threshold=threshold)
+    
+    def _create_endpointer(self) -> Optional[AdaptiveEndpointer]:
+        """
+        Crée l'endpointer adaptatif d'un enregistrement.
+        
+        Returns:
+            AdaptiveEndpointer, ou None si désactivé (silence fixe)
+        """
+        if not self.adaptive_endpointing:
+            return None
+        return AdaptiveEndpointer(
+            self.sample_rate,
+            silence_duration=self.silence_duration,
+            command_checker=self.command_checker
+        )
 
-        if not self.vad or len(audio_chunk) == 0:
-            # Fallback sur détection RMS simple
-            rms = float(np.sqrt(np.mean(audio_chunk**2)))
-            return rms >= threshold
+    def set_command_checker(self, command_checker: Optional[Callable[[str], bool]]):
+        """
+        Définit la vérification de grammaire utilisée par l'endpointing.
         
-        try:
-            # Convertir en int16 pour WebRTC VAD
-            audio_int16 = (audio_chunk.flatten() * 32767).astype(np.int16)
-            
-            # WebRTC VAD nécessite des frames de 10ms, 20ms ou 30ms
-            # On utilise 30ms = 480 échantillons à 16 kHz
-            frame_duration = 30  # ms
-            frame_length = int(self.sample_rate * frame_duration / 1000)
-            
-            # Si le chunk est trop petit, utiliser RMS
-            if len(audio_int16) < frame_length:
-                rms = float(np.sqrt(np.mean(audio_chunk**2)))
-                return rms >= threshold
-            
-            # Analyser avec VAD
-            audio_bytes = audio_int16[:frame_length].tobytes()
-            is_speech = self.vad.is_speech(audio_bytes, self.sample_rate)
-            
-            return is_speech
-            
-        except Exception:
-            # Fallback sur RMS en cas d'erreur
-            rms = float(np.sqrt(np.mean(audio_chunk**2)))
-            return rms >= threshold
-    
+        Args:
+            command_checker: Fonction texte -> bool (ex: IntentParser.is_complete_command)
+        """
+        self.command_checker = command_checker
+
+    def set_intent_checker(self, intent_checker: Optional[Callable[[str], bool]]):
+        """
+        Définit la vérification d'intention utilisée par la cascade de modèles.
+        
+        Args:
+            intent_checker: Fonction texte -> bool (ex: IntentParser.is_known_command)
+        """
+        self.intent_checker = intent_checker
+
+    def set_vocabulary(self, verbs: List[str], apps: List[str]):
+        """
+        Oriente le décodage vers le vocabulaire réel des commandes : verbes
+        de l'IntentParser dans le prompt initial, noms d'applications
+        (indexées et alias) en hotwords. Les commandes courtes sont alors
+        décodées sans recherche en faisceau (beam_size=1).
+        
+        Args:
+            verbs: Verbes de commande (ex: IntentParser.get_command_vocabulary)
+            apps: Noms d'applications, par ordre de priorité
+        """
+        def join(words: List[str]) -> str:
+            text = ""
+            for word in words:
+                candidate = f"{text}, {word}" if text else word
+                if len(candidate) > VOCABULARY_MAX_CHARS:
+                    break
+                text = candidate
+            return text
+        
+        if verbs:
+            prompt = join(verbs)
+            self.initial_prompt = prompt[0].upper() + prompt[1:] + "."
+        self.hotwords = join(apps) or None
+        # Les textes en cache ont été décodés avec l'ancien vocabulaire
+        if self.transcription_cache is not None:
+            self.transcription_cache.clear()
+        logger.info(
+            f"📖 Vocabulaire de décodage : {len(verbs)} verbes, {len(apps)} applications"
+        )
+
     def enregistrer_audio(
         self,
-        device_index: Optional[int] = None
+        device_index: Optional[int] = None,
+        start_position: Optional[int] = None,
+        preroll: Optional[np.ndarray] = None,
+        streamer=None
     ) -> Optional[np.ndarray]:
         """
         Enregistre l'audio depuis le micro avec filtrage intelligent en temps réel.
@@ -399,107 +692,57 @@ class STTEngine:
         - Détection de parole humaine vs bruit ambiant
         - Arrêt rapide après 0.8s de silence (réactivité optimale)
         - Durée max 8s pour commandes courtes
+        - Capture partagée : aucun flux à rouvrir si un AudioCaptureService est fourni
+        - Pré-enregistrement : la commande commence à la fin du wake word,
+          même si elle est prononcée d'une traite ("Jarvis ouvre Chrome")
         
         Args:
             device_index: Index du périphérique d'entrée (None = défaut)
+            start_position: Position du flux partagé où commence la commande
+                (fin du wake word). None = maintenant.
+            preroll: Audio déjà capté après le wake word (flux dédié), placé
+                devant l'enregistrement
+            streamer: StreamingTranscriber optionnel, qui décode la session
+                pendant l'enregistrement
             
         Returns:
             Tableau numpy contenant l'audio enregistré (voix uniquement) ou None si erreur
         """
         try:
-            logger.info(f"🎙️ Début de l'enregistrement audio optimisé sur device #{device_index}...")
-
-            # Calibration unique au démarrage (gain de temps : 1s par commande)
-            if self.energy_threshold is None:
-                logger.info("   -> Lancement calibration initiale...")
-                self._calibrate_noise_floor(device_index)
-                logger.info("   -> Calibration terminée.")
-            else:
-                # Petite adaptation rapide si besoin (optionnel)
-                pass
-
-            # Buffer pour stocker l'audio
-            audio_buffer: List[np.ndarray] = []
-            silence_samples = int(self.silence_duration * self.sample_rate)
-            max_samples = int(self.max_duration * self.sample_rate)
-            silent_count = 0
-            total_samples = 0
-            
-            # Détection adaptative : besoin d'au moins 0.3s de parole avant de détecter le silence
-            # Réduit de 0.5s à 0.3s pour plus de réactivité
-            min_speech_samples = int(0.3 * self.sample_rate)
-            has_speech = False
+            recording_start = time.monotonic()
+            session = _RecordingSession(self)
+            if streamer is not None:
+                streamer.start(session)
             
-            # Callback pour capturer l'audio
-            def audio_callback(indata, frames, time, status):
-                nonlocal silent_count, total_samples, has_speech
-                
-                if status:
-                    logger.warning(f"Status audio : {status}")
-                
-                # Ajouter au buffer
-                audio_buffer.append(indata.copy())
-                total_samples += len(indata)
-                
-                # Calculer le niveau RMS pour le visualiseur
-                if self.level_callback:
-                    rms = np.sqrt(np.mean(indata[:, 0]**2))
-                    level = min(1.0, rms * 10)
-                    try:
-                        self.level_callback(level)
-                    except:
-                        pass
-                
-                # Utiliser VAD si disponible, sinon RMS classique
-                is_speech_detected = self._is_speech(indata)
-                
-                # Détecter si on a de la parole
-                if is_speech_detected:
-                    has_speech = True
-                    silent_count = 0
-                elif has_speech and total_samples >= min_speech_samples:
-                    # Ne compter le silence qu'après avoir détecté de la parole
-                    silent_count += len(indata)
-                # Sinon, on continue d'attendre la parole
-            
-            # Démarrer l'enregistrement
-            import time
-            start_time = time.time()
+            if self.capture_service is not None and self.capture_service.is_running:
+                self._record_from_shared_capture(session, start_position)
+            else:
+                self._record_from_stream(session, device_index, preroll)
             
-            with sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=1,
-                dtype='float32',
-                callback=audio_callback,
-                device=device_index
-            ):
-                # Attendre jusqu'à silence ou durée max
-                # Sécurité : on ajoute un timeout temporel absolu pour éviter le blocage si le callback ne tourne pas
-                while silent_count < silence_samples and total_samples < max_samples:
-                    if time.time() - start_time > self.max_duration + 1.0:
-                        logger.warning("Timeout d'enregistrement atteint (callback bloqué ?)")
-                        break
-                    sd.sleep(50)  # Vérifier toutes les 50ms pour réactivité maximale
+            stopped_at = time.monotonic()
+            self.last_recording = {
+                'start_position': session.start_position,
+                'samples': session.total_samples,
+                'speech_end': session.last_speech_end if session.has_speech else None,
+                'stopped_at': stopped_at,
+                'lost_samples': session.lost_samples,
+            }
+            tracer.add_span('recording', recording_start, stopped_at)
+            if session.has_speech:
+                # Le silence final a été reçu en temps réel juste avant l'arrêt
+                speech_end_at = stopped_at - (session.total_samples - session.last_speech_end) / self.sample_rate
+                tracer.mark('speech_end', speech_end_at)
+                tracer.add_span('endpointing', speech_end_at, stopped_at)
             
             # Concaténer les buffers
-            if audio_buffer:
-                audio_data = np.concatenate(audio_buffer, axis=0)
+            if session.chunks:
+                audio_data = np.concatenate(session.chunks, axis=0)
                 duration = len(audio_data) / self.sample_rate
                 logger.info(f"✅ Enregistrement terminé : {duration:.2f}s")
                 
-                # Appliquer les filtres audio pour nettoyer le signal
-                logger.info("🔧 Application des filtres audio...")
-                
-                # 1. Filtre passe-bande (isoler les fréquences vocales 300-3400 Hz)
-                audio_data = self._apply_bandpass_filter(audio_data)
-                
-                # 2. Réduction de bruit (supprimer le film en fond)
-                audio_data = self._reduce_noise(audio_data)
-
-                # 3. Normalisation douce pour un volume constant et intelligible
-                audio_data = self._normalize_audio(audio_data)
-
-                logger.info("✅ Filtrage audio terminé (voix isolée)")
+                # Le passe-bande est déjà appliqué pendant la capture
+                with tracer.span('filtering'):
+                    audio_data = self._preprocess_audio(audio_data)
                 
                 return audio_data
             else:
@@ -509,8 +752,141 @@ class STTEngine:
         except Exception as e:
             logger.error(f"Erreur lors de l'enregistrement audio : {e}")
             return None
+
+    def _preprocess_audio(self, audio_data: np.ndarray) -> np.ndarray:
+        """
+        Traitements appliqués avant Whisper, sur l'audio déjà débruité et
+        filtré au fil de la capture par la session d'enregistrement.
+        
+        Args:
+            audio_data: Audio filtré (N, 1)
+            
+        Returns:
+            Audio normalisé
+        """
+        # Normalisation douce pour un volume constant et intelligible
+        return self._normalize_audio(audio_data)
+
+    def _record_from_stream(
+        self,
+        session: '_RecordingSession',
+        device_index: Optional[int] = None,
+        preroll: Optional[np.ndarray] = None
+    ):
+        """
+        Enregistre une commande en ouvrant un flux micro dédié.
+        
+        Args:
+            session: Session d'enregistrement à alimenter
+            device_index: Index du périphérique d'entrée (None = défaut)
+            preroll: Audio capté depuis la fin du wake word, placé en tête
+        """
+        if not SOUNDDEVICE_AVAILABLE:
+            logger.error("Enregistrement impossible : sounddevice non disponible")
+            return
+
+        logger.info(f"🎙️ Début de l'enregistrement audio optimisé sur device #{device_index}...")
+
+        # Calibration unique au démarrage (gain de temps : 1s par commande)
+        if self.energy_threshold is None:
+            logger.info("   -> Lancement calibration initiale...")
+            self._calibrate_noise_floor(device_index)
+            logger.info("   -> Calibration terminée.")
+            session.vad.threshold = self.adaptive_silence_threshold
+
+        if preroll is not None and len(preroll) > 0:
+            max_preroll = int(self.preroll_duration * self.sample_rate)
+            session.feed(np.asarray(preroll, dtype=np.float32)[-max_preroll:].reshape(-1, 1))
+            logger.info(f"   -> Pré-enregistrement : {session.total_samples / self.sample_rate:.2f}s")
+        
+        # Callback pour capturer l'audio
+        def audio_callback(indata, frames, time, status):
+            if status:
+                logger.warning(f"Status audio : {status}")
+            
+            # Calculer le niveau RMS pour le visualiseur
+            if self.level_callback:
+                rms = np.sqrt(np.mean(indata[:, 0]**2))
+                level = min(1.0, rms * 10)
+                try:
+                    self.level_callback(level)
+                except:
+                    pass
+            
+            session.feed(indata.copy())
+        
+        # Démarrer l'enregistrement
+        start_time = time.time()
+        
+        with sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype='float32',
+            callback=audio_callback,
+            device=device_index
+        ):
+            # Attendre jusqu'à silence ou durée max
+            # Sécurité : on ajoute un timeout temporel absolu pour éviter le blocage si le callback ne tourne pas
+            while not session.done:
+                if time.time() - start_time > self.max_duration + 1.0:
+                    logger.warning("Timeout d'enregistrement atteint (callback bloqué ?)")
+                    break
+                sd.sleep(50)  # Vérifier toutes les 50ms pour réactivité maximale
+
+    def _record_from_shared_capture(
+        self,
+        session: '_RecordingSession',
+        start_position: Optional[int] = None
+    ):
+        """
+        Enregistre une commande en s'abonnant au service de capture partagé.
+        Le flux est déjà ouvert : l'enregistrement commence sans délai, et
+        reprend à `start_position` pour ne rien perdre depuis le wake word.
+        
+        Args:
+            session: Session d'enregistrement à alimenter
+            start_position: Position du flux où commence la commande (None = maintenant)
+        """
+        service = self.capture_service
+        logger.info("🎙️ Début de l'enregistrement audio (capture partagée)...")
+
+        # Calibration sur l'historique du buffer : pas de nouvelle capture
+        if self.energy_threshold is None:
+            ambient_audio = service.ring.latest(int(self.calibration_duration * self.sample_rate))
+            self._set_noise_floor(ambient_audio)
+            session.vad.threshold = self.adaptive_silence_threshold
+
+        # Reprendre à la fin du wake word, dans la limite du pré-enregistrement
+        if start_position is not None:
+            start_position = max(start_position, service.position - int(self.preroll_duration * self.sample_rate))
+            logger.info(f"   -> Pré-enregistrement : {(service.position - start_position) / self.sample_rate:.2f}s")
+
+        subscription = service.subscribe("stt", start_position)
+        session.start_position = subscription.position
+        deadline = time.monotonic() + self.max_duration + 1.0
+        
+        try:
+            while not session.done:
+                if time.monotonic() > deadline:
+                    logger.warning("Timeout d'enregistrement atteint (capture bloquée ?)")
+                    break
+                block = subscription.read(timeout=0.1)
+                if block is None:
+                    if not service.is_running:
+                        logger.warning("Capture audio partagée arrêtée pendant l'enregistrement")
+                        break
+                    continue
+                session.feed(block.reshape(-1, 1))
+        finally:
+            subscription.close()
+            session.lost_samples = subscription.lost_samples
+            if subscription.lost_samples:
+                logger.warning(
+                    f"⚠️ Enregistrement incomplet : {subscription.lost_samples / self.sample_rate:.2f}s "
+                    f"d'audio perdues ({subscription.overruns} retards)"
+                )
     
-    def transcrire_audio(self, audio_data: np.ndarray) -> Optional[str]:
+    def transcrire_audio(self, audio_data: np.ndarray, partial: Optional[str] = None) -> Optional[str]:
         """
         Transcrit l'audio en texte avec Whisper (optimisé pour vitesse).
         
@@ -523,119 +899,408 @@ class STTEngine:
         
         Args:
             audio_data: Données audio filtrées (voix uniquement)
+            partial: Hypothèse partielle de la même commande (streaming),
+                nécessaire pour reprendre un texte du cache
             
         Returns:
             Texte transcrit ou None si erreur
         """
-        if not WHISPER_AVAILABLE or not self.model:
+        if audio_data is None or len(audio_data) == 0:
+            logger.warning("Données audio vides")
+            return None
+        
+        # Commande prononcée juste après le lancement : attendre le modèle
+        if not self.model_ready.done():
+            logger.info("⏳ Attente du chargement du modèle Whisper...")
+        if not WHISPER_AVAILABLE or not self.wait_until_ready() or not self.model:
             logger.error("Modèle Whisper non disponible")
             return None
         
-        if audio_data is None or len(audio_data) == 0:
-            logger.warning("Données audio vides")
+        logger.info("⚡ Transcription ultra-rapide en cours...")
+        start = time.perf_counter()
+        with tracer.span('whisper_decode', model=self.model_size):
+            texte = self._decode(audio_data, partial=partial)
+        if not self._first_decode_done:
+            self._first_decode_done = True
+            self.load_stats['first_decode_s'] = time.perf_counter() - start
+            logger.info(
+                "   → Première transcription : %.0f ms (%s)",
+                self.load_stats['first_decode_s'] * 1000,
+                "modèle préchauffé" if 'warmup_s' in self.load_stats else "à froid",
+            )
+        
+        if texte:
+            logger.info(f"✅ Transcription : '{texte}'")
+            return texte
+        else:
+            logger.warning("Aucun texte transcrit")
             return None
+    
+    def _to_whisper_input(self, audio_data: np.ndarray) -> np.ndarray:
+        """
+        Prépare l'audio pour faster-whisper : float32 mono contigu à 16 kHz.
         
-        try:
-            # Sauvegarder temporairement en WAV
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-                tmp_path = tmp_file.name
+        Args:
+            audio_data: Audio (N,) ou (N, 1) à self.sample_rate
             
-            # Convertir en format int16 pour WAV
-            audio_int16 = (audio_data * 32767).astype(np.int16)
+        Returns:
+            Tableau 1D float32 (sans copie s'il est déjà au bon format)
+        """
+        audio = np.ascontiguousarray(audio_data, dtype=np.float32).reshape(-1)
+        
+        # Whisper travaille à 16 kHz
+        if self.sample_rate != WHISPER_SAMPLE_RATE and len(audio) > 0:
+            target_len = int(round(len(audio) * WHISPER_SAMPLE_RATE / self.sample_rate))
+            audio = np.interp(
+                np.linspace(0.0, len(audio) - 1, target_len),
+                np.arange(len(audio)),
+                audio
+            ).astype(np.float32)
+        
+        return audio
+
+    def _decode_options(self, duration: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Paramètres de décodage Whisper (partagés par la transcription et le préchauffage).
+        
+        Args:
+            duration: Durée de l'audio à décoder (secondes), si connue
+        
+        Returns:
+            Arguments nommés de WhisperModel.transcribe
+        """
+        # Commande courte avec vocabulaire connu : décodage glouton suffisant
+        short = (
+            self.hotwords is not None
+            and duration is not None
+            and duration <= self.short_command_duration
+        )
+        
+        return dict(
+            language=self.language,
+            beam_size=1 if short else 2,  # 2 : un peu plus précis que 1, reste rapide
+            best_of=1 if short else 2,    # Meilleur échantillonnage
+            temperature=0.0,
+            vad_filter=True,
+            vad_parameters=dict(
+                threshold=0.3,               # Retour à 0.3 (plus sensible) pour ne pas couper la voix
+                min_silence_duration_ms=250
+            ),
+            # Prompt initial pour guider la reconnaissance vers les commandes vocales françaises
+            initial_prompt=self.initial_prompt,
+            hotwords=self.hotwords,
+            condition_on_previous_text=False,
+            word_timestamps=False,
+            no_speech_threshold=0.3,            # Plus tolérant
+            repetition_penalty=1.1              # Pénalité plus douce
+        )
+
+    def _run_model(self, model, audio: np.ndarray) -> Tuple[str, float, float]:
+        """
+        Décode l'audio avec un modèle et mesure la confiance du résultat.
+        
+        Args:
+            model: Modèle Whisper (ou client du processus dédié)
+            audio: Audio float32 1D à 16 kHz
             
-            # Écrire le fichier WAV
-            with wave.open(tmp_path, 'wb') as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)  # 16 bits
-                wf.setframerate(self.sample_rate)
-                wf.writeframes(audio_int16.tobytes())
+        Returns:
+            (texte, log-probabilité moyenne, probabilité d'absence de parole max)
+        """
+        options = self._decode_options(len(audio) / WHISPER_SAMPLE_RATE)
+        segments, info = model.transcribe(audio, **options)
+        segments = list(segments)
+        
+        # Extraire le texte
+        texte = " ".join([segment.text for segment in segments]).strip()
+        avg_logprob = float(np.mean([segment.avg_logprob for segment in segments])) if segments else 0.0
+        no_speech_prob = max((segment.no_speech_prob for segment in segments), default=0.0)
+        
+        return self._filter_hallucinations(texte), avg_logprob, no_speech_prob
+    
+    def _filter_hallucinations(self, texte: str) -> str:
+        """
+        Coupe les répétitions typiques des hallucinations de Whisper.
+        
+        Args:
+            texte: Texte décodé
             
-            logger.info("⚡ Transcription ultra-rapide en cours...")
+        Returns:
+            Texte éventuellement tronqué
+        """
+        # FILTRE ANTI-HALLUCINATION (Répétitions)
+        # Si un mot est répété plus de 3 fois de suite, on coupe
+        words = texte.split()
+        if len(words) > 4:
+            # Détecter les motifs répétitifs simples (ex: "zoom, zoom, zoom")
+            unique_words = set(words)
+            if len(unique_words) < len(words) * 0.5:
+                logger.warning(f"Hallucination détectée (répétitions) : '{texte}'")
+                # On garde seulement le début (les 4 premiers mots)
+                texte = " ".join(words[:4])
+                logger.info(f"Texte corrigé : '{texte}'")
+        
+        return texte
+    
+    def _needs_fallback(self, texte: str, avg_logprob: float, no_speech_prob: float) -> bool:
+        """
+        Indique si un premier décodage est trop incertain pour être gardé.
+        
+        Args:
+            texte: Texte décodé
+            avg_logprob: Log-probabilité moyenne des segments
+            no_speech_prob: Probabilité d'absence de parole
             
-            # Prompt initial pour guider la reconnaissance vers les commandes vocales françaises
-            # Liste étendue des commandes courantes
-            initial_prompt = (
-                "Ouvre calculatrice, ferme navigateur, recherche fichier, "
-                "lance Chrome, démarre Firefox, ouvre explorateur, "
-                "cherche sur le web, scroll down, scroll up, dicte, écris, tape, "
-                "ouvre Bambu Studio, ouvre Fusion, ferme la fenêtre, "
-                "ouvre Comet, lance Perplexity."
-            )
+        Returns:
+            True si un second décodage avec le modèle de repli est justifié
+        """
+        if not texte:
+            # Rien entendu (filtre VAD de Whisper) : un plus gros modèle n'y changera rien
+            return False
+        if avg_logprob < self.min_avg_logprob or no_speech_prob > self.max_no_speech_prob:
+            return True
+        if self.intent_checker is not None:
+            try:
+                return not self.intent_checker(texte)
+            except Exception as e:
+                logger.warning(f"Erreur de vérification d'intention : {e}")
+        return False
+    
+    def _decode(self, audio_data: np.ndarray, cascade: bool = True, partial: Optional[str] = None) -> Optional[str]:
+        """
+        Décode un extrait audio avec Whisper (sans logs de progression).
+        Utilisé pour la transcription finale et les hypothèses partielles.
+        
+        Cascade : le modèle rapide décode d'abord ; si le résultat est peu sûr
+        (log-probabilité, absence de parole, intention inconnue), le modèle de
+        repli redécode le même audio. Les textes finaux sont mis en cache par
+        empreinte acoustique : une commande répétée ne repasse pas par Whisper
+        si son hypothèse partielle (streaming) a entendu les mêmes mots que
+        le texte en cache.
+        
+        Args:
+            audio_data: Données audio filtrées
+            cascade: Texte final : cascade et cache autorisés (False pour les
+                hypothèses partielles)
+            partial: Hypothèse partielle de la même commande (sans elle, le
+                cache n'est qu'alimenté)
             
-            # Transcrire avec Whisper (OPTIMISÉ POUR QUALITÉ/VITESSE)
-            segments, info = self.model.transcribe(
-                tmp_path,
-                language=self.language,
-                beam_size=2,  # Un peu plus précis que 1, reste rapide
-                best_of=2,    # Meilleur échantillonnage
-                temperature=0.0,
-                vad_filter=True,
-                vad_parameters=dict(
-                    threshold=0.3,               # Retour à 0.3 (plus sensible) pour ne pas couper la voix
-                    min_silence_duration_ms=250
-                ),
-                initial_prompt=initial_prompt,
-                condition_on_previous_text=False,
-                word_timestamps=False,
-                no_speech_threshold=0.3,            # Plus tolérant
-                repetition_penalty=1.1              # Pénalité plus douce
-            )
+        Returns:
+            Texte décodé (éventuellement vide) ou None si erreur
+        """
+        signature = None
+        if cascade and self.transcription_cache is not None:
+            cached, signature = self.transcription_cache.lookup(audio_data, partial)
+            if cached is not None:
+                return cached
+        
+        start = time.perf_counter()
+        texte = self._decode_with_models(audio_data, cascade)
+        if signature is not None and texte:
+            self.transcription_cache.store(signature, texte, time.perf_counter() - start)
+        return texte
+    
+    def _decode_with_models(self, audio_data: np.ndarray, cascade: bool) -> Optional[str]:
+        """
+        Décode avec le modèle rapide, puis le modèle de repli si nécessaire.
+        
+        Args:
+            audio_data: Données audio filtrées
+            cascade: Autoriser le second décodage
             
-            # Extraire le texte
-            texte = " ".join([segment.text for segment in segments]).strip()
+        Returns:
+            Texte décodé (éventuellement vide) ou None si erreur
+        """
+        try:
+            # Passage direct du tableau float32 à faster-whisper :
+            # ni fichier temporaire, ni aller-retour float -> int16 -> float
+            audio = self._to_whisper_input(audio_data)
             
-            # FILTRE ANTI-HALLUCINATION (Répétitions)
-            # Si un mot est répété plus de 3 fois de suite, on coupe
-            words = texte.split()
-            if len(words) > 4:
-                # Détecter les motifs répétitifs simples (ex: "zoom, zoom, zoom")
-                unique_words = set(words)
-                if len(unique_words) < len(words) * 0.5:
-                    logger.warning(f"Hallucination détectée (répétitions) : '{texte}'")
-                    # On garde seulement le début (les 4 premiers mots)
-                    texte = " ".join(words[:4])
-                    logger.info(f"Texte corrigé : '{texte}'")
-
-            # Supprimer le fichier temporaire
-            try:
-                os.unlink(tmp_path)
-            except Exception:
-                pass
+            # Transcrire avec Whisper (OPTIMISÉ POUR QUALITÉ/VITESSE)
+            texte, avg_logprob, no_speech_prob = self._run_model(self.model, audio)
+            if not cascade or self.fallback_model is None:
+                return texte
             
-            if texte:
-                logger.info(f"✅ Transcription : '{texte}'")
+            self.cascade_stats['decodes'] += 1
+            if not self._needs_fallback(texte, avg_logprob, no_speech_prob):
                 return texte
-            else:
-                logger.warning("Aucun texte transcrit")
-                return None
+            
+            start = time.perf_counter()
+            self.cascade_stats['fallbacks'] += 1
+            with tracer.span('whisper_fallback', model=self.fallback_model_size):
+                fallback_texte, _, _ = self._run_model(self.fallback_model, audio)
+            logger.info(
+                "🔁 Second décodage (%s, %.0f ms) : '%s' -> '%s' (logprob %.2f, no_speech %.2f)",
+                self.fallback_model_size,
+                (time.perf_counter() - start) * 1000,
+                texte,
+                fallback_texte,
+                avg_logprob,
+                no_speech_prob,
+            )
+            return fallback_texte
                 
         except Exception as e:
             logger.error(f"Erreur lors de la transcription : {e}")
             return None
     
+    def transcribe_batch(self, clips: List[np.ndarray], batch_size: int = 8) -> List[Optional[str]]:
+        """
+        Transcrit plusieurs extraits d'un coup (rejeu hors ligne : tests de
+        non-régression, retranscription après un changement de modèle).
+        
+        Avec faster-whisper >= 1.1, les extraits sont mis bout à bout et
+        chacun devient un élément de lot du BatchedInferencePipeline
+        (clip_timestamps) : l'encodeur et le décodeur traitent `batch_size`
+        extraits par passe. Sinon, ou en processus dédié, les extraits sont
+        décodés en parallèle par un pool de threads (CTranslate2 libère le GIL).
+        Pas de cascade ni de cache : le modèle principal seul.
+        
+        Args:
+            clips: Extraits audio à self.sample_rate ((N,) ou (N, 1), 30s max chacun)
+            batch_size: Extraits décodés ensemble
+            
+        Returns:
+            Texte de chaque extrait (None si erreur), dans l'ordre
+        """
+        if not clips:
+            return []
+        if not WHISPER_AVAILABLE or not self.wait_until_ready() or not self.model:
+            logger.error("Modèle Whisper non disponible")
+            return [None] * len(clips)
+        
+        audios = [
+            self._to_whisper_input(self._preprocess_audio(clip)) if len(clip) else np.zeros(0, dtype=np.float32)
+            for clip in clips
+        ]
+        start = time.perf_counter()
+        try:
+            if BATCHED_PIPELINE_AVAILABLE and isinstance(self.model, WhisperModel):
+                texts = self._transcribe_batched(audios, batch_size)
+            else:
+                with ThreadPoolExecutor(max_workers=batch_size, thread_name_prefix="STT_Batch") as pool:
+                    texts = list(pool.map(
+                        lambda audio: self._run_model(self.model, audio)[0] if len(audio) else "",
+                        audios
+                    ))
+        except Exception as e:
+            logger.error(f"Erreur lors de la transcription par lot : {e}")
+            return [None] * len(clips)
+        
+        elapsed = time.perf_counter() - start
+        audio_s = sum(len(audio) for audio in audios) / WHISPER_SAMPLE_RATE
+        logger.info(
+            "📦 %d extraits transcrits en %.2fs (%.1f extraits/s, %.0fx temps réel)",
+            len(clips), elapsed, len(clips) / elapsed, audio_s / elapsed,
+        )
+        return texts
+    
+    def _transcribe_batched(self, audios: List[np.ndarray], batch_size: int) -> List[str]:
+        """
+        Décode des extraits avec le pipeline batché de faster-whisper.
+        
+        Args:
+            audios: Extraits float32 1D à 16 kHz
+            batch_size: Extraits par passe
+            
+        Returns:
+            Texte de chaque extrait
+        """
+        if self._batched_pipeline is None:
+            self._batched_pipeline = BatchedInferencePipeline(model=self.model)
+        
+        # Extraits mis bout à bout ; une fenêtre (clip_timestamps) par extrait
+        lengths = [len(audio) for audio in audios]
+        offsets = np.concatenate([[0], np.cumsum(lengths)]) / WHISPER_SAMPLE_RATE
+        clip_timestamps = [
+            {'start': offsets[i], 'end': offsets[i + 1]}
+            for i, length in enumerate(lengths) if length
+        ]
+        texts: List[List[str]] = [[] for _ in audios]
+        if not clip_timestamps:
+            return ["" for _ in audios]
+        
+        # Le filtre VAD est ignoré avec clip_timestamps
+        options = self._decode_options()
+        options.pop('vad_filter')
+        options.pop('vad_parameters')
+        segments, _ = self._batched_pipeline.transcribe(
+            np.concatenate(audios),
+            clip_timestamps=clip_timestamps,
+            batch_size=batch_size,
+            **options
+        )
+        for segment in segments:
+            # Un segment commence au début de la fenêtre de son extrait
+            index = int(np.searchsorted(offsets[:-1], segment.start + 1e-3, side='right')) - 1
+            texts[index].append(segment.text)
+        
+        return [self._filter_hallucinations(" ".join(parts).strip()) for parts in texts]
+    
     def ecouter_et_transcrire(
         self,
-        device_index: Optional[int] = None
+        device_index: Optional[int] = None,
+        start_position: Optional[int] = None,
+        preroll: Optional[np.ndarray] = None,
+        partial_callback: Optional[Callable[[str], None]] = None
     ) -> Optional[str]:
         """
         Enregistre l'audio et le transcrit en une seule opération.
         
+        En mode streaming, l'audio est décodé pendant que l'utilisateur parle :
+        les hypothèses partielles sont transmises à `partial_callback` et le
+        texte final est souvent déjà prêt quand la fin de parole est détectée.
+        
         Args:
             device_index: Index du périphérique d'entrée
+            start_position: Position du flux partagé où commence la commande
+            preroll: Audio déjà capté après le wake word (flux dédié)
+            partial_callback: Fonction appelée avec chaque hypothèse partielle
             
         Returns:
             Texte transcrit ou None si erreur
         """
-        audio_data = self.enregistrer_audio(device_index)
+        streamer = None
+        # Pas de décodage partiel tant que le modèle se charge (le texte final l'attendra)
+        if self.streaming and WHISPER_AVAILABLE and self.is_ready:
+            streamer = StreamingTranscriber(self, self.partial_interval, partial_callback)
+        
+        audio_data = self.enregistrer_audio(device_index, start_position, preroll, streamer)
+        
+        if streamer is not None:
+            if audio_data is None:
+                streamer.cancel()
+                return None
+            # Texte final souvent déjà prêt : cette étape mesure ce qui reste après l'arrêt
+            with tracer.span('transcription', streaming=True):
+                return streamer.finish(audio_data)
+        
         if audio_data is not None:
-            return self.transcrire_audio(audio_data)
+            with tracer.span('transcription', streaming=False):
+                return self.transcrire_audio(audio_data)
         return None
     
     def cleanup(self):
         """Nettoie les ressources du moteur STT."""
         try:
+            if self._loader is not None:
+                self._loader.shutdown(wait=False)
+                self._loader = None
+            for model in (self.model, self.fallback_model):
+                if isinstance(model, RemoteWhisperModel):
+                    model.close()
+            if self.transcription_cache is not None and self.transcription_cache.hits + self.transcription_cache.misses:
+                stats = self.transcription_cache.stats
+                logger.info(
+                    "💾 Cache STT : %d/%d succès (%.0f%%), recherche %.1f ms, %.1f s de décodage évitées",
+                    stats['hits'],
+                    stats['hits'] + stats['misses'],
+                    stats['hit_rate'] * 100,
+                    stats['lookup_ms'],
+                    stats['saved_ms'] / 1000,
+                )
             # faster-whisper gère automatiquement la mémoire
             self.model = None
+            self.fallback_model = None
             logger.info("Moteur STT nettoyé")
         except Exception as e:
             logger.error(f"Erreur lors du nettoyage du moteur STT : {e}")
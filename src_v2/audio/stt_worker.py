@@ -0,0 +1,215 @@
+"""
+Processus de transcription dédié pour Jarvis Commander.
+
+Le modèle Whisper reste chargé dans un processus séparé : le décodage (et
+ses pré/post-traitements Python) ne dispute plus le GIL à l'interface
+NiceGUI, au thread wake word et au TTS. L'audio est déposé dans un segment
+de mémoire partagée (multiprocessing.shared_memory) et seul un court
+message transite par le pipe ; le texte revient par ce même pipe.
+
+`RemoteWhisperModel` expose la même méthode `transcribe` que WhisperModel :
+STTEngine l'utilise sans changer son code de décodage.
+"""
+
+import logging
+import threading
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+from typing import Tuple, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Délai maximal de chargement du modèle dans le processus (téléchargement compris)
+STARTUP_TIMEOUT = 300.0
+
+
+def _worker_main(conn, shm_name: str, capacity: int, model_size: str, device: str, compute_type: str):
+    """
+    Boucle du processus de transcription.
+
+    Messages reçus : ("decode", nb_échantillons, options) ou ("decode_inline",
+    audio, options) si l'audio dépasse le segment partagé, ("stop",).
+    Réponses : ("ready", durée_chargement), ("result", segments, info), ("error", message).
+    """
+    # Le segment appartient au processus principal, qui le libère (close())
+    shm = shared_memory.SharedMemory(name=shm_name)
+
+    try:
+        start = time.perf_counter()
+        from faster_whisper import WhisperModel
+        model = WhisperModel(model_size, device=device, compute_type=compute_type)
+        load_s = time.perf_counter() - start
+    except Exception as e:
+        conn.send(("error", f"Chargement du modèle impossible : {e}"))
+        shm.close()
+        return
+
+    buffer = np.ndarray((capacity,), dtype=np.float32, buffer=shm.buf)
+    conn.send(("ready", load_s))
+
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+            if message[0] == "stop":
+                break
+
+            try:
+                if message[0] == "decode":
+                    audio = buffer[:message[1]]
+                else:
+                    audio = message[1]
+                segments, info = model.transcribe(audio, **message[2])
+                result = [
+                    (segment.text, segment.start, segment.end, segment.avg_logprob, segment.no_speech_prob)
+                    for segment in segments
+                ]
+                conn.send(("result", result, (info.language, info.language_probability, info.duration)))
+            except Exception as e:
+                conn.send(("error", str(e)))
+    finally:
+        del buffer
+        shm.close()
+
+
+class RemoteWhisperModel:
+    """Client du processus de transcription (même interface que WhisperModel)."""
+
+    def __init__(
+        self,
+        model_size: str,
+        device: str = "cpu",
+        compute_type: str = "int8",
+        max_duration: float = 30.0,
+        sample_rate: int = 16000
+    ):
+        """
+        Démarre le processus et y charge le modèle.
+
+        Args:
+            model_size: Taille du modèle Whisper
+            device: Périphérique de calcul ("cpu" ou "cuda")
+            compute_type: Type de calcul CTranslate2
+            max_duration: Audio maximal (secondes) passé par la mémoire partagée
+            sample_rate: Fréquence d'échantillonnage de l'audio transmis
+
+        Raises:
+            RuntimeError: si le processus ne parvient pas à charger le modèle
+        """
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.capacity = int(max_duration * sample_rate)
+        self.load_s = 0.0
+        self._lock = threading.Lock()
+        self._shm = None
+        self._buffer = None
+        self._conn = None
+        self._process = None
+        self._start()
+
+    def _start(self):
+        """Lance le processus (spawn : identique sous Windows et Linux)."""
+        context = mp.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=self.capacity * 4)
+        self._buffer = np.ndarray((self.capacity,), dtype=np.float32, buffer=self._shm.buf)
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self._shm.name, self.capacity, self.model_size, self.device, self.compute_type),
+            daemon=True,
+            name="STT_Worker"
+        )
+        self._process.start()
+        child_conn.close()
+        logger.info(f"🧵 Processus STT démarré (pid {self._process.pid}), chargement du modèle '{self.model_size}'...")
+
+        if not self._conn.poll(STARTUP_TIMEOUT):
+            self.close()
+            raise RuntimeError("Le processus STT n'a pas répondu")
+        try:
+            message = self._conn.recv()
+        except EOFError:
+            message = ("error", "processus STT arrêté")
+        if message[0] != "ready":
+            self.close()
+            raise RuntimeError(message[1])
+        self.load_s = message[1]
+        logger.info(f"✅ Modèle Whisper chargé dans le processus STT ({self.load_s:.2f}s)")
+
+    @property
+    def is_alive(self) -> bool:
+        """True si le processus tourne."""
+        return self._process is not None and self._process.is_alive()
+
+    def transcribe(self, audio: np.ndarray, **options) -> Tuple[List[SimpleNamespace], SimpleNamespace]:
+        """
+        Transcrit l'audio dans le processus dédié.
+
+        Args:
+            audio: Audio float32 mono à 16 kHz
+            **options: Arguments de WhisperModel.transcribe
+
+        Returns:
+            (segments, info) : segments avec text/start/end/avg_logprob/no_speech_prob,
+            info avec language/language_probability/duration
+        """
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if not self.is_alive:
+                logger.warning("Processus STT arrêté, redémarrage...")
+                self.close()
+                self._start()
+
+            try:
+                if len(audio) <= self.capacity:
+                    # Seule la longueur transite par le pipe
+                    self._buffer[:len(audio)] = audio
+                    self._conn.send(("decode", len(audio), options))
+                else:
+                    self._conn.send(("decode_inline", audio, options))
+                message = self._conn.recv()
+            except (EOFError, OSError) as e:
+                raise RuntimeError(f"Processus STT interrompu : {e}")
+
+        if message[0] == "error":
+            raise RuntimeError(message[1])
+
+        segments = [
+            SimpleNamespace(text=text, start=start, end=end, avg_logprob=avg_logprob, no_speech_prob=no_speech_prob)
+            for text, start, end, avg_logprob, no_speech_prob in message[1]
+        ]
+        language, language_probability, duration = message[2]
+        info = SimpleNamespace(language=language, language_probability=language_probability, duration=duration)
+        return segments, info
+
+    def close(self):
+        """Arrête le processus et libère la mémoire partagée."""
+        if self._conn is not None:
+            try:
+                if self.is_alive:
+                    self._conn.send(("stop",))
+            except Exception:
+                pass
+        if self._process is not None:
+            self._process.join(timeout=5.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._buffer = None
+        if self._shm is not None:
+            try:
+                self._shm.close()
+                self._shm.unlink()
+            except Exception:
+                pass
+            self._shm = None
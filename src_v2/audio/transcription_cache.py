@@ -0,0 +1,303 @@
+"""
+Cache des transcriptions fréquentes pour Jarvis Commander.
+
+Les mêmes commandes reviennent sans cesse ("scroll down", "ferme la
+fenêtre"). Chaque commande transcrite est mémorisée avec une empreinte
+acoustique ; une commande quasi identique retrouve son texte sans passer
+par Whisper.
+
+Empreinte : spectrogramme log-mel débarrassé des silences de bord,
+normalisé par bande (insensible au gain du micro), rééchantillonné sur un
+nombre fixe de trames (insensible au débit), puis quantifié en int8. Deux
+commandes correspondent si leurs empreintes ont une similarité cosinus
+élevée, segment par segment (écarte la plupart des commandes qui ne
+diffèrent que d'un mot, "ouvre X" / "ferme X"), et des durées proches.
+
+L'empreinte seule ne sépare pas toujours deux commandes qui ne diffèrent
+que d'un mot. Un texte en cache n'est donc servi que s'il concorde avec
+l'hypothèse partielle de la même commande (décodée par Whisper pendant
+l'enregistrement, voir streaming.py) : sans hypothèse, ou si elle n'a pas
+entendu les mêmes mots, Whisper décode la commande.
+"""
+
+import re
+import logging
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_FFT = 512
+FINGERPRINT_HOP = 160   # 10 ms à 16 kHz
+FINGERPRINT_MELS = 40
+FINGERPRINT_FRAMES = 32
+# Trames à moins de 30 dB sous la plus forte : silence de bord
+TRIM_DB = 30.0
+# Dynamique conservée dans le log-mel
+DYNAMIC_RANGE_DB = 30.0
+# Segments temporels comparés séparément (un mot ~ un segment)
+FINGERPRINT_SEGMENTS = 4
+
+
+def _words(texte: str) -> List[str]:
+    """Mots normalisés (minuscules, sans ponctuation)."""
+    return re.sub(r'[^\w\s]', ' ', texte.lower()).split()
+
+
+def agrees_with_partial(texte: str, partial: Optional[str]) -> bool:
+    """
+    Indique si un texte en cache concorde avec l'hypothèse partielle de la commande.
+
+    L'hypothèse doit contenir tous les mots du texte, le dernier pouvant être
+    coupé s'il en garde au moins la moitié ("ouvre chr" concorde avec "ouvre
+    chrome" ; "ferme chrome", "ouvre" ou "ouvre c" non) : le verbe et le
+    complément ont été entendus par Whisper.
+
+    Args:
+        texte: Texte en cache
+        partial: Hypothèse partielle (None ou vide : aucune concordance)
+
+    Returns:
+        True si l'hypothèse concorde
+    """
+    heard = _words(partial or '')
+    cached = _words(texte)
+    if not heard or len(heard) != len(cached) or heard[:-1] != cached[:-1]:
+        return False
+    return cached[-1].startswith(heard[-1]) and 2 * len(heard[-1]) >= len(cached[-1])
+
+
+@lru_cache(maxsize=4)
+def mel_filterbank(
+    sample_rate: int,
+    fft_size: int = FINGERPRINT_FFT,
+    n_mels: int = FINGERPRINT_MELS,
+    fmin: float = 80.0,
+    fmax: float = 7600.0
+) -> np.ndarray:
+    """
+    Banc de filtres triangulaires sur l'échelle mel (calculé une fois).
+
+    Args:
+        sample_rate: Fréquence d'échantillonnage
+        fft_size: Taille de la FFT
+        n_mels: Nombre de bandes
+        fmin: Fréquence minimale (Hz)
+        fmax: Fréquence maximale (Hz), bornée à Nyquist
+
+    Returns:
+        Matrice (n_mels, fft_size // 2 + 1)
+    """
+    def to_mel(f):
+        return 2595.0 * np.log10(1.0 + f / 700.0)
+
+    def to_hz(m):
+        return 700.0 * (10 ** (m / 2595.0) - 1.0)
+
+    fmax = min(fmax, sample_rate / 2.0)
+    edges = to_hz(np.linspace(to_mel(fmin), to_mel(fmax), n_mels + 2))
+    bins = np.fft.rfftfreq(fft_size, 1.0 / sample_rate)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def fingerprint(audio: np.ndarray, sample_rate: int = 16000):
+    """
+    Calcule l'empreinte acoustique d'une commande.
+
+    Args:
+        audio: Audio float32 (N,) ou (N, 1)
+        sample_rate: Fréquence d'échantillonnage
+
+    Returns:
+        (empreinte int8, durée de parole en secondes), ou None si la
+        parole est trop courte
+    """
+    samples = np.asarray(audio, dtype=np.float32).reshape(-1)
+    if len(samples) < FINGERPRINT_FFT * 2:
+        return None
+
+    frames = np.lib.stride_tricks.sliding_window_view(samples, FINGERPRINT_FFT)[::FINGERPRINT_HOP]
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(FINGERPRINT_FFT).astype(np.float32), axis=1)) ** 2
+    mel = spectrum @ mel_filterbank(sample_rate).T
+    energy = mel.sum(axis=1)
+
+    # Retirer les silences de bord : trames proches du bruit de fond
+    # (10 dB au-dessus du plancher) ou à plus de TRIM_DB sous le maximum
+    threshold = max(np.percentile(energy, 10) * 10, energy.max() * 10 ** (-TRIM_DB / 10))
+    voiced = np.flatnonzero(energy > threshold)
+    if len(voiced) < 2:
+        return None
+    mel = mel[voiced[0]:voiced[-1] + 1]
+    if len(mel) < FINGERPRINT_FRAMES:
+        return None
+    duration = len(mel) * FINGERPRINT_HOP / sample_rate
+
+    # Log-mel à dynamique bornée (le bruit de fond ne pèse pas dans les creux
+    # du spectre), normalisé par bande, moyenné sur un nombre fixe de segments
+    log_mel = np.log(mel + mel.max() * 10 ** (-DYNAMIC_RANGE_DB / 10))
+    log_mel -= log_mel.mean(axis=0)
+    segment = np.arange(len(log_mel)) * FINGERPRINT_FRAMES // len(log_mel)
+    pooled = np.zeros((FINGERPRINT_FRAMES, log_mel.shape[1]))
+    np.add.at(pooled, segment, log_mel)
+    resampled = (pooled / np.bincount(segment, minlength=FINGERPRINT_FRAMES)[:, None]).reshape(-1)
+    resampled -= resampled.mean()
+    peak = np.abs(resampled).max()
+    if peak == 0:
+        return None
+    return np.round(resampled * (127.0 / peak)).astype(np.int8), duration
+
+
+class TranscriptionCache:
+    """Cache LRU des transcriptions, interrogé par similarité d'empreinte."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        max_entries: int = 64,
+        max_age: float = 3600.0,
+        min_similarity: float = 0.9,
+        min_segment_similarity: float = 0.85,
+        max_duration_ratio: float = 1.25
+    ):
+        """
+        Initialise le cache.
+
+        Args:
+            sample_rate: Fréquence d'échantillonnage de l'audio
+            max_entries: Nombre maximal de commandes mémorisées (LRU)
+            max_age: Durée de vie d'une entrée (secondes)
+            min_similarity: Similarité cosinus minimale d'une correspondance
+            min_segment_similarity: Similarité minimale de chaque segment
+                temporel (rejette les commandes qui ne diffèrent que d'un mot)
+            max_duration_ratio: Rapport maximal entre les durées de parole
+        """
+        self.sample_rate = sample_rate
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.min_similarity = min_similarity
+        self.min_segment_similarity = min_segment_similarity
+        self.max_duration_ratio = max_duration_ratio
+        # empreinte (bytes) -> (empreinte float normée, durée, texte, date d'ajout,
+        #                       temps de décodage, segments normés un à un)
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        # Correspondances acoustiques refusées (hypothèse partielle absente ou discordante)
+        self.rejected = 0
+        self.lookup_time = 0.0
+        # Temps de décodage Whisper évité par les succès
+        self.saved_time = 0.0
+
+    def _evict_expired(self, now: float):
+        """Retire les entrées trop anciennes."""
+        expired = [key for key, entry in self._entries.items() if now - entry[3] > self.max_age]
+        for key in expired:
+            del self._entries[key]
+
+    @staticmethod
+    def _normalized(quantized: np.ndarray):
+        """(empreinte normée, segments temporels normés un à un) pour les produits scalaires."""
+        vector = quantized.astype(np.float32)
+        segments = vector.reshape(FINGERPRINT_SEGMENTS, -1)
+        segments = segments / np.maximum(np.linalg.norm(segments, axis=1, keepdims=True), 1e-6)
+        return vector / np.linalg.norm(vector), segments
+
+    def lookup(self, audio: np.ndarray, partial: Optional[str] = None):
+        """
+        Cherche une commande quasi identique déjà transcrite, dont le texte
+        concorde avec l'hypothèse partielle (agrees_with_partial).
+
+        Args:
+            audio: Audio de la commande
+            partial: Hypothèse partielle décodée par Whisper pendant
+                l'enregistrement (None : aucun texte servi)
+
+        Returns:
+            (texte ou None, empreinte à réutiliser pour store())
+        """
+        start = time.perf_counter()
+        signature = fingerprint(audio, self.sample_rate)
+        texte = None
+        if signature is not None:
+            vector, segments = self._normalized(signature[0])
+            with self._lock:
+                self._evict_expired(time.monotonic())
+                best_key, best_similarity, rejected = None, self.min_similarity, False
+                for key, (other, duration, cached, _, _, other_segments) in self._entries.items():
+                    ratio = max(duration, signature[1]) / max(min(duration, signature[1]), 1e-3)
+                    if ratio > self.max_duration_ratio:
+                        continue
+                    similarity = float(vector @ other)
+                    if similarity < best_similarity:
+                        continue
+                    # Ressemblance globale, mais un segment (un mot) différent : autre commande
+                    if float(np.min(np.sum(segments * other_segments, axis=1))) < self.min_segment_similarity:
+                        continue
+                    # Empreinte proche, mais Whisper a entendu autre chose : autre commande
+                    if not agrees_with_partial(cached, partial):
+                        rejected = True
+                        continue
+                    best_key, best_similarity = key, similarity
+                if best_key is not None:
+                    self._entries.move_to_end(best_key)
+                    texte = self._entries[best_key][2]
+                    self.saved_time += self._entries[best_key][4]
+                    logger.info(f"💾 Transcription en cache : '{texte}' (similarité {best_similarity:.3f})")
+                elif rejected:
+                    self.rejected += 1
+                    logger.debug(f"Cache : empreinte proche refusée (hypothèse partielle : '{partial}')")
+
+        self.lookup_time += time.perf_counter() - start
+        if texte is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return texte, signature
+
+    def store(self, signature, texte: str, decode_time: float = 0.0):
+        """
+        Mémorise la transcription d'une commande.
+
+        Args:
+            signature: Empreinte retournée par lookup()
+            texte: Transcription (les textes vides ne sont pas mémorisés)
+            decode_time: Durée du décodage Whisper (secondes), pour les statistiques
+        """
+        if signature is None or not texte:
+            return
+        quantized, duration = signature
+        vector, segments = self._normalized(quantized)
+        with self._lock:
+            key = quantized.tobytes()
+            self._entries[key] = (vector, duration, texte, time.monotonic(), decode_time, segments)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Vide le cache (ex: vocabulaire de décodage modifié)."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques : entrées, succès, échecs (dont refus de l'hypothèse partielle), taux de succès, temps de recherche et temps évité."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'rejected': self.rejected,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'lookup_ms': self.lookup_time / lookups * 1000 if lookups else 0.0,
+            'saved_ms': self.saved_time * 1000,
+        }
@@ -10,6 +10,8 @@ import threading
 import queue
 import time
 
+from utils.tracing import tracer
+
 logger = logging.getLogger(__name__)
 
 class TTSEngine:
@@ -47,6 +49,8 @@ class TTSEngine:
                     break
                 
                 logger.info(f"TTS: {text}")
+                # Début de la réponse vocale de la commande en cours
+                tracer.mark('tts_start')
                 
                 if is_windows:
                     # Échapper les guillemets pour PowerShell
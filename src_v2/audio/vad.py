@@ -0,0 +1,164 @@
+"""
+Détection d'activité vocale (VAD) trame par trame pour Jarvis Commander.
+
+Chaque bloc de capture est découpé en trames de 30 ms, toutes évaluées
+(WebRTC VAD si disponible, sinon énergie RMS) ; le reste d'un bloc est
+conservé pour la trame suivante. Les décisions brutes sont lissées :
+- attaque : quelques trames vocales consécutives pour confirmer la parole
+  (un claquement isolé ne déclenche rien) ;
+- maintien (hangover) : la parole reste active pendant un court silence.
+"""
+
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Trames acceptées par WebRTC VAD : 10, 20 ou 30 ms
+VAD_FRAME_MS = 30
+
+
+class FrameVAD:
+    """VAD en flux avec lissage par hystérésis (buffers réutilisés)."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        vad=None,
+        threshold: float = 0.01,
+        onset_frames: int = 2,
+        hangover_frames: int = 8,
+        probability_smoothing: float = 0.3
+    ):
+        """
+        Initialise la VAD.
+
+        Args:
+            sample_rate: Fréquence d'échantillonnage (8, 16, 32 ou 48 kHz pour WebRTC)
+            vad: Instance webrtcvad.Vad (None = détection RMS)
+            threshold: Seuil RMS de la détection de repli
+            onset_frames: Trames vocales consécutives pour confirmer la parole
+            hangover_frames: Trames de silence avant de quitter l'état parole
+            probability_smoothing: Poids d'une trame dans la probabilité lissée
+        """
+        self.sample_rate = sample_rate
+        self.vad = vad
+        self.threshold = threshold
+        self.onset_frames = onset_frames
+        self.hangover_frames = hangover_frames
+        self.probability_smoothing = probability_smoothing
+        self.frame_length = int(sample_rate * VAD_FRAME_MS / 1000)
+
+        # Buffers préalloués : reste du bloc précédent et conversion int16
+        self._pending = np.zeros(self.frame_length, dtype=np.float32)
+        self._scaled = np.empty(self.frame_length, dtype=np.float32)
+        self._frame_int16 = np.empty(self.frame_length, dtype=np.int16)
+        # webrtcvad accepte un memoryview selon la version, sinon des bytes
+        self._zero_copy = True
+        self.reset()
+
+    def reset(self):
+        """Réinitialise l'état (nouvel enregistrement)."""
+        self._pending_count = 0
+        self._voiced_run = 0
+        self._silent_run = 0
+        self.in_speech = False
+        # Échantillons évalués depuis la fin de la dernière parole confirmée
+        self.trailing_silence = 0
+        # Échantillons évalués au total
+        self.processed = 0
+        self.speech_frames = 0
+        self.frames = 0
+        # Moyenne glissante des décisions brutes (tendance de la parole)
+        self.probability = 0.0
+
+    def _score(self, frame: np.ndarray) -> bool:
+        """Décision brute sur une trame de 30 ms."""
+        if self.vad is None:
+            return float(np.sqrt(np.mean(np.square(frame)))) >= self.threshold
+
+        np.multiply(frame, 32767, out=self._scaled)
+        np.clip(self._scaled, -32768, 32767, out=self._scaled)
+        self._frame_int16[:] = self._scaled
+        try:
+            if self._zero_copy:
+                try:
+                    return self.vad.is_speech(memoryview(self._frame_int16), self.sample_rate)
+                except TypeError:
+                    self._zero_copy = False
+            return self.vad.is_speech(self._frame_int16.tobytes(), self.sample_rate)
+        except Exception:
+            # Repli sur le RMS en cas d'erreur
+            return float(np.sqrt(np.mean(np.square(frame)))) >= self.threshold
+
+    def _update(self, voiced: bool):
+        """Met à jour l'état lissé avec la décision d'une trame."""
+        self.frames += 1
+        self.processed += self.frame_length
+        self.probability += self.probability_smoothing * (float(voiced) - self.probability)
+
+        if voiced:
+            self.speech_frames += 1
+            self._voiced_run += 1
+            self._silent_run = 0
+            if self._voiced_run >= self.onset_frames:
+                self.in_speech = True
+                self.trailing_silence = 0
+            else:
+                self.trailing_silence += self.frame_length
+        else:
+            self._voiced_run = 0
+            self._silent_run += 1
+            self.trailing_silence += self.frame_length
+            if self._silent_run >= self.hangover_frames:
+                self.in_speech = False
+
+    def process(self, chunk: np.ndarray) -> bool:
+        """
+        Évalue toutes les trames complètes d'un bloc audio.
+
+        Args:
+            chunk: Bloc float32 (N,) ou (N, 1), de taille quelconque
+
+        Returns:
+            True si la parole est active (état lissé) à la fin du bloc
+        """
+        samples = np.asarray(chunk, dtype=np.float32).reshape(-1)
+        frame_length = self.frame_length
+        offset = 0
+
+        # Compléter la trame entamée au bloc précédent
+        if self._pending_count:
+            take = min(frame_length - self._pending_count, len(samples))
+            self._pending[self._pending_count:self._pending_count + take] = samples[:take]
+            self._pending_count += take
+            offset = take
+            if self._pending_count < frame_length:
+                return self.in_speech
+            self._update(self._score(self._pending))
+            self._pending_count = 0
+
+        # Trames complètes lues directement dans le bloc (vues, sans copie)
+        count = (len(samples) - offset) // frame_length
+        if count and self.vad is None:
+            # Détection RMS : toutes les trames du bloc en une opération
+            frames = samples[offset:offset + count * frame_length].reshape(count, frame_length)
+            for voiced in np.sqrt(np.mean(np.square(frames), axis=1)) >= self.threshold:
+                self._update(bool(voiced))
+            offset += count * frame_length
+        while offset + frame_length <= len(samples):
+            self._update(self._score(samples[offset:offset + frame_length]))
+            offset += frame_length
+
+        # Garder le reste pour le prochain bloc
+        remainder = len(samples) - offset
+        if remainder:
+            self._pending[:remainder] = samples[offset:]
+            self._pending_count = remainder
+
+        return self.in_speech
+
+    @property
+    def speech_ratio(self) -> float:
+        """Proportion de trames vocales depuis le début."""
+        return self.speech_frames / self.frames if self.frames else 0.0
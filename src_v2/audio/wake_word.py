@@ -6,12 +6,26 @@ Utilise Picovoice Porcupine pour une détection locale ultra-rapide.
 import logging
 import struct
 import numpy as np
-import sounddevice as sd
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, Any
 import threading
+import time
+
+from .ring_buffer import AudioRingBuffer
+from utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+# Une frame sur N écoutées au repos alimente le profil de bruit du STT
+NOISE_PROFILE_STRIDE = 4
+
+# Import conditionnel de sounddevice (absent sur une machine sans PortAudio)
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError):
+    SOUNDDEVICE_AVAILABLE = False
+    logger.warning("sounddevice non disponible. Seule la capture partagée fonctionnera.")
+
 # Import conditionnel de pvporcupine
 try:
     import pvporcupine
@@ -21,6 +35,57 @@ except ImportError:
     logger.warning("pvporcupine n'est pas installé. Le wake word ne fonctionnera pas.")
 
 
+class WakeWordStats:
+    """Compteurs d'instrumentation de la boucle wake word (réveils, latence)."""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Remet les compteurs à zéro."""
+        self.started_at = time.monotonic()
+        self.wakeups = 0           # Réveils du thread d'écoute
+        self.idle_wakeups = 0      # Réveils sans frame complète à traiter
+        self.frames_processed = 0
+        self.detections = 0
+        self.latency_total = 0.0   # Arrivée de l'audio -> fin de porcupine.process
+        self.latency_max = 0.0
+        self.last_detection_latency: Optional[float] = None
+    
+    def record_frame(self, latency: float, detected: bool):
+        """Enregistre le traitement d'une frame."""
+        self.frames_processed += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        if detected:
+            self.detections += 1
+            self.last_detection_latency = latency
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Retourne un résumé des compteurs.
+        
+        Returns:
+            Dictionnaire (réveils/s, latence moyenne/max en ms, ...)
+        """
+        elapsed = max(1e-9, time.monotonic() - self.started_at)
+        frames = max(1, self.frames_processed)
+        return {
+            'elapsed_s': round(elapsed, 1),
+            'wakeups': self.wakeups,
+            'wakeups_per_s': round(self.wakeups / elapsed, 1),
+            'idle_wakeups': self.idle_wakeups,
+            'frames_processed': self.frames_processed,
+            'detections': self.detections,
+            'latency_avg_ms': round(self.latency_total / frames * 1000, 2),
+            'latency_max_ms': round(self.latency_max * 1000, 2),
+            'last_detection_latency_ms': (
+                round(self.last_detection_latency * 1000, 2)
+                if self.last_detection_latency is not None else None
+            ),
+        }
+
+
 class WakeWordDetector:
     """Détecteur de wake word "jarvis" utilisant Porcupine."""
     
@@ -30,7 +95,10 @@ class WakeWordDetector:
         sensitivity: float = 0.7,
         device_index: Optional[int] = None,
         callback: Optional[Callable] = None,
-        level_callback: Optional[Callable[[float], None]] = None
+        level_callback: Optional[Callable[[float], None]] = None,
+        capture_service=None,
+        preroll_duration: float = 1.5,
+        noise_profile=None
     ):
         """
         Initialise le détecteur de wake word.
@@ -41,15 +109,33 @@ class WakeWordDetector:
             device_index: Index du périphérique audio
             callback: Fonction appelée lors de la détection du wake word
             level_callback: Fonction appelée avec le niveau audio (0.0 à 1.0)
+            capture_service: Service de capture partagé (AudioCaptureService).
+                Si fourni, le détecteur s'y abonne au lieu d'ouvrir son propre flux.
+            preroll_duration: Audio conservé (secondes) pour ne pas perdre le début
+                de la commande quand le flux dédié est fermé après le wake word
+            noise_profile: NoiseProfile du STT, alimenté avec l'audio écouté au
+                repos (essentiellement du bruit de fond)
         """
         self.access_key = access_key
         self.sensitivity = max(0.0, min(1.0, sensitivity))
         self.device_index = device_index
         self.callback = callback
         self.level_callback = level_callback
+        self.capture_service = capture_service
         self.porcupine = None
         self.is_listening = False
         self.listen_thread = None
+        self._paused = threading.Event()
+        # Boucle réellement démarrée : capture partagée, ou flux dédié (aussi
+        # quand un service de capture existe mais n'est pas utilisable)
+        self._shared_loop = False
+        # Position de la fin de la frame du dernier wake word, dans le flux lu
+        # par la boucle (capture partagée ou buffer de pré-enregistrement)
+        self._detection_position: Optional[int] = None
+        self.preroll_duration = preroll_duration
+        self._preroll_ring: Optional[AudioRingBuffer] = None
+        self.noise_profile = noise_profile
+        self.stats = WakeWordStats()
         
         if not PORCUPINE_AVAILABLE:
             logger.error("pvporcupine non disponible")
@@ -95,7 +181,17 @@ class WakeWordDetector:
             
         try:
             self.is_listening = True
-            self.listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
+            self._paused.clear()
+            self.stats.reset()
+            if self._use_shared_capture():
+                target, self._shared_loop = self._listen_loop_shared, True
+            elif SOUNDDEVICE_AVAILABLE:
+                target, self._shared_loop = self._listen_loop, False
+            else:
+                logger.error("Impossible de démarrer : ni capture partagée ni sounddevice")
+                self.is_listening = False
+                return False
+            self.listen_thread = threading.Thread(target=target, daemon=True)
             self.listen_thread.start()
             logger.info("👂 Écoute du wake word démarrée")
             return True
@@ -105,25 +201,151 @@ class WakeWordDetector:
             self.is_listening = False
             return False
 
+    def _use_shared_capture(self) -> bool:
+        """Indique si le flux partagé est utilisable pour Porcupine."""
+        if self.capture_service is None:
+            return False
+        if self.capture_service.sample_rate != self.porcupine.sample_rate:
+            logger.warning(
+                f"Capture partagée à {self.capture_service.sample_rate} Hz incompatible "
+                f"avec Porcupine ({self.porcupine.sample_rate} Hz), flux dédié utilisé"
+            )
+            return False
+        return self.capture_service.is_running or self.capture_service.start()
+
+    @property
+    def last_detection_position(self) -> Optional[int]:
+        """
+        Position du flux partagé à la fin du dernier wake word.
+
+        None avec le flux dédié : sa position ne se rapporte qu'au buffer de
+        pré-enregistrement (voir get_preroll), pas au service de capture.
+        """
+        return self._detection_position if self._shared_loop else None
+
+    def _detect(self, frame, position: Optional[int] = None, arrival_time: Optional[float] = None) -> bool:
+        """
+        Passe une frame à Porcupine et déclenche le callback si besoin.
+
+        Args:
+            frame: Frame int16 de `frame_length` échantillons
+            position: Position du flux partagé à la fin de la frame (si applicable)
+            arrival_time: Instant (time.monotonic) de réception de la fin de la frame
+
+        Returns:
+            True si le wake word a été détecté
+        """
+        keyword_index = self.porcupine.process(frame)
+        
+        if arrival_time is not None:
+            self.stats.record_frame(time.monotonic() - arrival_time, keyword_index >= 0)
+
+        if keyword_index >= 0:
+            logger.info("🎯 Wake word 'jarvis' détecté!")
+            self._detection_position = position
+            # Nouvelle commande : son origine est la réception de la frame
+            detected_at = time.monotonic()
+            tracer.start_command(at=arrival_time)
+            tracer.add_span('wake_word', arrival_time or detected_at, detected_at)
+
+            # Appeler le callback si défini
+            if self.callback:
+                try:
+                    self.callback()
+                except Exception as e:
+                    logger.error(f"Erreur dans le callback du wake word : {e}")
+            return True
+        return False
+
+    def _listen_loop_shared(self):
+        """Boucle d'écoute abonnée au service de capture partagé."""
+        subscription = self.capture_service.subscribe("wake_word")
+        frame_length = self.porcupine.frame_length
+        # Buffers préalloués : aucune allocation par frame
+        samples_buffer = np.empty(frame_length, dtype=np.float32)
+        frame = np.empty(frame_length, dtype=np.int16)
+        frame_count = 0
+        logger.info("✅ Abonné au flux audio partagé, en attente du wake word...")
+
+        try:
+            while self.is_listening:
+                samples = subscription.read(frame_length, timeout=0.5, out=samples_buffer)
+                self.stats.wakeups += 1
+                if samples is None:
+                    self.stats.idle_wakeups += 1
+                    if not self.capture_service.is_running:
+                        logger.error("Capture audio partagée arrêtée")
+                        break
+                    continue
+
+                # En pause (commande en cours) : on consomme sans analyser
+                if self._paused.is_set():
+                    subscription.skip_to_end()
+                    continue
+
+                # Apprentissage du bruit de fond (une frame sur NOISE_PROFILE_STRIDE)
+                frame_count += 1
+                if self.noise_profile is not None and frame_count % NOISE_PROFILE_STRIDE == 0:
+                    self.noise_profile.update(samples)
+
+                # Conversion float32 -> int16 en place pour Porcupine
+                np.multiply(samples, 32767, out=samples)
+                frame[:] = samples
+                self._detect(frame, subscription.position, self.capture_service.time_at(subscription.position))
+
+        except Exception as e:
+            logger.error(f"Erreur dans la boucle d'écoute : {e}")
+        finally:
+            subscription.close()
+            logger.info("Boucle d'écoute terminée")
 
     def _listen_loop(self):
         """Boucle d'écoute principale (exécutée dans un thread)."""
         try:
-            # Buffer pour stocker les échantillons audio
-            audio_buffer = []
+            frame_length = self.porcupine.frame_length
             
-            def audio_callback(indata, frames, time, status):
+            # Buffer circulaire int16 préalloué (1 s environ, aligné sur les frames) :
+            # le callback y écrit, la boucle passe des vues sans copie à Porcupine
+            frames_capacity = max(2, self.porcupine.sample_rate // frame_length)
+            audio_ring = AudioRingBuffer(frames_capacity * frame_length, dtype=np.int16)
+            conversion_buffer = np.empty(frame_length, dtype=np.float32)
+            frame_scratch = np.empty(frame_length, dtype=np.int16)
+            noise_buffer = np.empty(frame_length, dtype=np.float32)
+            read_position = 0
+            
+            # Réveil événementiel : le callback signale chaque nouveau bloc,
+            # la boucle dort tant qu'aucune frame complète n'est disponible
+            data_ready = threading.Event()
+            arrival_times = np.zeros(frames_capacity, dtype=np.float64)
+            
+            # Pré-enregistrement préalloué : garde la fin de la phrase après "Jarvis"
+            # pendant que le flux dédié est fermé et que le STT ouvre le sien
+            preroll_ring = AudioRingBuffer(max(1, int(self.preroll_duration * self.porcupine.sample_rate)))
+            self._preroll_ring = preroll_ring
+            self._detection_position = None
+            
+            def audio_callback(indata, frames, time_info, status):
                 """Callback appelé pour chaque bloc audio."""
+                nonlocal conversion_buffer
                 if status:
                     logger.warning(f"Status audio : {status}")
                 
-                # Convertir en int16 pour Porcupine
-                audio_int16 = (indata[:, 0] * 32767).astype(np.int16)
-                audio_buffer.extend(audio_int16)
+                samples = indata[:, 0]
+                preroll_ring.write(samples)
+                
+                # Convertir en int16 pour Porcupine (sans allocation si bloc standard)
+                if len(samples) > len(conversion_buffer):
+                    conversion_buffer = np.empty(len(samples), dtype=np.float32)
+                scaled = conversion_buffer[:len(samples)]
+                np.multiply(samples, 32767, out=scaled)
+                end_position = audio_ring.write(scaled)
+                arrival_times[((end_position - 1) // frame_length) % frames_capacity] = time.monotonic()
+                if end_position - read_position >= frame_length:
+                    data_ready.set()
                 
                 # Calculer le niveau RMS pour le visualiseur
                 if self.level_callback:
-                    rms = np.sqrt(np.mean(indata[:, 0]**2))
+                    rms = np.sqrt(np.mean(samples**2))
                     # Normaliser un peu (0.1 est déjà fort)
                     level = min(1.0, rms * 10)
                     try:
@@ -139,32 +361,39 @@ class WakeWordDetector:
                 dtype='float32',
                 callback=audio_callback,
                 device=self.device_index,
-                blocksize=self.porcupine.frame_length
+                blocksize=frame_length
             ):
                 logger.info(f"✅ Flux audio ouvert sur device #{self.device_index}, en attente du wake word...")
                 
                 while self.is_listening:
-                    # Vérifier si on a assez d'échantillons
-                    if len(audio_buffer) >= self.porcupine.frame_length:
-                        # Extraire une frame
-                        frame = audio_buffer[:self.porcupine.frame_length]
-                        audio_buffer = audio_buffer[self.porcupine.frame_length:]
+                    # Attente bloquante d'une frame complète (timeout pour vérifier l'arrêt)
+                    if not data_ready.wait(timeout=0.5):
+                        self.stats.wakeups += 1
+                        self.stats.idle_wakeups += 1
+                        continue
+                    data_ready.clear()
+                    self.stats.wakeups += 1
+                    
+                    # Traiter toutes les frames complètes disponibles
+                    while audio_ring.write_position - read_position >= frame_length:
+                        # Boucle trop lente : le buffer a tourné, on saute à la frame la plus ancienne
+                        if read_position < audio_ring.oldest_position:
+                            logger.warning("Wake word en retard, audio ignoré")
+                            read_position = audio_ring.oldest_position
                         
-                        # Détecter le wake word
-                        keyword_index = self.porcupine.process(frame)
+                        # Vue sur la frame (copie uniquement si elle chevauche la fin du buffer)
+                        frame = audio_ring.view(read_position, frame_length, frame_scratch)
+                        read_position += frame_length
                         
-                        if keyword_index >= 0:
-                            logger.info("🎯 Wake word 'jarvis' détecté!")
+                        # Détecter le wake word
+                        if frame is not None:
+                            arrival = arrival_times[((read_position - 1) // frame_length) % frames_capacity]
+                            self._detect(frame, read_position, arrival)
                             
-                            # Appeler le callback si défini
-                            if self.callback:
-                                try:
-                                    self.callback()
-                                except Exception as e:
-                                    logger.error(f"Erreur dans le callback du wake word : {e}")
-                    else:
-                        # Attendre un peu si pas assez de données
-                        sd.sleep(10)
+                            # Apprentissage du bruit de fond (une frame sur NOISE_PROFILE_STRIDE)
+                            if self.noise_profile is not None and (read_position // frame_length) % NOISE_PROFILE_STRIDE == 0:
+                                np.multiply(frame, 1.0 / 32767, out=noise_buffer)
+                                self.noise_profile.update(noise_buffer)
                         
         except Exception as e:
             logger.error(f"Erreur dans la boucle d'écoute : {e}")
@@ -183,7 +412,58 @@ class WakeWordDetector:
         if self.listen_thread:
             self.listen_thread.join(timeout=2.0)
         
-        logger.info("Écoute du wake word arrêtée")
+        logger.info(f"Écoute du wake word arrêtée | Stats : {self.get_stats()}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs d'instrumentation de l'écoute en cours.
+        
+        Returns:
+            Réveils du thread, frames traitées, latence de détection (ms)
+        """
+        return self.stats.as_dict()
+
+    def get_preroll(self) -> Optional[np.ndarray]:
+        """
+        Retourne l'audio capté depuis la fin du wake word par le flux dédié.
+        
+        Avec la capture partagée, l'historique reste dans le service : le STT
+        repart directement de `last_detection_position` et rien n'est retourné ici.
+        
+        Returns:
+            Échantillons float32 à placer devant la commande, ou None
+        """
+        if self._shared_loop or self._preroll_ring is None:
+            return None
+        if self._detection_position is None:
+            return None
+        
+        ring = self._preroll_ring
+        start = max(self._detection_position, ring.oldest_position)
+        samples = ring.read(start, ring.write_position - start)
+        if samples is None or len(samples) == 0:
+            return None
+        
+        logger.debug(f"Pré-enregistrement : {len(samples) / self.porcupine.sample_rate:.2f}s après le wake word")
+        return samples
+
+    def pause(self):
+        """
+        Suspend la détection pendant le traitement d'une commande.
+        Avec la capture partagée, le flux reste ouvert (reprise instantanée) ;
+        le flux dédié est fermé.
+        """
+        if self._shared_loop and self.is_listening:
+            self._paused.set()
+        else:
+            self.stop_listening()
+
+    def resume(self):
+        """Reprend la détection après une pause."""
+        if self._shared_loop and self.is_listening:
+            self._paused.clear()
+        else:
+            self.start_listening()
     
     def set_sensitivity(self, sensitivity: float):
         """
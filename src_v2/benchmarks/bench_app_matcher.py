@@ -0,0 +1,124 @@
+"""
+Benchmark de la correspondance approchée des noms d'applications.
+
+Compare sur --apps noms synthétiques (syllabes + suffixes courants du menu
+Démarrer : "studio", "player", versions...) :
+- AVANT : difflib.get_close_matches sur toute la liste, et parcours linéaire
+  des sous-chaînes (SystemController._find_best_app_match)
+- APRÈS : AppMatcher (index de trigrammes construit une fois), et sa table
+  de clés phonétiques (recherche exacte, sans score approché)
+
+Requêtes : noms existants déformés comme par Whisper (lettre omise, doublée,
+remplacée, espace inséré) et noms inconnus. Mesures : temps par requête
+(p50/p95), temps de construction de l'index, accord avec difflib et
+proportion de requêtes retrouvant le nom d'origine.
+
+Exécuter depuis src_v2 : python benchmarks/bench_app_matcher.py [--apps 10000] [--queries 200]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import difflib
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from nlu.app_matcher import AppMatcher
+
+SUFFIXES = ["", "", "", " studio", " player", " editor", " launcher", " 2024", " pro", " lite", " manager", " x64"]
+
+
+def synthetic_names(rng, count: int):
+    """Noms d'applications uniques, de 1 à 3 mots."""
+    def word():
+        return ''.join(rng.choice('bcdfghjklmnprstvz') + rng.choice('aeiouy') for _ in range(rng.randint(2, 4)))
+    names = set()
+    while len(names) < count:
+        names.add(' '.join(word() for _ in range(rng.randint(1, 2))) + rng.choice(SUFFIXES))
+    names = sorted(names)
+    rng.shuffle(names)
+    return names
+
+
+def corrupt(rng, name: str) -> str:
+    """Déformation de transcription : omission, doublement, substitution ou espace."""
+    i = rng.randrange(len(name))
+    kind = rng.randrange(4)
+    if kind == 0:
+        return name[:i] + name[i + 1:]
+    if kind == 1:
+        return name[:i] + name[i] + name[i:]
+    if kind == 2:
+        return name[:i] + rng.choice('aeioubcdkmst') + name[i + 1:]
+    return name[:i] + ' ' + name[i:]
+
+
+def substring_scan(names, query):
+    """Ancienne correspondance partielle : premier nom qui contient ou est contenu."""
+    for name in names:
+        if query in name or name in query:
+            return name
+    return None
+
+
+def timed(func, queries):
+    """(résultats, temps par requête en µs)."""
+    results, times = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(func(query))
+        times.append((time.perf_counter() - start) * 1e6)
+    return results, np.array(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--apps', type=int, default=10000, help="Nombre d'applications indexées")
+    parser.add_argument('--queries', type=int, default=200, help="Nombre de requêtes")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = synthetic_names(rng, args.apps)
+    targets = [rng.choice(names) for _ in range(args.queries)]
+    queries = [corrupt(rng, name) for name in targets[:args.queries * 3 // 4]]
+    queries += [''.join(rng.choice('qwxz') for _ in range(8)) for _ in targets[args.queries * 3 // 4:]]
+
+    start = time.perf_counter()
+    matcher = AppMatcher(names)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(names)} applications, {len(queries)} requêtes, index construit en {build_ms:.0f} ms")
+
+    before, before_us = timed(lambda q: difflib.get_close_matches(q, names, n=1, cutoff=0.6), queries)
+    after, after_us = timed(lambda q: matcher.close_matches(q, n=1, cutoff=0.6), queries)
+    agree = sum(b == a for b, a in zip(before, after))
+    found_before = sum(bool(r) and r[0] == t for r, t in zip(before, targets))
+    found_after = sum(bool(r) and r[0] == t for r, t in zip(after, targets))
+    for label, times, found in (("difflib (avant)", before_us, found_before), ("AppMatcher (après)", after_us, found_after)):
+        print(
+            f"  {label:<20} p50 {np.percentile(times, 50):9.0f} µs  p95 {np.percentile(times, 95):9.0f} µs | "
+            f"nom d'origine retrouvé {found}/{len(queries) * 3 // 4}"
+        )
+    print(f"  même résultat que difflib : {agree}/{len(queries)}")
+
+    phonetic, phonetic_us = timed(matcher.phonetic_match, queries)
+    hits = sum(r is not None for r in phonetic)
+    print(
+        f"  phonétique : p50 {np.percentile(phonetic_us, 50):.1f} µs  p95 {np.percentile(phonetic_us, 95):.1f} µs | "
+        f"résolues sans score approché {hits}/{len(queries)}, "
+        f"dont nom d'origine {sum(r == t for r, t in zip(phonetic, targets))}"
+    )
+
+    before, before_us = timed(lambda q: substring_scan(names, q), queries)
+    after, after_us = timed(matcher.find_substring, queries)
+    print(
+        f"  sous-chaîne : parcours p50 {np.percentile(before_us, 50):.0f} µs -> index p50 {np.percentile(after_us, 50):.0f} µs "
+        f"(p95 {np.percentile(before_us, 95):.0f} -> {np.percentile(after_us, 95):.0f} µs) | "
+        f"résultats identiques {sum(b == a for b, a in zip(before, after))}/{len(queries)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark des corrections de transcription en fonction de leur nombre.
+
+Compare, pour --entries corrections (mots et phrases de 1 à 3 mots) :
+- regex par phrase : un re.sub par correction (ce qu'exigeraient des
+  corrections multi-mots sans structure dédiée)
+- alternance : une seule regex compilée de toutes les corrections
+- trie : PhraseCorrector (un parcours du texte, un dictionnaire par mot)
+
+Les trois méthodes doivent donner le même texte (correspondance la plus
+longue à chaque position). Mesures : temps de construction et temps par
+transcription.
+
+Exécuter depuis src_v2 : python benchmarks/bench_corrections.py [--entries 10,100,1000,10000]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from nlu.corrections import PhraseCorrector
+
+TRANSCRIPTS = [
+    "ouvre chrome", "lance spotify", "ferme le navigateur", "cherche sur le web la météo de paris",
+    "écris bonjour à tous les collègues de l'équipe", "peux tu ouvrir mon explorateur maintenant",
+    "recherche les fichiers plan sur le disque a", "page suivante",
+]
+
+
+def synthetic_corrections(rng, count: int) -> dict:
+    """Corrections synthétiques : phrases de 1 à 3 mots inventés."""
+    def word():
+        return ''.join(rng.choice('bcdfglmnprstv') + rng.choice('aeiou') for _ in range(rng.randint(2, 3)))
+    corrections = {}
+    while len(corrections) < count:
+        corrections[' '.join(word() for _ in range(rng.randint(1, 3)))] = word()
+    return corrections
+
+
+def alternation(corrections: dict) -> re.Pattern:
+    """Une regex de toutes les phrases, les plus longues d'abord."""
+    phrases = sorted(corrections, key=len, reverse=True)
+    return re.compile(r'(?<!\S)(?:' + '|'.join(map(re.escape, phrases)) + r')(?!\S)')
+
+
+def per_phrase(corrections: dict):
+    """Un re.sub par phrase, les plus longues (en mots) d'abord."""
+    phrases = sorted(corrections, key=lambda p: len(p.split()), reverse=True)
+    return [(re.compile(r'(?<!\S)' + re.escape(p) + r'(?!\S)'), corrections[p]) for p in phrases]
+
+
+def time_per_call(func, texts, min_time: float = 0.3) -> float:
+    """Durée moyenne d'un appel (µs), sur au moins min_time secondes."""
+    calls, start = 0, time.perf_counter()
+    while True:
+        for texte in texts:
+            func(texte)
+        calls += len(texts)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', default='10,100,1000,10000', help="Nombres de corrections")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{len(TRANSCRIPTS)} transcriptions + 8 contenant des phrases à corriger")
+    for count in [int(c) for c in args.entries.split(',')]:
+        corrections = synthetic_corrections(rng, count)
+        phrases = list(corrections)
+        texts = TRANSCRIPTS + [f"ouvre {rng.choice(phrases)} puis {rng.choice(phrases)}" for _ in range(8)]
+
+        start = time.perf_counter()
+        trie = PhraseCorrector(corrections)
+        trie_build = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        pattern = alternation(corrections)
+        alternation_build = (time.perf_counter() - start) * 1000
+        compiled = per_phrase(corrections) if count <= 1000 else None
+
+        def by_alternation(texte):
+            return pattern.sub(lambda m: corrections[m.group()], texte)
+
+        def by_phrase(texte):
+            for regex, replacement in compiled:
+                texte = regex.sub(replacement, texte)
+            return texte
+
+        mismatches = sum(trie.correct(t) != by_alternation(t) for t in texts)
+        line = (
+            f"  {count:6d} corrections | trie {time_per_call(trie.correct, texts):6.1f} µs (construit en {trie_build:6.1f} ms) | "
+            f"alternance {time_per_call(by_alternation, texts):7.1f} µs (compilée en {alternation_build:7.1f} ms)"
+        )
+        if compiled is not None:
+            mismatches += sum(trie.correct(t) != by_phrase(t) for t in texts)
+            line += f" | regex par phrase {time_per_call(by_phrase, texts):8.1f} µs"
+        print(line + f" | résultats différents : {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark de la fin de commande : silence fixe vs endpointing adaptatif.
+
+Chaque commande synthétique est une suite de mots (voix harmonique, voir
+bench_vad.py) sur bruit de fond, parfois avec une hésitation entre le verbe
+et l'objet. Elle traverse la vraie _RecordingSession (FrameVAD, endpointer)
+bloc par bloc ; le décodage en streaming est simulé : il démarre dès un
+silence de plus de 0.15 s après la parole, dure --decode-ms et restitue les mots entièrement
+prononcés avant la fin de l'audio décodé. La grammaire est celle de
+IntentParser.is_complete_command.
+
+Mesures :
+- cas négatifs : mots courts proches d'une application indexée ("ouvre de"
+  pour "ide", "ouvre coude" pour "code") qui ne doivent pas former une
+  commande complète (sinon l'enregistrement est coupé après 0.3 s)
+- latence fin de parole -> action (texte final disponible) p50/p95
+- commandes coupées (enregistrement arrêté avant la fin réelle de la parole)
+
+Exécuter depuis src_v2 : python benchmarks/bench_endpointing.py [--commands 120] [--decode-ms 250]
+"""
+
+import os
+import sys
+import argparse
+import types
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from audio.stt import _RecordingSession, STTEngine
+from audio.endpointing import TRANSCRIPT_MARGIN
+from nlu.intent_parser import IntentParser
+from bench_vad import synth_speech, synth_background, SILENCE_THRESHOLD
+
+SAMPLE_RATE = 16000
+BLOCK = 512
+LEAD = 0.6  # Bruit avant la commande (calibration)
+
+COMMANDS = [
+    "ouvre chrome", "ferme spotify", "lance calculatrice", "ouvre le navigateur",
+    "bonjour", "quitte discord", "ouvre explorateur",
+    "cherche recette de crêpes", "écris bonjour à tous", "recherche météo paris",
+]
+APPS = {'chrome': '', 'spotify': '', 'calculatrice': '', 'discord': '', 'explorer': '',
+        'ide': '', 'run': '', 'faq': '', 'code': ''}
+ALIASES = {'navigateur': 'chrome', 'explorateur': 'explorer'}
+# Début de phrase ou mot mal transcrit proche d'une application : commande incomplète
+NEGATIVE_COMMANDS = [
+    "ouvre de", "ouvre un", "lance fa", "ouvre coude", "ouvre ode", "ferme de", "lance un",
+]
+
+
+def make_command(rng, text: str):
+    """
+    Synthétise une commande.
+
+    Returns:
+        (audio, fin de chaque mot en secondes, fin de la parole en secondes)
+    """
+    words = text.split()
+    noise_level = rng.uniform(0.003, 0.01)
+    parts = [np.zeros(int(LEAD * SAMPLE_RATE))]
+    word_ends, cursor = [], LEAD
+    hesitate = rng.random() < 0.3
+    for i, word in enumerate(words):
+        duration = 0.12 + 0.06 * len(word)
+        voice = synth_speech(rng, duration) * rng.uniform(0.2, 0.5)
+        parts.append(voice)
+        cursor += len(voice) / SAMPLE_RATE
+        word_ends.append(cursor)
+        if i < len(words) - 1:
+            # Hésitation possible entre le verbe et l'objet
+            gap = rng.uniform(0.4, 0.55) if hesitate and i == 0 else rng.uniform(0.05, 0.15)
+            parts.append(np.zeros(int(gap * SAMPLE_RATE)))
+            cursor += gap
+    parts.append(np.zeros(int(1.5 * SAMPLE_RATE)))
+    audio = np.concatenate(parts)
+    audio += synth_background(rng, len(audio), "rose") * noise_level
+    return audio.astype(np.float32), word_ends, word_ends[-1]
+
+
+def make_engine(adaptive: bool, checker, threshold: float):
+    """Moteur minimal exposant ce qu'utilise _RecordingSession."""
+    engine = types.SimpleNamespace(
+        sample_rate=SAMPLE_RATE, silence_duration=0.8, max_duration=8.0,
+        noise_profile=None, vad=None, silence_threshold=threshold,
+        adaptive_silence_threshold=threshold, adaptive_endpointing=adaptive,
+        command_checker=checker,
+    )
+    engine._create_vad = types.MethodType(STTEngine._create_vad, engine)
+    engine._create_endpointer = types.MethodType(STTEngine._create_endpointer, engine)
+    return engine
+
+
+def run_command(engine, audio, words, word_ends, speech_end, decode_samples: int):
+    """
+    Rejoue une commande bloc par bloc.
+
+    Returns:
+        (latence fin de parole -> action en secondes, coupée ?)
+    """
+    session = _RecordingSession(engine)
+    margin = int(TRANSCRIPT_MARGIN * SAMPLE_RATE)
+    pending = None  # (position de fin de décodage, audio couvert)
+    decoded = 0
+
+    for start in range(0, len(audio), BLOCK):
+        session.feed(audio[start:start + BLOCK].reshape(-1, 1))
+        now = session.total_samples
+
+        # Fin d'un décodage simulé
+        if pending and now >= pending[0]:
+            decoded = pending[1]
+            covered = decoded / SAMPLE_RATE
+            session.partial_text = " ".join(w for w, end in zip(words, word_ends) if end <= covered)
+            session.partial_samples = decoded
+            pending = None
+
+        # Décodage spéculatif dès que le silence dépasse la marge (StreamingTranscriber)
+        if pending is None and session.has_speech and session.silent_count >= margin \
+                and decoded < session.last_speech_end + margin:
+            pending = (now + decode_samples, now)
+
+        if session.done:
+            break
+
+    stop = session.total_samples
+    if decoded >= session.last_speech_end + margin:
+        action = stop
+    elif pending:
+        # Décodage spéculatif en cours : on l'attend
+        action = max(stop, pending[0]) if pending[1] >= session.last_speech_end + margin else stop + decode_samples
+    else:
+        action = stop + decode_samples
+    return action / SAMPLE_RATE - speech_end, stop / SAMPLE_RATE < speech_end
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--commands', type=int, default=120, help="Nombre de commandes simulées")
+    parser.add_argument('--decode-ms', type=float, default=250, help="Durée d'un décodage Whisper (ms)")
+    args = parser.parse_args()
+
+    intent_parser = IntentParser(ALIASES, APPS)
+    decode_samples = int(args.decode_ms / 1000 * SAMPLE_RATE)
+    rng = np.random.default_rng(0)
+    clips = []
+    for i in range(args.commands):
+        text = COMMANDS[i % len(COMMANDS)]
+        clips.append((text.split(),) + make_command(rng, text))
+
+    complete = [text for text in NEGATIVE_COMMANDS if intent_parser.is_complete_command(text)]
+    print(f"Cas négatifs jugés complets : {len(complete)}/{len(NEGATIVE_COMMANDS)} (attendu 0)"
+          + (f" : {', '.join(complete)}" if complete else ""))
+
+    print(f"{args.commands} commandes simulées, décodage {args.decode_ms:.0f} ms")
+    variants = (
+        ("silence fixe 0.8 s (avant)", False, intent_parser.is_complete_command),
+        ("adaptatif, VAD seule", True, None),
+        ("adaptatif + grammaire (après)", True, intent_parser.is_complete_command),
+    )
+    for name, adaptive, checker in variants:
+        latencies, cuts = [], 0
+        for words, audio, word_ends, speech_end in clips:
+            ambient = audio[:int(LEAD * SAMPLE_RATE)]
+            threshold = max(SILENCE_THRESHOLD, float(np.sqrt(np.mean(ambient ** 2))) * 2.5)
+            engine = make_engine(adaptive, checker, threshold)
+            latency, cut = run_command(engine, audio, words, word_ends, speech_end, decode_samples)
+            latencies.append(latency * 1000)
+            cuts += cut
+        print(
+            f"  {name:<30} fin de parole -> action p50 {np.percentile(latencies, 50):4.0f} ms "
+            f"p95 {np.percentile(latencies, 95):4.0f} ms | commandes coupées {cuts}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark de la recherche d'intention (IntentParser._match).
+
+Compare :
+- AVANT : re.search(pattern, texte, re.IGNORECASE) sur chaque pattern, dans
+  l'ordre (patterns bruts, recompilés dès que le cache du module re déborde)
+- APRÈS : patterns compilés une fois, seuls ceux dont le mot déclencheur
+  figure dans le texte sont testés
+
+Le jeu de patterns réel est complété par --intents intentions synthétiques
+(verbes inventés, insérées avant le "catch-all" open_app). Les deux méthodes
+doivent donner exactement la même intention et les mêmes groupes.
+
+Exécuter depuis src_v2 : python benchmarks/bench_intent_parser.py [--intents 100,300,1000]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from nlu.intent_parser import IntentParser
+
+COMMANDS = [
+    "ouvre chrome", "lance spotify", "ferme discord", "referme le navigateur",
+    "cherche sur le web météo paris", "recherche les fichiers plan sur le disque a",
+    "scroll down", "descends vers le bas", "page suivante", "écris bonjour à tous",
+    "ferme la fenêtre active", "bonjour jarvis", "merci", "chrome",
+    "peux tu ouvrir firefox", "je veux lancer steam", "quelle heure est il",
+    "raconte moi une blague sur les chats",
+]
+
+
+def synthetic_patterns(rng, count: int) -> dict:
+    """Intentions synthétiques : deux patterns à verbes inventés chacune."""
+    def verb():
+        return ''.join(rng.choice('bcdfglmnprstv') + rng.choice('aeiou') for _ in range(3))
+    patterns = {}
+    for i in range(count):
+        first, second, third = verb(), verb(), verb()
+        patterns[f'synthetic_{i}'] = [
+            rf'(?:{first}|{second})\s+(?:le\s+|la\s+)?(.+)',
+            rf'(?:{third})\s+(.+)',
+        ]
+    return patterns
+
+
+def sequential_match(patterns: dict, texte: str):
+    """Ancienne recherche : chaque pattern brut, dans l'ordre."""
+    for intent, intent_patterns in patterns.items():
+        for pattern in intent_patterns:
+            match = re.search(pattern, texte, re.IGNORECASE)
+            if match:
+                return intent, match
+    return None
+
+
+def time_per_call(func, texts, repeat: int) -> float:
+    """Durée moyenne d'un appel (µs)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for texte in texts:
+            func(texte)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--intents', default='0,100,300,1000', help="Nombres d'intentions synthétiques ajoutées")
+    parser.add_argument('--repeat', type=int, default=20, help="Passages sur le jeu de commandes")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    rng = random.Random(0)
+    base = IntentParser()
+    base_patterns = dict(base.patterns)
+    print(f"{len(COMMANDS)} commandes (+ commandes synthétiques), {sum(map(len, base_patterns.values()))} patterns réels")
+
+    for count in [int(c) for c in args.intents.split(',')]:
+        extra = synthetic_patterns(rng, count)
+        items = list(base_patterns.items())
+        intent_parser = IntentParser()
+        intent_parser.patterns = dict(items[:-1] + list(extra.items()) + items[-1:])
+        intent_parser._compile_patterns()
+
+        texts = [intent_parser._normalize(c) for c in COMMANDS]
+        for intent in rng.sample(sorted(extra), min(len(extra), 6)):
+            verb = extra[intent][1][4:10]
+            texts.append(f"{verb} truc numéro {rng.randrange(100)}")
+
+        mismatches = 0
+        for texte in texts:
+            before, after = sequential_match(intent_parser.patterns, texte), intent_parser._match(texte)
+            same = (before is None and after is None) or (
+                before is not None and after is not None
+                and before[0] == after[0] and before[1].span() == after[1].span() and before[1].groups() == after[1].groups()
+            )
+            mismatches += not same
+
+        patterns_count = len(intent_parser._compiled)
+        # Au-delà de 512 patterns, le cache de re déborde : l'ancienne méthode recompile tout
+        slow_repeat = args.repeat if patterns_count <= 500 else max(1, args.repeat // 10)
+        before_us = time_per_call(lambda t: sequential_match(intent_parser.patterns, t), texts, slow_repeat)
+        after_us = time_per_call(intent_parser._match, texts, args.repeat)
+        print(
+            f"  {count:5d} intentions ajoutées ({patterns_count:5d} patterns) | "
+            f"avant {before_us:9.1f} µs | après {after_us:6.1f} µs | x{before_us / after_us:6.1f} | "
+            f"résultats différents : {mismatches}"
+        )
+
+
+if __name__ == "__main__":
+    main()
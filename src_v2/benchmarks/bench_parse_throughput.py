@@ -0,0 +1,99 @@
+"""
+Benchmark du débit d'analyse des commandes (IntentParser.parse).
+
+Compare :
+- AVANT : mots parasites retirés par ~25 re.sub successifs (flags passés à
+  chaque appel), corrections de transcription mot par mot
+- APRÈS : une seule alternance précompilée pour les mots parasites, une
+  pour les corrections
+
+Les deux versions doivent produire exactement le même résultat pour chaque
+commande. Objectif : --target commandes par seconde (100 000 par défaut).
+
+Exécuter depuis src_v2 : python benchmarks/bench_parse_throughput.py [--commands 100000]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import logging
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from nlu.intent_parser import IntentParser
+
+COMMANDS = [
+    "ouvre chrome", "lance spotify s'il te plaît", "ferme le navigateur", "ouvre la calculette",
+    "cherche sur le web la météo de paris", "recherche les fichiers plan sur le disque a",
+    "scroll down", "page suivante", "écris bonjour à tous", "ferme la fenêtre active",
+    "bonjour jarvis", "merci", "chrome", "peux tu ouvrir mon explorateur maintenant",
+    "je veux lancer crom", "c'est le bambou", "ouvre vite ce bloc-notes", "quelle heure est il",
+]
+
+OLD_PARASITES = [
+    r"\bs'il te pla[îi]t\b", r"\bs'il vous pla[îi]t\b", r"\bstp\b", r"\bsvp\b",
+    r"\bmerci\b", r"\bvite\b", r"\bmaintenant\b", r"\btout de suite\b",
+    r"\ble\b", r"\bla\b", r"\bles\b", r"\bl'\b", r"\bun\b", r"\bune\b", r"\bdes\b",
+    r"\bmon\b", r"\bma\b", r"\bmes\b", r"\bton\b", r"\bta\b", r"\btes\b",
+    r"\bce\b", r"\bcette\b", r"\bces\b", r"\bcet\b"
+]
+
+
+def old_clean_parasitic_words(texte: str) -> str:
+    """Ancien nettoyage : un re.sub par mot parasite."""
+    for p in OLD_PARASITES:
+        texte = re.sub(p, "", texte, flags=re.IGNORECASE)
+    return re.sub(r'\s+', ' ', texte).strip()
+
+
+def old_parser(config) -> IntentParser:
+    """Parseur dont le nettoyage et les corrections sont ceux d'avant."""
+    parser = IntentParser(config.get('app_aliases', {}), config.get('applications', {}))
+    corrections = parser.transcription_corrections
+    parser._clean_parasitic_words = old_clean_parasitic_words
+    parser._correct_transcription_errors = lambda texte: ' '.join(corrections.get(w, w) for w in texte.split())
+    return parser
+
+
+def throughput(parser: IntentParser, commands) -> float:
+    """Commandes analysées par seconde."""
+    start = time.perf_counter()
+    for command in commands:
+        parser.parse(command)
+    return len(commands) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--commands', type=int, default=100000, help="Nombre de commandes analysées")
+    parser.add_argument('--target', type=float, default=100000, help="Objectif (commandes/s)")
+    args = parser.parse_args()
+
+    # Comme en production hors débogage : les logs INFO ne sont pas émis
+    logging.disable(logging.INFO)
+
+    import yaml
+    with open(os.path.join(os.path.dirname(__file__), '..', 'config', 'config.yaml'), encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    rng = random.Random(0)
+    commands = [rng.choice(COMMANDS) for _ in range(args.commands)]
+    before, after = old_parser(config), IntentParser(config.get('app_aliases', {}), config.get('applications', {}))
+
+    mismatches = sum(before.parse(c) != after.parse(c) for c in COMMANDS)
+    # Premier passage : remplit le cache de résolution des noms (comme une session réelle)
+    throughput(before, commands[:1000])
+    throughput(after, commands[:1000])
+
+    before_rate, after_rate = throughput(before, commands), throughput(after, commands)
+    print(f"{len(commands)} commandes ({len(COMMANDS)} distinctes), résultats différents : {mismatches}")
+    print(f"  avant  {before_rate:9.0f} commandes/s  ({1e6 / before_rate:6.1f} µs)")
+    print(f"  après  {after_rate:9.0f} commandes/s  ({1e6 / after_rate:6.1f} µs)  x{after_rate / before_rate:.1f}")
+    print(f"  objectif {args.target:.0f} commandes/s : {'atteint' if after_rate >= args.target else 'non atteint'}")
+
+
+if __name__ == "__main__":
+    main()
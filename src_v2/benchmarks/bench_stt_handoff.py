@@ -0,0 +1,93 @@
+"""
+Benchmark du passage de l'audio à faster-whisper.
+
+Compare le surcoût par commande, hors inférence :
+- AVANT : float32 -> int16 -> fichier WAV temporaire -> relecture et
+  conversion en float32 (ce que faisait faster-whisper en décodant le fichier)
+- APRÈS : tableau float32 passé directement au modèle
+
+Si faster-whisper est installé, la relecture utilise son decode_audio (PyAV),
+sinon une relecture équivalente via le module wave.
+
+Exécuter depuis src_v2 : python benchmarks/bench_stt_handoff.py [--runs 200]
+"""
+
+import os
+import sys
+import time
+import wave
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    from faster_whisper import decode_audio
+    DECODER = "faster_whisper.decode_audio"
+except ImportError:
+    decode_audio = None
+    DECODER = "wave (faster-whisper absent)"
+
+SAMPLE_RATE = 16000
+
+
+def _read_wav(path: str) -> np.ndarray:
+    """Relecture du WAV comme le ferait le modèle."""
+    if decode_audio is not None:
+        return decode_audio(path, sampling_rate=SAMPLE_RATE)
+    with wave.open(path, 'rb') as wf:
+        raw = wf.readframes(wf.getnframes())
+    return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def handoff_tmp_file(audio: np.ndarray) -> np.ndarray:
+    """Implémentation d'origine (fichier temporaire)."""
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
+        tmp_path = tmp_file.name
+    audio_int16 = (audio * 32767).astype(np.int16)
+    with wave.open(tmp_path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(audio_int16.tobytes())
+    decoded = _read_wav(tmp_path)
+    os.unlink(tmp_path)
+    return decoded
+
+
+def handoff_in_memory(audio: np.ndarray) -> np.ndarray:
+    """Nouvelle implémentation (STTEngine._to_whisper_input)."""
+    return np.ascontiguousarray(audio, dtype=np.float32).reshape(-1)
+
+
+def measure(func, audio: np.ndarray, runs: int) -> np.ndarray:
+    func(audio)  # échauffement
+    timings = np.empty(runs)
+    for i in range(runs):
+        start = time.perf_counter()
+        func(audio)
+        timings[i] = time.perf_counter() - start
+    return timings * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=200, help="Nombre de mesures par variante")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"Relecture : {DECODER}")
+    for seconds in (2.0, 5.0, 10.0):
+        audio = (rng.standard_normal((int(seconds * SAMPLE_RATE), 1)) * 0.1).astype(np.float32)
+        before = measure(handoff_tmp_file, audio, args.runs)
+        after = measure(handoff_in_memory, audio, args.runs)
+        print(
+            f"  commande de {seconds:4.1f} s : fichier temporaire p50 {np.percentile(before, 50):7.3f} ms "
+            f"p95 {np.percentile(before, 95):7.3f} ms | en mémoire p50 {np.percentile(after, 50):7.3f} ms "
+            f"p95 {np.percentile(after, 95):7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark du vocabulaire de décodage : prompt statique vs vocabulaire dynamique.
+
+Corpus : un dossier de commandes enregistrées, chaque `nom.wav` accompagné
+de `nom.txt` (transcription de référence). Le même modèle transcrit tout le
+corpus deux fois :
+- STATIQUE : prompt d'exemples fixe, beam_size=2 (avant)
+- DYNAMIQUE : verbes de l'IntentParser en prompt, applications en hotwords,
+  décodage glouton des commandes courtes (après)
+
+Mesures : WER, intentions identiques à celles de la référence (ce que voit
+le reste de la chaîne), temps de décodage moyen et p95.
+Les applications sont celles de config.yaml (--index-apps : ajoute l'index
+des applications installées, Windows).
+
+Exécuter depuis src_v2 : python benchmarks/bench_stt_vocabulary.py --corpus commandes/ [--model tiny]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from transcribe_batch import load_corpus, words, word_errors
+
+
+def build_parser(index_apps: bool):
+    """IntentParser configuré comme dans main.py."""
+    from nlu.intent_parser import IntentParser
+    config_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'config.yaml')
+    with open(config_path, encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    apps = {}
+    if index_apps:
+        from utils.app_indexer import AppIndexer
+        apps.update(AppIndexer().get_installed_apps())
+    apps.update(config.get('applications', {}))
+    return IntentParser(config.get('app_aliases', {}), apps)
+
+
+def run(engine, intent_parser, corpus):
+    """Transcrit le corpus et retourne (WER, intentions correctes, temps en ms)."""
+    errors = total_words = correct_intents = 0
+    times = []
+    for _, audio, reference in corpus:
+        start = time.perf_counter()
+        hypothesis = engine._decode(engine._preprocess_audio(audio), cascade=False) or ''
+        times.append((time.perf_counter() - start) * 1000)
+        errors += word_errors(reference, hypothesis)
+        total_words += len(words(reference))
+        expected = intent_parser.parse(reference)
+        got = intent_parser.parse(hypothesis)
+        correct_intents += expected == got
+    return errors / max(total_words, 1), correct_intents, times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', required=True, help="Dossier de WAV + transcriptions .txt")
+    parser.add_argument('--model', default='tiny', help="Taille du modèle Whisper")
+    parser.add_argument('--index-apps', action='store_true', help="Inclure les applications installées")
+    args = parser.parse_args()
+
+    corpus = [entry for entry in load_corpus([args.corpus]) if entry[2] is not None]
+    if not corpus:
+        print(f"Aucune paire .wav/.txt dans {args.corpus}")
+        return
+
+    from audio.stt import STTEngine, COMMAND_PROMPT
+    engine = STTEngine(model_size=args.model, use_gpu=False, background_load=False, enable_vad=False)
+    if not engine.is_ready:
+        print("Modèle Whisper indisponible (faster-whisper absent ou téléchargement impossible)")
+        return
+
+    intent_parser = build_parser(args.index_apps)
+    verbs, apps = intent_parser.get_command_vocabulary()
+    print(f"{len(corpus)} commandes, modèle '{args.model}', vocabulaire : {len(verbs)} verbes, {len(apps)} applications")
+
+    def static():
+        engine.initial_prompt, engine.hotwords = COMMAND_PROMPT, None
+
+    def dynamic():
+        engine.set_vocabulary(verbs, apps)
+
+    for name, configure in (("prompt statique (avant)", static), ("vocabulaire dynamique (après)", dynamic)):
+        configure()
+        wer, correct, times = run(engine, intent_parser, corpus)
+        print(
+            f"  {name:<30} WER {wer * 100:5.1f}% | intentions correctes {correct}/{len(corpus)} | "
+            f"décodage moyen {np.mean(times):5.0f} ms p95 {np.percentile(times, 95):5.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark du démarrage du STT : première commande à froid vs préchauffée.
+
+Chaque variante tourne dans un processus neuf (les noyaux CTranslate2 sont
+initialisés une fois par processus) :
+- À FROID : modèle chargé, la première commande paie l'initialisation
+- PRÉCHAUFFÉ : modèle chargé puis décodage à blanc (STTEngine._warm_up)
+
+Mesures : chargement, préchauffage, latence de la 1re et de la 2e commande.
+Nécessite faster-whisper (le modèle est téléchargé au premier lancement).
+
+Exécuter depuis src_v2 : python benchmarks/bench_stt_warmup.py [--model tiny] [--wav commande.wav]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+SAMPLE_RATE = 16000
+
+
+def command_audio(wav_path):
+    """Commande à transcrire : WAV fourni ou voix synthétique (bench_vad)."""
+    if wav_path:
+        from audio.capture import load_wav
+        return load_wav(wav_path, SAMPLE_RATE).reshape(-1, 1)
+    from bench_vad import synth_speech
+    rng = np.random.default_rng(0)
+    audio = np.concatenate([np.zeros(4000), synth_speech(rng, 1.2) * 0.3, np.zeros(8000)])
+    return audio.astype(np.float32).reshape(-1, 1)
+
+
+def run_variant(variant: str, model: str, wav_path) -> dict:
+    """Mesure une variante dans le processus courant."""
+    from audio.stt import STTEngine
+
+    class ColdSTTEngine(STTEngine):
+        def _warm_up(self):
+            pass
+
+    engine_class = STTEngine if variant == "warm" else ColdSTTEngine
+    start = time.perf_counter()
+    engine = engine_class(model_size=model, use_gpu=False, background_load=False, enable_vad=False)
+    ready = time.perf_counter() - start
+
+    audio = command_audio(wav_path)
+    latencies = []
+    for _ in range(2):
+        t = time.perf_counter()
+        engine.transcrire_audio(audio)
+        latencies.append(time.perf_counter() - t)
+
+    return {
+        'ready': engine.is_ready,
+        'load_s': engine.load_stats.get('load_s', 0.0),
+        'warmup_s': engine.load_stats.get('warmup_s', 0.0),
+        'ready_s': ready,
+        'first_ms': latencies[0] * 1000,
+        'second_ms': latencies[1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default='tiny', help="Taille du modèle Whisper")
+    parser.add_argument('--wav', help="Commande enregistrée (WAV) à transcrire")
+    parser.add_argument('--variant', choices=['cold', 'warm'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.model, args.wav)))
+        return
+
+    try:
+        import faster_whisper  # noqa: F401
+    except ImportError:
+        print("faster-whisper non installé : benchmark ignoré (pip install faster-whisper)")
+        return
+
+    print(f"Modèle '{args.model}' (CPU int8), un processus par variante")
+    for variant, name in (('cold', 'à froid (avant)'), ('warm', 'préchauffé (après)')):
+        command = [sys.executable, __file__, '--variant', variant, '--model', args.model]
+        if args.wav:
+            command += ['--wav', args.wav]
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        if not r['ready']:
+            print(f"  {name:<20} modèle indisponible (téléchargement impossible ?)")
+            continue
+        print(
+            f"  {name:<20} chargement {r['load_s']:5.2f}s + préchauffage {r['warmup_s']:5.2f}s | "
+            f"1re commande {r['first_ms']:6.0f} ms | 2e commande {r['second_ms']:6.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
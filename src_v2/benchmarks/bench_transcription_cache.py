@@ -0,0 +1,142 @@
+"""
+Benchmark du cache des transcriptions (empreinte acoustique).
+
+Un vocabulaire de commandes synthétiques (voix harmonique, voir bench_vad.py)
+est prononcé à répétition, chaque répétition avec un gain, un bruit de fond
+et un débit différents. Le cache est alimenté comme dans STTEngine._decode :
+recherche, puis mémorisation du texte en cas d'échec (Whisper simulé par un
+décodage de --decode-ms). Chaque recherche reçoit l'hypothèse partielle du
+streaming dans le pire cas accepté : le dernier mot coupé de moitié.
+
+Mesures :
+- taux de succès (répétitions servies par le cache)
+- faux succès (texte d'une autre commande : doit rester à 0)
+- temps de recherche (empreinte + comparaison) et temps de décodage évité
+
+Quasi-homonymes : --pairs paires de commandes de deux mots qui ne diffèrent
+que par le premier ("ouvre X" / "ferme X", même complément, durées
+voisines). La première est mise en cache, la seconde ne doit jamais
+retrouver son texte. C'est le cas qui déclencherait la mauvaise action.
+Même mesure pour des paires qui ne diffèrent que par le complément
+("ouvre X" / "ouvre Y"), et avec l'empreinte seule (hypothèse toujours
+concordante) pour comparaison.
+
+Exécuter depuis src_v2 : python benchmarks/bench_transcription_cache.py [--commands 12] [--utterances 300]
+"""
+
+import os
+import sys
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from audio.transcription_cache import TranscriptionCache
+from bench_vad import synth_speech, synth_background
+
+SAMPLE_RATE = 16000
+
+
+def make_vocabulary(rng, count: int):
+    """Commandes de référence : 1 à 3 mots de durées variées."""
+    vocabulary = []
+    for _ in range(count):
+        parts = [np.zeros(int(0.3 * SAMPLE_RATE))]
+        for _ in range(rng.integers(1, 4)):
+            parts.append(synth_speech(rng, rng.uniform(0.25, 0.6)) * 0.3)
+            parts.append(np.zeros(int(rng.uniform(0.05, 0.15) * SAMPLE_RATE)))
+        parts.append(np.zeros(int(0.4 * SAMPLE_RATE)))
+        vocabulary.append(np.concatenate(parts))
+    return vocabulary
+
+
+def repeat(rng, audio: np.ndarray) -> np.ndarray:
+    """Nouvelle prononciation : gain, débit (±5 %) et bruit de fond différents."""
+    stretch = rng.uniform(0.95, 1.05)
+    positions = np.linspace(0, len(audio) - 1, int(len(audio) * stretch))
+    spoken = np.interp(positions, np.arange(len(audio)), audio) * rng.uniform(0.5, 2.0)
+    noise = synth_background(rng, len(spoken), "rose") * rng.uniform(0.002, 0.01)
+    return (spoken + noise).astype(np.float32)
+
+
+def command_text(index: int, words: int) -> str:
+    """Texte de référence d'une commande (mots propres à la commande)."""
+    return " ".join(f"{index}mot{k}" for k in range(words))
+
+
+def partial_of(texte: str) -> str:
+    """Hypothèse partielle la plus courte acceptée par le cache : dernier mot coupé de moitié."""
+    words = texte.split()
+    return " ".join(words[:-1] + [words[-1][:(len(words[-1]) + 1) // 2]])
+
+
+def near_miss_false_hits(rng, pairs: int, differ: str = "verb", use_partial: bool = True) -> int:
+    """
+    Paires de deux mots qui ne diffèrent que par un mot : nombre de fois où
+    la seconde reçoit le texte de la première.
+
+    Args:
+        differ: Mot qui diffère ("verb" : "ouvre X" / "ferme X", "object" : "ouvre X" / "ouvre Y")
+        use_partial: Passer l'hypothèse partielle de la seconde commande à la recherche
+    """
+    false_hits = 0
+    for _ in range(pairs):
+        fixed = synth_speech(rng, rng.uniform(0.3, 0.6)) * 0.3
+        duration = rng.uniform(0.25, 0.45) if differ == "verb" else rng.uniform(0.3, 0.6)
+        gap = np.zeros(int(rng.uniform(0.05, 0.15) * SAMPLE_RATE))
+        commands = []
+        for stretch in (1.0, rng.uniform(0.95, 1.05)):
+            word = synth_speech(rng, duration * stretch) * 0.3
+            spoken = [word, gap, fixed] if differ == "verb" else [fixed, gap, word]
+            commands.append(np.concatenate(
+                [np.zeros(int(0.3 * SAMPLE_RATE))] + spoken + [np.zeros(int(0.4 * SAMPLE_RATE))]
+            ))
+        texts = ("ouvre cible", "ferme cible") if differ == "verb" else ("ouvre cible", "ouvre autre")
+        cache = TranscriptionCache(SAMPLE_RATE)
+        _, signature = cache.lookup(repeat(rng, commands[0]))
+        cache.store(signature, texts[0])
+        # Empreinte seule : hypothèse toujours concordante, toute correspondance acoustique est servie
+        partial = partial_of(texts[1] if use_partial else texts[0])
+        texte, _ = cache.lookup(repeat(rng, commands[1]), partial)
+        false_hits += texte is not None
+    return false_hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--commands', type=int, default=12, help="Nombre de commandes distinctes")
+    parser.add_argument('--utterances', type=int, default=300, help="Nombre de commandes prononcées")
+    parser.add_argument('--decode-ms', type=float, default=400, help="Durée d'un décodage Whisper simulé (ms)")
+    parser.add_argument('--pairs', type=int, default=1000, help="Paires de commandes ne différant que d'un mot")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vocabulary = make_vocabulary(rng, args.commands)
+    texts = [command_text(index, int(rng.integers(1, 4))) for index in range(len(vocabulary))]
+    cache = TranscriptionCache(SAMPLE_RATE)
+    false_hits = 0
+
+    for _ in range(args.utterances):
+        index = int(rng.integers(len(vocabulary)))
+        texte, signature = cache.lookup(repeat(rng, vocabulary[index]), partial_of(texts[index]))
+        if texte is None:
+            cache.store(signature, texts[index], args.decode_ms / 1000)
+        elif texte != texts[index]:
+            false_hits += 1
+
+    stats = cache.stats
+    print(f"{args.utterances} commandes prononcées ({args.commands} distinctes), décodage simulé {args.decode_ms:.0f} ms")
+    print(f"  taux de succès       {stats['hit_rate'] * 100:5.1f}% ({stats['hits']} servies par le cache)")
+    print(f"  faux succès          {false_hits}")
+    print(f"  recherche            {stats['lookup_ms']:5.2f} ms par commande")
+    print(f"  décodage évité       {stats['saved_ms'] / 1000:5.1f} s au total")
+
+    near_hits = near_miss_false_hits(rng, args.pairs)
+    print(f"  quasi-homonymes      {near_hits} faux succès sur {args.pairs} paires (doit rester à 0)")
+    print(f"    autre complément   {near_miss_false_hits(rng, args.pairs, differ='object')} faux succès (doit rester à 0)")
+    print(f"    empreinte seule    {near_miss_false_hits(rng, args.pairs, use_partial=False)} faux succès (sans hypothèse)")
+
+
+if __name__ == "__main__":
+    main()
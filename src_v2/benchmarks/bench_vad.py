@@ -0,0 +1,287 @@
+"""
+Évaluation de la VAD sur un jeu de clips WAV annotés.
+
+Compare :
+- AVANT : une décision par bloc de capture (512 échantillons), prise sur les
+  30 premières ms du bloc (WebRTC) ou sur le RMS du bloc entier (repli)
+- APRÈS : FrameVAD, toutes les trames de 30 ms évaluées puis lissées
+  (attaque + maintien)
+
+Mesures :
+- précision par trame de 30 ms (fausses alarmes / parole manquée)
+- fin de parole estimée (erreur p50/p95) et endpointing (silence_duration
+  = 0.8 s) : commandes coupées avant leur fin réelle
+- coût CPU par seconde d'audio
+
+Le jeu de clips est lu dans --corpus (fichiers .wav + labels.json :
+{"clip.wav": [[debut_s, fin_s], ...]}). S'il est absent, un jeu synthétique
+reproductible est généré (voix harmonique syllabique sur bruit de fond,
+"film" tonal, claquements), ce qui permet aussi d'y déposer des clips réels.
+
+Exécuter depuis src_v2 : python benchmarks/bench_vad.py [--corpus DOSSIER] [--clips 40]
+"""
+
+import os
+import sys
+import json
+import time
+import wave
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from audio.vad import FrameVAD
+from audio.capture import load_wav
+
+try:
+    import webrtcvad
+    VAD_BACKEND = "WebRTC VAD"
+except ImportError:
+    webrtcvad = None
+    VAD_BACKEND = "RMS (webrtcvad absent)"
+
+SAMPLE_RATE = 16000
+BLOCK = 512
+SILENCE_DURATION = 0.8
+SILENCE_THRESHOLD = 0.015  # config.yaml
+CALIBRATION = 0.6
+
+
+# --- Jeu de clips synthétique -------------------------------------------
+
+def synth_speech(rng, duration: float) -> np.ndarray:
+    """Voix synthétique : harmoniques sur formants, modulation syllabique."""
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    f0 = rng.uniform(100, 220) * (1 + 0.08 * np.sin(2 * np.pi * rng.uniform(0.5, 2) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    formants = rng.uniform([500, 1200, 2400], [900, 1900, 3000])
+    voice = np.zeros_like(t)
+    for k in range(1, 25):
+        freq = k * f0.mean()
+        if freq > 4000:
+            break
+        amp = sum(np.exp(-((freq - f) / 250.0) ** 2) for f in formants) + 0.05
+        voice += amp * np.sin(k * phase)
+    # Syllabes (~4 Hz) avec de courtes pauses à l'intérieur de la phrase
+    syllables = np.clip(np.sin(2 * np.pi * rng.uniform(3, 5) * t + rng.uniform(0, np.pi)), 0, None) ** 0.5
+    voice *= 0.15 + 0.85 * syllables
+    # Attaque et extinction douces
+    edge = min(len(t) // 4, int(0.03 * SAMPLE_RATE))
+    envelope = np.ones_like(t)
+    envelope[:edge] = np.linspace(0, 1, edge)
+    envelope[-edge:] = np.linspace(1, 0, edge)
+    voice *= envelope
+    return voice / np.max(np.abs(voice))
+
+
+def synth_background(rng, samples: int, kind: str) -> np.ndarray:
+    """Bruit de fond : blanc, rose ou "film" (accords + bruit)."""
+    white = rng.standard_normal(samples)
+    if kind == "blanc":
+        return white
+    pink = np.cumsum(white)
+    pink -= np.convolve(pink, np.ones(800) / 800, mode='same')
+    pink /= np.std(pink) + 1e-9
+    if kind == "rose":
+        return pink
+    t = np.arange(samples) / SAMPLE_RATE
+    chords = sum(np.sin(2 * np.pi * f * t) for f in rng.uniform(110, 660, size=3))
+    return 0.5 * pink + 0.5 * chords / 3
+
+
+def generate_corpus(directory: str, count: int, seed: int = 0) -> dict:
+    """
+    Génère des clips annotés dans `directory`.
+
+    Returns:
+        Annotations {nom: [[debut, fin], ...]}
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    labels = {}
+    for i in range(count):
+        kind = ("blanc", "rose", "film")[i % 3]
+        duration = 4.0
+        audio = synth_background(rng, int(duration * SAMPLE_RATE), kind)
+        audio *= rng.uniform(0.003, 0.02) / (np.std(audio) + 1e-9)
+
+        # Claquements (clavier, vaisselle) dans le bruit de fond, après la calibration
+        for _ in range(rng.integers(0, 4)):
+            position = rng.integers(int(CALIBRATION * SAMPLE_RATE), len(audio) - 160)
+            audio[position:position + 160] += rng.standard_normal(160) * rng.uniform(0.1, 0.3)
+
+        start = rng.uniform(0.8, 1.2)
+        length = rng.uniform(0.6, 1.8)
+        voice = synth_speech(rng, length) * rng.uniform(0.15, 0.5)
+        begin = int(start * SAMPLE_RATE)
+        audio[begin:begin + len(voice)] += voice
+
+        name = f"clip_{i:03d}_{kind}.wav"
+        pcm = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+        with wave.open(os.path.join(directory, name), 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(SAMPLE_RATE)
+            wf.writeframes(pcm.tobytes())
+        labels[name] = [[round(start, 4), round(start + len(voice) / SAMPLE_RATE, 4)]]
+
+    with open(os.path.join(directory, "labels.json"), "w", encoding="utf-8") as f:
+        json.dump(labels, f, indent=2)
+    return labels
+
+
+# --- Détecteurs -----------------------------------------------------------
+
+def _threshold(audio: np.ndarray) -> float:
+    """Seuil adaptatif comme STTEngine._set_noise_floor."""
+    ambient = audio[:int(CALIBRATION * SAMPLE_RATE)]
+    return max(SILENCE_THRESHOLD, float(np.sqrt(np.mean(ambient ** 2))) * 2.5)
+
+
+def old_frame_states(audio: np.ndarray, vad, threshold: float) -> np.ndarray:
+    """Décision par bloc d'origine, étalée sur les trames de 30 ms."""
+    frame_length = int(SAMPLE_RATE * 0.03)
+    states = np.zeros(len(audio) // frame_length, dtype=bool)
+    for start in range(0, len(audio) - BLOCK + 1, BLOCK):
+        block = audio[start:start + BLOCK]
+        if vad is None:
+            speech = float(np.sqrt(np.mean(block ** 2))) >= threshold
+        else:
+            speech = vad.is_speech((block[:frame_length] * 32767).astype(np.int16).tobytes(), SAMPLE_RATE)
+        states[start // frame_length:min(len(states), (start + BLOCK) // frame_length + 1)] = speech
+    return states
+
+
+def new_frame_states(audio: np.ndarray, vad, threshold: float) -> np.ndarray:
+    """État lissé de FrameVAD pour chaque trame de 30 ms."""
+    detector = FrameVAD(SAMPLE_RATE, vad=vad, threshold=threshold)
+    frame_length = detector.frame_length
+    states = np.zeros(len(audio) // frame_length, dtype=bool)
+    for i in range(len(states)):
+        states[i] = detector.process(audio[i * frame_length:(i + 1) * frame_length])
+    return states
+
+
+def old_endpoint(audio: np.ndarray, vad, threshold: float):
+    """
+    Endpointing de l'ancienne session (silence compté par bloc).
+
+    Returns:
+        (fin de parole estimée, arrêt de l'enregistrement) en secondes
+    """
+    frame_length = int(SAMPLE_RATE * 0.03)
+    silence, total, has_speech, last_end = 0, 0, False, None
+    for start in range(0, len(audio) - BLOCK + 1, BLOCK):
+        block = audio[start:start + BLOCK]
+        total += BLOCK
+        if vad is None:
+            speech = float(np.sqrt(np.mean(block ** 2))) >= threshold
+        else:
+            speech = vad.is_speech((block[:frame_length] * 32767).astype(np.int16).tobytes(), SAMPLE_RATE)
+        if speech:
+            has_speech, silence, last_end = True, 0, total
+        elif has_speech and total >= 0.3 * SAMPLE_RATE:
+            silence += BLOCK
+        if silence >= SILENCE_DURATION * SAMPLE_RATE:
+            return last_end / SAMPLE_RATE, total / SAMPLE_RATE
+    return (last_end / SAMPLE_RATE if last_end else None), total / SAMPLE_RATE
+
+
+def new_endpoint(audio: np.ndarray, vad, threshold: float):
+    """Endpointing de la session actuelle (FrameVAD), mêmes retours."""
+    detector = FrameVAD(SAMPLE_RATE, vad=vad, threshold=threshold)
+    total, has_speech, last_end = 0, False, None
+    for start in range(0, len(audio) - BLOCK + 1, BLOCK):
+        total += BLOCK
+        if detector.process(audio[start:start + BLOCK]):
+            has_speech = True
+        if has_speech:
+            last_end = detector.processed - detector.trailing_silence
+            if total >= 0.3 * SAMPLE_RATE and detector.trailing_silence >= SILENCE_DURATION * SAMPLE_RATE:
+                return last_end / SAMPLE_RATE, total / SAMPLE_RATE
+    return (last_end / SAMPLE_RATE if last_end else None), total / SAMPLE_RATE
+
+
+def cpu_per_second(audio: np.ndarray, vad, threshold: float, new: bool) -> float:
+    """Temps CPU (ms) par seconde d'audio, blocs de 512 échantillons."""
+    detector = FrameVAD(SAMPLE_RATE, vad=vad, threshold=threshold)
+    frame_length = detector.frame_length
+    start_cpu = time.process_time()
+    for _ in range(5):
+        for start in range(0, len(audio) - BLOCK + 1, BLOCK):
+            block = audio[start:start + BLOCK].reshape(-1, 1)
+            if new:
+                detector.process(block)
+            elif vad is None:
+                float(np.sqrt(np.mean(block ** 2))) >= threshold
+            else:
+                audio_int16 = (block.flatten() * 32767).astype(np.int16)
+                vad.is_speech(audio_int16[:frame_length].tobytes(), SAMPLE_RATE)
+    return (time.process_time() - start_cpu) * 1000 / (5 * len(audio) / SAMPLE_RATE)
+
+
+# --- Évaluation -----------------------------------------------------------
+
+def evaluate(corpus: str, labels: dict):
+    vad = webrtcvad.Vad(2) if webrtcvad else None
+    frame_length = int(SAMPLE_RATE * 0.03)
+    results = {name: {'fa': 0, 'miss': 0, 'frames': 0, 'end_err': [], 'cut': 0, 'cpu': []}
+               for name in ('avant', 'après')}
+
+    for clip, segments in sorted(labels.items()):
+        audio = load_wav(os.path.join(corpus, clip), SAMPLE_RATE)
+        threshold = _threshold(audio)
+        truth = np.zeros(len(audio) // frame_length, dtype=bool)
+        for begin, end in segments:
+            truth[int(begin / 0.03):int(np.ceil(end / 0.03))] = True
+        true_end = max(end for _, end in segments)
+
+        for name, states_func, endpoint_func, new in (
+            ('avant', old_frame_states, old_endpoint, False),
+            ('après', new_frame_states, new_endpoint, True),
+        ):
+            states = states_func(audio, vad, threshold)[:len(truth)]
+            r = results[name]
+            r['frames'] += len(states)
+            r['fa'] += int(np.sum(states & ~truth[:len(states)]))
+            r['miss'] += int(np.sum(~states & truth[:len(states)]))
+            detected_end, stop_time = endpoint_func(audio, vad, threshold)
+            if detected_end is not None:
+                r['end_err'].append(detected_end - true_end)
+            if detected_end is None or stop_time < true_end:
+                r['cut'] += 1
+            r['cpu'].append(cpu_per_second(audio, vad, threshold, new))
+
+    print(f"VAD : {VAD_BACKEND} | {len(labels)} clips")
+    for name, r in results.items():
+        errors = np.abs(r['end_err']) * 1000 if r['end_err'] else np.zeros(1)
+        print(
+            f"  {name:<6} précision trames {100 * (1 - (r['fa'] + r['miss']) / r['frames']):5.1f} % "
+            f"(fausses alarmes {100 * r['fa'] / r['frames']:4.1f} %, manquées {100 * r['miss'] / r['frames']:4.1f} %) | "
+            f"fin de parole : erreur p50 {np.percentile(errors, 50):4.0f} ms p95 {np.percentile(errors, 95):4.0f} ms, "
+            f"commandes coupées {r['cut']} | CPU {np.mean(r['cpu']):.3f} ms/s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help="Dossier de clips annotés (généré s'il n'existe pas)")
+    parser.add_argument('--clips', type=int, default=30, help="Nombre de clips synthétiques à générer")
+    args = parser.parse_args()
+
+    corpus = args.corpus or os.path.join(tempfile.gettempdir(), "jarvis_vad_corpus")
+    labels_path = os.path.join(corpus, "labels.json")
+    if os.path.exists(labels_path):
+        with open(labels_path, encoding="utf-8") as f:
+            labels = json.load(f)
+    else:
+        print(f"Génération de {args.clips} clips synthétiques dans {corpus}")
+        labels = generate_corpus(corpus, args.clips)
+
+    evaluate(corpus, labels)
+
+
+if __name__ == "__main__":
+    main()
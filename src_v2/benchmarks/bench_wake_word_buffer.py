@@ -0,0 +1,102 @@
+"""
+Benchmark du buffering de la boucle wake word (flux dédié).
+
+Compare, sur une heure d'écoute simulée sans wake word :
+- AVANT : liste Python étendue à chaque bloc puis retranchée à chaque frame
+- APRÈS : buffer circulaire int16 préalloué + vues sans copie
+
+Porcupine est remplacé par une fonction vide pour ne mesurer que le buffering.
+Le résultat est extrapolé en secondes CPU par heure d'écoute.
+
+Exécuter depuis src_v2 : python benchmarks/bench_wake_word_buffer.py [--minutes 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from audio.ring_buffer import AudioRingBuffer
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 512  # porcupine.frame_length
+
+
+def fake_process(frame) -> int:
+    """Remplace porcupine.process (aucun wake word)."""
+    return -1
+
+
+def make_blocks(count: int) -> list:
+    """Blocs float32 (N, 1) comme ceux fournis par sd.InputStream."""
+    rng = np.random.default_rng(0)
+    pool = [(rng.standard_normal((FRAME_LENGTH, 1)) * 0.01).astype(np.float32) for _ in range(16)]
+    return [pool[i % len(pool)] for i in range(count)]
+
+
+def run_list_buffer(blocks) -> float:
+    """Implémentation d'origine : liste de scalaires NumPy."""
+    audio_buffer = []
+    start = time.process_time()
+    for indata in blocks:
+        # Callback
+        audio_int16 = (indata[:, 0] * 32767).astype(np.int16)
+        audio_buffer.extend(audio_int16)
+        # Boucle
+        while len(audio_buffer) >= FRAME_LENGTH:
+            frame = audio_buffer[:FRAME_LENGTH]
+            audio_buffer = audio_buffer[FRAME_LENGTH:]
+            fake_process(frame)
+    return time.process_time() - start
+
+
+def run_ring_buffer(blocks) -> float:
+    """Nouvelle implémentation : buffer circulaire int16 + vues."""
+    audio_ring = AudioRingBuffer((SAMPLE_RATE // FRAME_LENGTH) * FRAME_LENGTH, dtype=np.int16)
+    conversion_buffer = np.empty(FRAME_LENGTH, dtype=np.float32)
+    frame_scratch = np.empty(FRAME_LENGTH, dtype=np.int16)
+    read_position = 0
+    start = time.process_time()
+    for indata in blocks:
+        # Callback
+        samples = indata[:, 0]
+        scaled = conversion_buffer[:len(samples)]
+        np.multiply(samples, 32767, out=scaled)
+        audio_ring.write(scaled)
+        # Boucle
+        while audio_ring.write_position - read_position >= FRAME_LENGTH:
+            frame = audio_ring.view(read_position, FRAME_LENGTH, frame_scratch)
+            read_position += FRAME_LENGTH
+            fake_process(frame)
+    return time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--minutes', type=float, default=5.0, help="Durée d'écoute simulée")
+    args = parser.parse_args()
+
+    block_count = int(args.minutes * 60 * SAMPLE_RATE / FRAME_LENGTH)
+    blocks = make_blocks(block_count)
+    scale = 60.0 / args.minutes
+
+    results = {
+        'liste Python (avant)': run_list_buffer(blocks),
+        'buffer circulaire (après)': run_ring_buffer(blocks),
+    }
+
+    print(f"Écoute simulée : {args.minutes:.1f} min ({block_count} frames)")
+    for name, cpu in results.items():
+        per_hour = cpu * scale
+        print(f"  {name:<28} {per_hour:8.2f} s CPU / heure  ({per_hour / 36:.3f} % d'un cœur)")
+
+    before, after = results.values()
+    if after > 0:
+        print(f"  Gain : x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark des réveils de la boucle wake word au repos.
+
+Un thread producteur imite le callback sounddevice (une frame de 512
+échantillons toutes les 32 ms) pendant quelques secondes. On compare :
+- AVANT : boucle qui vérifie le buffer et dort 10 ms (sd.sleep(10)) sinon
+- APRÈS : boucle réveillée par un threading.Event à chaque frame complète
+
+Mesures : réveils par seconde du thread d'écoute et latence entre l'arrivée
+d'une frame et son traitement (p50/p95).
+
+Exécuter depuis src_v2 : python benchmarks/bench_wake_word_wakeups.py [--seconds 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from audio.ring_buffer import AudioRingBuffer
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 512
+FRAMES_CAPACITY = SAMPLE_RATE // FRAME_LENGTH
+
+
+class _Harness:
+    """Producteur temps réel + buffer partagé par les deux variantes."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.ring = AudioRingBuffer(FRAMES_CAPACITY * FRAME_LENGTH, dtype=np.int16)
+        self.arrivals = np.zeros(FRAMES_CAPACITY)
+        self.data_ready = threading.Event()
+        self.running = True
+        self.block = np.zeros(FRAME_LENGTH, dtype=np.int16)
+
+    def produce(self):
+        period = FRAME_LENGTH / SAMPLE_RATE
+        next_time = time.monotonic()
+        end = next_time + self.seconds
+        while next_time < end:
+            next_time += period
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            position = self.ring.write(self.block)
+            self.arrivals[((position - 1) // FRAME_LENGTH) % FRAMES_CAPACITY] = time.monotonic()
+            self.data_ready.set()
+        self.running = False
+        self.data_ready.set()
+
+
+def run_polling(seconds: float) -> dict:
+    """Boucle d'origine : sleep de 10 ms quand le buffer est trop court."""
+    harness = _Harness(seconds)
+    wakeups, latencies, read_position = 0, [], 0
+    producer = threading.Thread(target=harness.produce)
+    start_cpu = time.process_time()
+    producer.start()
+    while harness.running:
+        wakeups += 1
+        if harness.ring.write_position - read_position >= FRAME_LENGTH:
+            read_position += FRAME_LENGTH
+            latencies.append(time.monotonic() - harness.arrivals[((read_position - 1) // FRAME_LENGTH) % FRAMES_CAPACITY])
+        else:
+            time.sleep(0.010)
+    producer.join()
+    return _summary(wakeups, latencies, seconds, time.process_time() - start_cpu)
+
+
+def run_event(seconds: float) -> dict:
+    """Nouvelle boucle : attente bloquante sur un threading.Event."""
+    harness = _Harness(seconds)
+    wakeups, latencies, read_position = 0, [], 0
+    producer = threading.Thread(target=harness.produce)
+    start_cpu = time.process_time()
+    producer.start()
+    while harness.running:
+        if not harness.data_ready.wait(timeout=0.5):
+            continue
+        harness.data_ready.clear()
+        wakeups += 1
+        while harness.ring.write_position - read_position >= FRAME_LENGTH:
+            read_position += FRAME_LENGTH
+            latencies.append(time.monotonic() - harness.arrivals[((read_position - 1) // FRAME_LENGTH) % FRAMES_CAPACITY])
+    producer.join()
+    return _summary(wakeups, latencies, seconds, time.process_time() - start_cpu)
+
+
+def _summary(wakeups: int, latencies: list, seconds: float, cpu: float) -> dict:
+    lat_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        'wakeups_per_s': wakeups / seconds,
+        'latency_p50_ms': float(np.percentile(lat_ms, 50)),
+        'latency_p95_ms': float(np.percentile(lat_ms, 95)),
+        'cpu_s': cpu,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=5.0, help="Durée de chaque mesure")
+    args = parser.parse_args()
+
+    print(f"Écoute au repos simulée : {args.seconds:.0f} s par variante")
+    for name, func in (('polling 10 ms (avant)', run_polling), ('événementiel (après)', run_event)):
+        r = func(args.seconds)
+        print(
+            f"  {name:<24} {r['wakeups_per_s']:6.1f} réveils/s | "
+            f"latence p50 {r['latency_p50_ms']:5.2f} ms  p95 {r['latency_p95_ms']:5.2f} ms | "
+            f"CPU {r['cpu_s'] * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
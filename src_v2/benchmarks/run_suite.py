@@ -0,0 +1,368 @@
+"""
+Suite de benchmarks du pipeline (exécutable sans micro, sans GPU, hors Windows).
+
+Cas mesurés :
+- dsp       : passe-bande et débruitage en flux (ms par seconde d'audio)
+- vad       : FrameVAD sur tous les blocs (ms par seconde d'audio)
+- stt       : décodage Whisper par taille de modèle (--models), par commande
+- nlu       : IntentParser.parse et correspondance approchée des applications
+- actions   : correspondance d'applications du SystemController, recherche de
+              fichiers dans une arborescence générée
+
+Corpus : --corpus DOSSIER (commandes enregistrées .wav, voir transcribe_batch.py),
+sinon commandes synthétiques reproductibles (voix harmonique de bench_vad.py).
+
+Les cas dont une dépendance manque (faster-whisper, psutil, modèle non
+téléchargé...) sont notés "ignoré" avec la raison : sounddevice, pvporcupine et
+win32com ne sont jamais nécessaires.
+
+Chaque exécution écrit un fichier JSON (benchmarks/results/ par défaut) :
+machine, commit, paramètres et statistiques par cas (p50/p95/moyenne en ms).
+--compare ANCIEN.json affiche l'écart de p50 avec une exécution précédente.
+
+Exécuter depuis src_v2 : python benchmarks/run_suite.py [--only dsp,nlu] [--models tiny,base] [--compare results/ancien.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import subprocess
+import tempfile
+import numpy as np
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_vad import synth_speech, synth_background
+
+SAMPLE_RATE = 16000
+BLOCK_SIZE = 512
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+# Commandes typiques (dont transcriptions approximatives) pour la NLU
+COMMANDS = [
+    "ouvre chrome", "lance spotify", "ferme discord", "ouvre la calculatrice",
+    "démarre bambu studio", "ferme le navigateur", "cherche sur le web météo paris",
+    "scroll down", "descends", "écris bonjour à tous", "ferme la fenêtre",
+    "ouvre crome", "lance spotifi", "ferme fire fox", "quelle heure est-il",
+    "raconte-moi une blague", "merci jarvis", "ouvre le bloc note",
+]
+# Noms d'applications mal transcrits (correspondance approchée)
+APP_QUERIES = ["chrome", "crome", "spotifi", "fire fox", "bambu", "calculette", "vs code", "inconnue"]
+
+CASES = []
+
+
+class SkipCase(Exception):
+    """Cas impossible sur cette machine (dépendance ou modèle absent)."""
+
+
+def case(group: str, name: str):
+    """Enregistre une fonction de benchmark : elle retourne {mesure: statistiques}."""
+    def decorator(func):
+        CASES.append((group, name, func))
+        return func
+    return decorator
+
+
+def measure(func, min_time: float = 0.5, min_runs: int = 5, warmup: int = 1) -> dict:
+    """
+    Chronomètre des appels répétés de `func`.
+
+    Args:
+        func: Fonction sans argument
+        min_time: Durée minimale de mesure (secondes)
+        min_runs: Nombre minimal d'appels mesurés
+        warmup: Appels non mesurés (caches, allocations)
+
+    Returns:
+        Statistiques en ms : runs, mean, p50, p95, min
+    """
+    for _ in range(warmup):
+        func()
+    times = []
+    deadline = time.perf_counter() + min_time
+    while len(times) < min_runs or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        'runs': len(times),
+        'mean_ms': float(np.mean(times)),
+        'p50_ms': float(np.percentile(times, 50)),
+        'p95_ms': float(np.percentile(times, 95)),
+        'min_ms': float(np.min(times)),
+    }
+
+
+def load_config() -> dict:
+    """config.yaml de l'application."""
+    with open(os.path.join(os.path.dirname(__file__), '..', 'config', 'config.yaml'), encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def build_corpus(directory, count: int = 8):
+    """
+    Commandes enregistrées (--corpus) ou synthétiques.
+
+    Returns:
+        (liste d'audio float32, description)
+    """
+    if directory:
+        from transcribe_batch import load_corpus
+        clips = [audio for _, audio, _ in load_corpus([directory])]
+        if clips:
+            return clips, f"{len(clips)} commandes enregistrées ({directory})"
+    rng = np.random.default_rng(0)
+    clips = []
+    for _ in range(count):
+        speech = np.concatenate([synth_speech(rng, rng.uniform(0.4, 0.9)) * 0.3 for _ in range(rng.integers(1, 4))])
+        audio = np.concatenate([np.zeros(4000), speech, np.zeros(4000)])
+        clips.append((audio + synth_background(rng, len(audio), "rose") * 0.005).astype(np.float32))
+    return clips, f"{count} commandes synthétiques"
+
+
+def per_audio_second(stats: dict, seconds: float) -> dict:
+    """Ajoute le coût par seconde d'audio traitée."""
+    stats['ms_per_audio_s'] = stats['p50_ms'] / seconds
+    return stats
+
+
+@case('dsp', 'bandpass')
+def bench_bandpass(ctx):
+    from audio.dsp import StreamingBandpass
+    audio = ctx['stream']
+    bandpass = StreamingBandpass(SAMPLE_RATE)
+
+    def run():
+        for i in range(0, len(audio), BLOCK_SIZE):
+            bandpass.process(audio[i:i + BLOCK_SIZE])
+    return {'stream': per_audio_second(measure(run), len(audio) / SAMPLE_RATE)}
+
+
+@case('dsp', 'noise_suppressor')
+def bench_noise_suppressor(ctx):
+    from audio.dsp import NoiseProfile, StreamingNoiseSuppressor
+    audio = ctx['stream']
+    profile = NoiseProfile(SAMPLE_RATE)
+    profile.update(synth_background(np.random.default_rng(1), SAMPLE_RATE * 2, "rose").astype(np.float32) * 0.005)
+    suppressor = StreamingNoiseSuppressor(profile)
+
+    def run():
+        for i in range(0, len(audio), BLOCK_SIZE):
+            suppressor.process(audio[i:i + BLOCK_SIZE])
+    return {'stream': per_audio_second(measure(run), len(audio) / SAMPLE_RATE)}
+
+
+@case('vad', 'frame_vad')
+def bench_frame_vad(ctx):
+    from audio.vad import FrameVAD
+    try:
+        import webrtcvad
+        backends = {'webrtc': lambda: webrtcvad.Vad(2), 'rms': lambda: None}
+    except ImportError:
+        backends = {'rms': lambda: None}
+    audio = ctx['stream'].reshape(-1)
+    results = {}
+    for backend, make_vad in backends.items():
+        vad = FrameVAD(SAMPLE_RATE, vad=make_vad())
+
+        def run():
+            vad.reset()
+            for i in range(0, len(audio), BLOCK_SIZE):
+                vad.process(audio[i:i + BLOCK_SIZE])
+        results[backend] = per_audio_second(measure(run), len(audio) / SAMPLE_RATE)
+    return results
+
+
+@case('stt', 'whisper_decode')
+def bench_whisper(ctx):
+    from audio.stt import STTEngine, WHISPER_AVAILABLE
+    if not WHISPER_AVAILABLE:
+        raise SkipCase("faster-whisper absent")
+    clips = ctx['clips']
+    audio_s = sum(len(clip) for clip in clips) / SAMPLE_RATE
+    results = {}
+    for model_size in ctx['models']:
+        engine = STTEngine(model_size=model_size, use_gpu=False, background_load=False, enable_vad=False, cache_size=0)
+        if not engine.is_ready:
+            results[model_size] = {'skipped': "modèle indisponible (téléchargement impossible ?)"}
+            continue
+        prepared = [engine._preprocess_audio(clip) for clip in clips]
+        index = iter(range(10 ** 9))
+
+        def run():
+            engine._decode(prepared[next(index) % len(prepared)], cascade=False)
+        stats = measure(run, min_time=ctx['min_time'] * 4, min_runs=len(prepared))
+        stats['rtf'] = stats['mean_ms'] / 1000 / (audio_s / len(clips))
+        results[model_size] = stats
+        engine.cleanup()
+    return results
+
+
+@case('nlu', 'intent_parse')
+def bench_intent_parse(ctx):
+    parser = ctx['intent_parser']
+    index = iter(range(10 ** 9))
+
+    def run():
+        parser.parse(COMMANDS[next(index) % len(COMMANDS)])
+    return {'command': measure(run, min_time=ctx['min_time'])}
+
+
+@case('nlu', 'app_matching')
+def bench_nlu_app_matching(ctx):
+    parser = ctx['intent_parser']
+
+    def run():
+        for query in APP_QUERIES:
+            parser._is_known_app(query)
+    stats = measure(run, min_time=ctx['min_time'])
+    stats['apps'] = len(parser.app_paths)
+    return {'query_batch': stats}
+
+
+def _system_controller(ctx):
+    try:
+        from actions.system_control import SystemController
+    except ImportError as e:
+        raise SkipCase(f"SystemController non importable : {e}")
+    return SystemController(ctx['apps'])
+
+
+@case('actions', 'app_matching')
+def bench_controller_app_matching(ctx):
+    controller = _system_controller(ctx)
+
+    def run():
+        # Résolution complète (sans le cache du registre), comparable aux anciens résultats
+        controller.registry._resolved.clear()
+        for query in APP_QUERIES:
+            controller._find_best_app_match(query)
+    stats = measure(run, min_time=ctx['min_time'])
+    stats['apps'] = len(controller.app_paths)
+    return {'query_batch': stats}
+
+
+@case('actions', 'file_search')
+def bench_file_search(ctx):
+    controller = _system_controller(ctx)
+    root = tempfile.mkdtemp(prefix="jarvis_bench_")
+    try:
+        # Arborescence de 50 dossiers x 40 fichiers
+        for d in range(50):
+            folder = os.path.join(root, f"projet_{d}", "sous_dossier")
+            os.makedirs(folder)
+            for f in range(40):
+                extension = ('stl', 'pdf', 'txt', 'png')[f % 4]
+                open(os.path.join(folder, f"fichier_{d}_{f}.{extension}"), 'w').close()
+        results = {}
+        for label, query, extension in (("nom", "fichier_49_3", None), ("extension", "fichier", "stl")):
+            stats = measure(lambda: controller.search_files(query, extension, roots=[root], max_results=10 ** 6), min_time=ctx['min_time'])
+            stats['files'] = 2000
+            results[label] = stats
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def git_commit() -> str:
+    """Commit courant du dépôt (ou 'inconnu')."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(__file__), capture_output=True, text=True, timeout=5
+        ).stdout.strip() or "inconnu"
+    except (OSError, subprocess.SubprocessError):
+        return "inconnu"
+
+
+def print_comparison(results: dict, previous_path: str):
+    """Écart de p50 par mesure avec une exécution précédente."""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)['results']
+    print(f"\nComparaison avec {previous_path} (p50) :")
+    for key, measures in results.items():
+        for label, stats in measures.items():
+            before = previous.get(key, {}).get(label, {})
+            if 'p50_ms' in stats and 'p50_ms' in before:
+                delta = (stats['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100
+                print(f"  {key + ' ' + label:<40} {before['p50_ms']:9.3f} -> {stats['p50_ms']:9.3f} ms ({delta:+.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', help="Groupes à exécuter, séparés par des virgules (dsp,vad,stt,nlu,actions)")
+    parser.add_argument('--models', default='tiny', help="Tailles de modèle Whisper, séparées par des virgules")
+    parser.add_argument('--corpus', help="Dossier de commandes enregistrées (.wav)")
+    parser.add_argument('--min-time', type=float, default=0.5, help="Durée minimale de mesure par cas (secondes)")
+    parser.add_argument('--output', help="Fichier de résultats (défaut : benchmarks/results/<date>_<commit>.json)")
+    parser.add_argument('--compare', help="Résultats d'une exécution précédente")
+    args = parser.parse_args()
+
+    import logging
+    logging.basicConfig(level=logging.ERROR)
+
+    config = load_config()
+    clips, corpus_label = build_corpus(args.corpus)
+    from nlu.intent_parser import IntentParser
+    apps = config.get('applications', {})
+    ctx = {
+        'clips': clips,
+        'stream': np.concatenate(clips).reshape(-1, 1),
+        'models': [m.strip() for m in args.models.split(',') if m.strip()],
+        'min_time': args.min_time,
+        'apps': apps,
+        'intent_parser': IntentParser(config.get('app_aliases', {}), apps),
+    }
+    groups = set(args.only.split(',')) if args.only else None
+
+    print(f"Corpus : {corpus_label} ({len(ctx['stream']) / SAMPLE_RATE:.1f}s d'audio)")
+    results = {}
+    for group, name, func in CASES:
+        if groups and group not in groups:
+            continue
+        key = f"{group}.{name}"
+        try:
+            results[key] = func(ctx)
+        except SkipCase as e:
+            results[key] = {'skipped': {'reason': str(e)}}
+        for label, stats in results[key].items():
+            if 'p50_ms' in stats:
+                extra = f" | {stats['ms_per_audio_s']:.2f} ms/s d'audio" if 'ms_per_audio_s' in stats else ""
+                extra += f" | RTF {stats['rtf']:.3f}" if 'rtf' in stats else ""
+                print(f"  {key + ' ' + label:<40} p50 {stats['p50_ms']:9.3f} ms  p95 {stats['p95_ms']:9.3f} ms{extra}")
+            else:
+                name = key if label == 'skipped' else f"{key} {label}"
+                print(f"  {name:<40} ignoré : {stats.get('reason', stats.get('skipped'))}")
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d_%H%M%S')}_{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': commit,
+            'machine': {
+                'platform': platform.platform(),
+                'processor': platform.processor() or platform.machine(),
+                'cpus': os.cpu_count(),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+            },
+            'parameters': {'corpus': corpus_label, 'models': ctx['models'], 'min_time': args.min_time},
+            'results': results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"Résultats écrits dans {output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
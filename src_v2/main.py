@@ -11,12 +11,16 @@ from brain import Brain
 from ui import build as build_ui
 
 # Imports Backend (Locaux maintenant)
+from audio.capture import AudioCaptureService
 from audio.wake_word import WakeWordDetector
 from audio.stt import STTEngine
 from audio.tts import TTSEngine
 from nlu.intent_parser import IntentParser
+from nlu.app_registry import app_registry
 from actions.system_control import SystemController
+from actions.dispatch import execute_intent
 from utils.app_indexer import AppIndexer
+from utils.tracing import tracer
 # On garde config_manager pour l'UI mais on charge le yaml pour le backend
 from config_manager import config as ui_config
 
@@ -38,7 +42,16 @@ class JarvisController:
         # Charger la config YAML complète pour le backend
         self._load_backend_config()
         
+        # Traçage de la latence par étape (panneau DIAGNOSTICS)
+        tracing_conf = self.backend_config.get('tracing', {})
+        tracer.configure(
+            enabled=tracing_conf.get('enabled', True),
+            export_path=tracing_conf.get('export_path'),
+            max_commands=tracing_conf.get('history', 200)
+        )
+        
         # Composants
+        self.capture_service = None
         self.wake_word_detector = None
         self.stt_engine = None
         self.tts_engine = None
@@ -77,31 +90,44 @@ class JarvisController:
             )
             self.ui.add_log("MODULE TTS: OK", "SYS")
             
-            # 2. STT
+            # 2. Capture audio partagée (un seul flux micro pour tout le pipeline)
             stt_conf = self.backend_config.get('stt', {})
             audio_conf = self.backend_config.get('audio', {})
-            self.stt_engine = STTEngine(
-                model_size=stt_conf.get('model', 'tiny'),
-                language=stt_conf.get('language', 'fr'),
-                use_gpu=stt_conf.get('use_gpu', False),
-                enable_noise_reduction=stt_conf.get('enable_noise_reduction', True),
-                enable_vad=stt_conf.get('enable_vad', True),
-                level_callback=self.ui.update_audio_level_threadsafe  # Callback visuel thread-safe
+            if audio_conf.get('shared_capture', True):
+                self.capture_service = AudioCaptureService(
+                    sample_rate=audio_conf.get('sample_rate', 16000),
+                    device_index=audio_conf.get('input_device_index'),
+                    buffer_duration=audio_conf.get('capture_buffer_duration', 10.0),
+                    level_callback=self.ui.update_audio_level_threadsafe
+                )
+                self.ui.add_log("CAPTURE AUDIO PARTAGÉE: OK", "SYS")
+            
+            # 3. STT
+            self.stt_engine = STTEngine.from_config(
+                stt_conf,
+                audio_conf,
+                level_callback=self.ui.update_audio_level_threadsafe,  # Callback visuel thread-safe
+                capture_service=self.capture_service
             )
             self.ui.add_log("MODULE STT: OK (Whisper Tiny)", "SYS")
+            # Le modèle se charge en arrière-plan pendant la suite de l'initialisation
+            self.stt_engine.model_ready.add_done_callback(self._on_stt_model_ready)
             
-            # 3. Wake Word
+            # 4. Wake Word
             ww_conf = self.backend_config.get('wake_word', {})
             self.wake_word_detector = WakeWordDetector(
                 access_key=ww_conf.get('access_key', ''),
                 sensitivity=ww_conf.get('sensitivity', 0.7),
                 device_index=audio_conf.get('input_device_index'),
                 callback=self._on_wake_word_detected,
-                level_callback=self.ui.update_audio_level_threadsafe  # Callback visuel thread-safe
+                level_callback=self.ui.update_audio_level_threadsafe,  # Callback visuel thread-safe
+                capture_service=self.capture_service,
+                preroll_duration=audio_conf.get('preroll_duration', 1.5),
+                noise_profile=self.stt_engine.noise_profile
             )
             self.ui.add_log("DÉTECTEUR WAKE WORD: OK", "SYS")
             
-            # 4. NLU & Actions
+            # 5. NLU & Actions
             # Indexation dynamique des apps
             self.ui.add_log("INDEXATION DES APPLICATIONS...", "SYS")
             app_indexer = AppIndexer()
@@ -109,17 +135,25 @@ class JarvisController:
             installed_apps = app_indexer.get_installed_apps()
             self.ui.add_log(f"APPS INDEXÉES: {len(installed_apps)}", "SYS")
             
-            # Fusion avec la config manuelle (la config manuelle est prioritaire pour les alias)
-            configured_apps = self.backend_config.get('applications', {})
-            # On fusionne : d'abord les installées, puis on écrase avec les configurées (pour garder les chemins custom si besoin)
-            all_apps = installed_apps.copy()
-            all_apps.update(configured_apps)
-            
+            # Registre unique : d'abord les installées, puis les configurées (chemins custom prioritaires)
+            app_registry.load(
+                installed_apps,
+                self.backend_config.get('applications', {}),
+                self.backend_config.get('app_aliases', {})
+            )
+            # Parseur et contrôleur partagent le registre (une seule résolution par commande)
             self.intent_parser = IntentParser(
-                self.backend_config.get('app_aliases', {}), 
-                all_apps
+                registry=app_registry,
+                corrections=self.backend_config.get('transcription_corrections', {})
             )
-            self.system_controller = SystemController(all_apps)
+            self.system_controller = SystemController(registry=app_registry)
+            # Fin de commande anticipée quand le texte partiel est une commande complète
+            self.stt_engine.set_command_checker(self.intent_parser.is_complete_command)
+            # Second décodage (modèle de repli) si le texte ne donne aucune intention connue
+            self.stt_engine.set_intent_checker(self.intent_parser.is_known_command)
+            # Décodage orienté vers les verbes et applications réellement connus
+            if stt_conf.get('dynamic_vocabulary', True):
+                self.stt_engine.set_vocabulary(*self.intent_parser.get_command_vocabulary())
             self.ui.add_log("SYSTÈMES DE CONTRÔLE: OK", "SYS")
             
             self.ui.add_log("TOUS LES SYSTÈMES OPÉRATIONNELS", "SYS")
@@ -132,6 +166,13 @@ class JarvisController:
     def start_listening(self):
         """Démarre l'écoute du wake word."""
         if self.wake_word_detector and not self.is_active:
+            # Le flux partagé est ouvert une seule fois et reste actif
+            if self.capture_service and not self.capture_service.start():
+                self.ui.add_log("ÉCHEC CAPTURE PARTAGÉE, FLUX DÉDIÉS", "ERR")
+                self.capture_service = None
+                self.wake_word_detector.capture_service = None
+                self.stt_engine.capture_service = None
+            
             if self.wake_word_detector.start_listening():
                 self.is_active = True
                 self.ui.status_label.text = "EN VEILLE"
@@ -152,10 +193,9 @@ class JarvisController:
     def _process_command_loop(self):
         """Boucle de traitement d'une commande."""
         try:
-            # 1. Pause Wake Word
+            # 1. Pause Wake Word (le flux partagé reste ouvert)
             if self.wake_word_detector:
-                self.wake_word_detector.stop_listening()
-                # time.sleep(0.5) # SUPPRIMÉ pour vitesse
+                self.wake_word_detector.pause()
             
             # Update UI -> LISTENING
             self.ui.set_state_threadsafe("LISTENING")
@@ -171,7 +211,10 @@ class JarvisController:
             # 3. Écoute
             audio_conf = self.backend_config.get('audio', {})
             texte = self.stt_engine.ecouter_et_transcrire(
-                device_index=audio_conf.get('input_device_index')
+                device_index=audio_conf.get('input_device_index'),
+                start_position=self.wake_word_detector.last_detection_position,
+                preroll=self.wake_word_detector.get_preroll(),
+                partial_callback=self._on_partial_transcript
             )
             
             if not texte:
@@ -213,57 +256,39 @@ class JarvisController:
             self.is_processing = False
             self.ui.set_state_threadsafe("IDLE")
             
+            record = tracer.end_command()
+            if record and 'end_to_end_ms' in record:
+                self.ui.add_log_threadsafe(f"LATENCE: {record['end_to_end_ms']:.0f} MS", "SYS")
+            
             # Reprise Wake Word
             if self.wake_word_detector:
-                self.wake_word_detector.start_listening()
+                self.wake_word_detector.resume()
+
+    def _on_stt_model_ready(self, future):
+        """Callback (thread de chargement) : modèle Whisper chargé et préchauffé."""
+        try:
+            ready = future.result()
+        except Exception:
+            ready = False
+        if ready:
+            stats = self.stt_engine.load_stats
+            self.ui.add_log_threadsafe(
+                f"MODÈLE WHISPER PRÊT ({stats.get('load_s', 0):.1f}s + préchauffage {stats.get('warmup_s', 0):.1f}s)",
+                "SYS"
+            )
+        else:
+            self.ui.add_log_threadsafe("MODÈLE WHISPER INDISPONIBLE", "ERR")
+
+    def _on_partial_transcript(self, texte):
+        """Callback des hypothèses partielles du STT (pendant que l'utilisateur parle)."""
+        self.ui.add_log_threadsafe(f"... {texte}", "USR")
 
     def _execute_action(self, intent, params):
         """Exécute l'action demandée."""
-        response = ""
-        success = False
-        
-        if intent == 'open_app':
-            app_name = params.get('app_name', '')
-            # Vérifier si l'app est connue avant de tenter l'ouverture
-            if self.system_controller.get_app_path(app_name):
-                success, real_name = self.system_controller.open_app(app_name)
-                response = f"J'ouvre {real_name} immédiatement." if success else f"Je n'arrive pas à lancer {real_name}."
-            else:
-                # App inconnue, on ne dit rien ou une phrase plus douce
-                logger.warning(f"App inconnue demandée : {app_name}")
-                response = f"Je ne connais pas l'application {app_name}."
-            
-        elif intent == 'close_app':
-            app_name = params.get('app_name', '')
-            success, real_name = self.system_controller.close_app(app_name)
-            response = f"Je ferme {real_name} pour vous." if success else f"Je ne peux pas fermer {real_name}."
-            
-        elif intent == 'web_search':
-            query = params.get('query', '')
-            if query:
-                success = self.system_controller.web_search(query)
-                response = f"Je recherche '{query}' sur Comet." if success else "Impossible de lancer la recherche."
-            else:
-                response = "Que voulez-vous que je cherche ?"
-            
-        elif intent == 'small_talk':
-            st_type = params.get('type', 'unknown')
-            if st_type == 'greeting':
-                import random
-                response = random.choice(["Bonjour commandant.", "Salut.", "Je suis à l'écoute.", "Systèmes prêts."])
-            elif st_type == 'thanks':
-                response = "Je vous en prie."
-            elif st_type == 'goodbye':
-                response = "Au revoir, à bientôt."
-                # Optionnel : self.stop()
-            elif st_type == 'status':
-                response = "Tous les systèmes sont opérationnels et prêts."
-            else:
-                response = "Je suis là."
-            success = True
-
-        # ... Ajouter les autres intents ici ...
-        
+        # Commandes système : même exécution que le rejeu (actions/dispatch.py)
+        result = execute_intent(self.system_controller, intent, params)
+        if result is not None:
+            success, response = result
         else:
             # Fallback sur le Brain LLM si pas de commande système
             if self.ui.brain:
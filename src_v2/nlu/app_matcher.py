@@ -0,0 +1,209 @@
+"""
+Index de correspondance approchée des noms d'applications pour Jarvis Commander.
+
+difflib.get_close_matches compare la requête à chaque application indexée
+(des centaines d'entrées du menu Démarrer) à chaque commande. L'index est
+construit une fois quand les applications sont chargées :
+- index inversé des trigrammes de caractères (nom entouré d'espaces) ;
+- une requête ne score (SequenceMatcher, comme difflib) que les quelques
+  noms les plus proches en trigrammes partagés (coefficient de Dice) ;
+- table des clés phonétiques (nlu.phonetics) : un nom mal transcrit mais
+  prononcé pareil ("bambou" pour "bambu") est retrouvé par une seule
+  recherche dans un dictionnaire, sans passer par le score approché.
+"""
+
+import heapq
+import logging
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .phonetics import phonetic_key
+
+logger = logging.getLogger(__name__)
+
+NGRAM_SIZE = 3
+# Noms départagés par SequenceMatcher après le filtrage par trigrammes
+MAX_CANDIDATES = 8
+
+
+def ngrams(text: str, padded: bool = True) -> set:
+    """Trigrammes de caractères d'un texte (entouré d'espaces si `padded`)."""
+    if padded:
+        text = f" {text} "
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class AppMatcher:
+    """Recherche approchée de noms d'applications sur un index de trigrammes."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        Construit l'index.
+
+        Args:
+            names: Noms d'applications (l'ordre est conservé pour départager)
+        """
+        self.names: List[str] = []
+        self._positions: Dict[str, int] = {}
+        # Clé phonétique -> positions des noms qui la partagent
+        self._phonetic: Dict[str, List[int]] = {}
+        postings: Dict[str, List[int]] = {}
+        sizes: List[int] = []
+        for name in names:
+            if name in self._positions:
+                continue
+            self._positions[name] = len(self.names)
+            grams = ngrams(name)
+            for gram in grams:
+                postings.setdefault(gram, []).append(len(self.names))
+            sizes.append(len(grams))
+            key = phonetic_key(name)
+            if key:
+                self._phonetic.setdefault(key, []).append(len(self.names))
+            self.names.append(name)
+        self._index = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        # Nombre de trigrammes de chaque nom (normalisation du score)
+        self._sizes = np.array(sizes, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._positions
+
+    def _shared_ngrams(self, query: str, padded: bool = True) -> Optional[np.ndarray]:
+        """Nombre de trigrammes de la requête présents dans chaque nom (None si aucun)."""
+        lists = [self._index[gram] for gram in ngrams(query, padded) if gram in self._index]
+        if not lists:
+            return None
+        return np.bincount(np.concatenate(lists), minlength=len(self.names))
+
+    def phonetic_match(self, query: str) -> Optional[str]:
+        """
+        Nom indexé qui se prononce comme la requête.
+
+        Args:
+            query: Nom recherché (ex: "bambou", "crom")
+
+        Returns:
+            Nom trouvé ou None ; entre plusieurs homophones, le plus proche
+            à l'écrit (puis le premier indexé)
+        """
+        positions = self._phonetic.get(phonetic_key(query)) if query else None
+        if not positions:
+            return None
+        if len(positions) == 1:
+            return self.names[positions[0]]
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        best_score, best = -1.0, None
+        for index in positions:
+            matcher.set_seq1(self.names[index])
+            score = matcher.ratio()
+            if score > best_score:
+                best_score, best = score, self.names[index]
+        return best
+
+    def close_matches(self, query: str, n: int = 1, cutoff: float = 0.6) -> List[str]:
+        """
+        Équivalent indexé de difflib.get_close_matches(query, names, n, cutoff).
+
+        Args:
+            query: Nom recherché (éventuellement mal transcrit)
+            n: Nombre maximal de résultats
+            cutoff: Similarité minimale (ratio de SequenceMatcher)
+
+        Returns:
+            Noms les plus proches, du meilleur au moins bon
+        """
+        if not query or not self.names:
+            return []
+        shared = self._shared_ngrams(query)
+        if shared is None:
+            return []
+        # Dice : les noms longs ne sont pas favorisés par leur nombre de trigrammes
+        dice = shared / (self._sizes + len(ngrams(query)))
+        count = min(MAX_CANDIDATES, int(np.count_nonzero(shared)))
+        candidates = np.argpartition(-dice, count - 1)[:count] if count < len(dice) else np.flatnonzero(shared)
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        scored = []
+        for index in candidates:
+            name = self.names[index]
+            matcher.set_seq1(name)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                score = matcher.ratio()
+                if score >= cutoff:
+                    scored.append((score, name))
+        return [name for _, name in heapq.nlargest(n, scored)]
+
+    def find_substring(self, query: str, min_length: int = 0, whole_words: bool = False) -> Optional[str]:
+        """
+        Premier nom (dans l'ordre d'indexation) qui contient la requête ou
+        qu'elle contient.
+
+        Args:
+            query: Nom recherché
+            min_length: Longueur minimale de la partie commune (le plus court des deux)
+            whole_words: La partie commune doit commencer et finir sur des
+                limites de mots ("un" ne correspond pas à "uninstall")
+
+        Returns:
+            Nom trouvé ou None
+        """
+        if not query:
+            return None
+        best = len(self.names)
+
+        # Noms contenus dans la requête : toutes ses sous-chaînes, recherche exacte
+        for start in range(len(query)):
+            if whole_words and not _word_start(query, start):
+                continue
+            for end in range(start + max(min_length, 1), len(query) + 1):
+                if whole_words and not _word_end(query, end):
+                    continue
+                position = self._positions.get(query[start:end])
+                if position is not None and position < best:
+                    best = position
+
+        # Noms contenant la requête : ils ont tous ses trigrammes intérieurs
+        if len(query) >= min_length:
+            inner = ngrams(query, padded=False)
+            if inner:
+                if not all(gram in self._index for gram in inner):
+                    candidates = []
+                else:
+                    candidates = np.flatnonzero(self._shared_ngrams(query, padded=False) == len(inner))
+            else:
+                candidates = range(len(self.names))
+            for index in candidates:
+                if index >= best:
+                    break
+                if _contains(self.names[index], query, whole_words):
+                    best = index
+                    break
+
+        return self.names[best] if best < len(self.names) else None
+
+
+def _word_start(text: str, start: int) -> bool:
+    """Position en début de mot (séparateurs : tout caractère non alphanumérique)."""
+    return start == 0 or not text[start - 1].isalnum()
+
+
+def _word_end(text: str, end: int) -> bool:
+    """Position en fin de mot."""
+    return end == len(text) or not text[end].isalnum()
+
+
+def _contains(name: str, query: str, whole_words: bool) -> bool:
+    """La requête figure dans le nom (en mots entiers si demandé)."""
+    start = name.find(query)
+    while start != -1:
+        if not whole_words or (_word_start(name, start) and _word_end(name, start + len(query))):
+            return True
+        start = name.find(query, start + 1)
+    return False
@@ -0,0 +1,217 @@
+"""
+Registre unique des applications pour Jarvis Commander.
+
+Le parseur d'intentions et le contrôleur système recevaient chacun leur
+copie des applications et résolvaient chacun le nom prononcé (alias,
+phonétique, correspondance approchée). Le registre regroupe :
+- les applications (nom -> chemin), indexées puis configurées (prioritaires) ;
+- les alias (alias -> application) ;
+- les noms de processus à fermer pour chaque application ;
+- l'index de correspondance (AppMatcher) sur les noms et alias ;
+- le cache des noms déjà résolus : une commande n'est résolue qu'une fois,
+  le contrôleur retrouve directement le nom renvoyé par le parseur.
+"""
+
+import os
+import logging
+from typing import Dict, List, Optional
+
+from .app_matcher import AppMatcher
+
+logger = logging.getLogger(__name__)
+
+# Noms de processus connus (sinon : exécutable du chemin, puis nom + .exe)
+PROCESS_NAMES = {
+    'chrome': ['chrome.exe'],
+    'firefox': ['firefox.exe'],
+    'edge': ['msedge.exe'],
+    'bambu_studio': ['bambustudio.exe', 'bambu'],
+    'fusion_360': ['fusion360.exe', 'fusion'],
+    'discord': ['discord.exe'],
+    'vscode': ['code.exe'],
+    'notepad': ['notepad.exe'],
+    'explorer': ['explorer.exe'],
+    'calculator': ['calc.exe', 'calculator.exe'],
+}
+
+# Taille maximale du cache de résolution (vidé quand il est plein)
+RESOLVE_CACHE_SIZE = 1024
+# Correspondance partielle : mots entiers d'au moins 4 lettres
+# ("de" ne doit pas désigner "navigation privée de firefox", ni "un" "uninstall")
+SUBSTRING_MIN_LENGTH = 4
+# Nom "connu" par similarité (is_known) : 0.8, mais 0.9 pour les noms de moins
+# de 6 lettres (à 0.8, "de" -> "ide", "un" -> "run", "coude" -> "code")
+KNOWN_CUTOFF = 0.8
+KNOWN_SHORT_CUTOFF = 0.9
+KNOWN_SHORT_LENGTH = 6
+
+
+class AppRegistry:
+    """Applications, alias et index de correspondance partagés par le NLU et les actions."""
+
+    def __init__(self, apps: Optional[Dict[str, str]] = None, aliases: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            apps: Applications (nom -> chemin)
+            aliases: Alias (alias -> nom d'application)
+        """
+        self.apps: Dict[str, str] = {}
+        self.aliases: Dict[str, str] = {}
+        self._resolved: Dict[str, Optional[str]] = {}
+        self.update(apps or {}, aliases or {})
+
+    def load(self, installed: Dict[str, str], configured: Optional[Dict[str, str]] = None,
+             aliases: Optional[Dict[str, str]] = None):
+        """
+        Charge les applications indexées et configurées.
+
+        Args:
+            installed: Applications trouvées par l'indexeur
+            configured: Applications de config.yaml (prioritaires : chemins personnalisés)
+            aliases: Alias de config.yaml (None = conserver les alias actuels)
+        """
+        apps = dict(installed)
+        apps.update(configured or {})
+        self.update(apps, aliases)
+
+    def update(self, apps: Optional[Dict[str, str]] = None, aliases: Optional[Dict[str, str]] = None):
+        """
+        Remplace les applications et/ou les alias, puis reconstruit l'index.
+
+        Args:
+            apps: Nouvelles applications (None = inchangées)
+            aliases: Nouveaux alias (None = inchangés)
+        """
+        if apps is not None:
+            apps = {name.lower(): path for name, path in apps.items()}
+        else:
+            apps = self.apps
+        if aliases is not None:
+            aliases = {alias.lower(): name.lower() for alias, name in aliases.items()}
+        else:
+            aliases = self.aliases
+
+        # Applications puis alias, dans l'ordre (départage des correspondances)
+        matcher = AppMatcher(list(apps) + list(aliases))
+        process_names = {name: self._process_names(name, path) for name, path in apps.items()}
+
+        self.apps, self.aliases, self.matcher, self._process_names_by_app = apps, aliases, matcher, process_names
+        self._resolved = {}
+        logger.info(f"📇 Registre des applications : {len(apps)} applications, {len(aliases)} alias")
+
+    def add_alias(self, alias: str, app_name: str):
+        """
+        Ajoute un alias et réindexe les noms.
+
+        Args:
+            alias: L'alias (ex: "navigateur")
+            app_name: Le nom réel de l'app (ex: "chrome")
+        """
+        aliases = dict(self.aliases)
+        aliases[alias.lower()] = app_name.lower()
+        self.update(aliases=aliases)
+
+    def resolve(self, app_name: str) -> Optional[str]:
+        """
+        Résout un nom prononcé (éventuellement mal transcrit).
+
+        Ordre : alias exact, application exacte, même prononciation, nom
+        contenu dans la requête (ou qui la contient) en mots entiers d'au
+        moins SUBSTRING_MIN_LENGTH lettres, similarité >= 0.6.
+        Un alias trouvé est remplacé par son application.
+
+        Args:
+            app_name: Nom brut de l'application
+
+        Returns:
+            Nom de l'application (clé de self.apps, ou cible d'un alias) ou None
+        """
+        name = app_name.lower().strip()
+        if name in self._resolved:
+            return self._resolved[name]
+
+        if name in self.aliases:
+            resolved = self.aliases[name]
+        elif name in self.apps:
+            resolved = name
+        else:
+            match, kind = self.matcher.phonetic_match(name), "phonétique"
+            if match is None:
+                match = self.matcher.find_substring(name, min_length=SUBSTRING_MIN_LENGTH, whole_words=True)
+                kind = "partielle"
+            if match is None:
+                match, kind = next(iter(self.matcher.close_matches(name, n=1, cutoff=0.6)), None), "floue"
+            resolved = self.aliases.get(match, match)
+            if match is None:
+                logger.debug(f"Aucune correspondance pour : '{app_name}'")
+            elif match in self.aliases:
+                logger.info(f"Correspondance {kind} via alias : '{app_name}' → '{match}' → '{resolved}'")
+            else:
+                logger.info(f"Correspondance {kind} : '{app_name}' → '{resolved}'")
+
+        if len(self._resolved) >= RESOLVE_CACHE_SIZE:
+            self._resolved = {}
+        self._resolved[name] = resolved
+        return resolved
+
+    def is_known(self, app_name: str) -> bool:
+        """
+        Indique si un nom désigne sans ambiguïté une application connue.
+
+        Args:
+            app_name: Nom brut de l'application
+
+        Returns:
+            True si alias, application, homophone ou nom très proche
+            (KNOWN_CUTOFF, KNOWN_SHORT_CUTOFF pour les noms courts)
+        """
+        name = app_name.lower().strip()
+        if name in self.aliases or name in self.apps:
+            return True
+        if self.matcher.phonetic_match(name):
+            return True
+        cutoff = KNOWN_SHORT_CUTOFF if len(name) < KNOWN_SHORT_LENGTH else KNOWN_CUTOFF
+        return bool(self.matcher.close_matches(name, n=1, cutoff=cutoff))
+
+    def get_path(self, app_name: str) -> Optional[str]:
+        """
+        Chemin de l'application désignée par un nom prononcé.
+
+        Args:
+            app_name: Nom brut de l'application
+
+        Returns:
+            Chemin ou None
+        """
+        return self.apps.get(self.resolve(app_name))
+
+    def process_names(self, app_name: str) -> List[str]:
+        """
+        Noms de processus à rechercher pour fermer une application.
+
+        Args:
+            app_name: Nom de l'application (clé de self.apps de préférence)
+
+        Returns:
+            Liste des noms de processus
+        """
+        if app_name in self._process_names_by_app:
+            return self._process_names_by_app[app_name]
+        return self._process_names(app_name, None)
+
+    @staticmethod
+    def _process_names(app_name: str, path: Optional[str]) -> List[str]:
+        """Noms de processus : table connue, sinon exécutable du chemin puis nom + .exe."""
+        if app_name in PROCESS_NAMES:
+            return PROCESS_NAMES[app_name]
+        names = []
+        if path:
+            executable = os.path.basename(path.replace('\\', '/')).lower()
+            if executable.endswith('.exe'):
+                names.append(executable)
+        names += [f"{app_name}.exe", app_name]
+        return list(dict.fromkeys(names))
+
+
+# Instance partagée par le parseur, le contrôleur et les compétences
+app_registry = AppRegistry()
@@ -0,0 +1,107 @@
+"""
+Corrections de transcription par phrases pour Jarvis Commander.
+
+Whisper se trompe aussi sur plusieurs mots ("fusion trois cent soixante"
+pour "fusion 360"). Les corrections (mot ou phrase -> remplacement) sont
+rangées dans un trie de mots, construit une fois : le texte est parcouru
+en une seule passe, et à chaque mot on ne suit que les branches du trie
+qui commencent par ce mot (une recherche dans un dictionnaire pour la
+plupart des mots). Le coût ne dépend pas du nombre de corrections.
+"""
+
+import re
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Clé des nœuds du trie portant le remplacement d'une phrase complète
+_END = None
+
+
+def phrase_tokens(phrase: str) -> List[str]:
+    """Mots d'une phrase de correction, normalisés comme le texte transcrit (minuscules, sans ponctuation)."""
+    return re.sub(r'[^\w\s]', '', phrase.lower()).split()
+
+
+class PhraseCorrector:
+    """Remplace les mots et phrases mal transcrits (correspondance la plus longue d'abord)."""
+
+    def __init__(self, corrections: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            corrections: Phrase mal transcrite -> remplacement (ex: {"crôme": "chrome"})
+        """
+        self._root: Dict = {}
+        self._count = 0
+        for phrase, replacement in (corrections or {}).items():
+            self.add(phrase, replacement)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, phrase: str, replacement: str):
+        """
+        Ajoute (ou remplace) une correction.
+
+        Args:
+            phrase: Mot ou phrase mal transcrit
+            replacement: Texte corrigé (vide = supprimer la phrase)
+        """
+        tokens = phrase_tokens(phrase)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _END not in node:
+            self._count += 1
+        node[_END] = str(replacement).strip()
+
+    def correct(self, texte: str) -> str:
+        """
+        Applique les corrections en une passe (mots entiers ; à une même
+        position, la phrase la plus longue l'emporte).
+
+        Args:
+            texte: Texte normalisé (minuscules, sans ponctuation)
+
+        Returns:
+            Texte corrigé, espaces normalisés
+        """
+        words = texte.split()
+        if not self._root:
+            return ' '.join(words)
+
+        output = []
+        position, count = 0, len(words)
+        while position < count:
+            node = self._root.get(words[position])
+            if node is None:
+                output.append(words[position])
+                position += 1
+                continue
+
+            # Phrase la plus longue qui commence ici
+            end, replacement = None, None
+            cursor = position + 1
+            while True:
+                if _END in node:
+                    end, replacement = cursor, node[_END]
+                if cursor >= count:
+                    break
+                node = node.get(words[cursor])
+                if node is None:
+                    break
+                cursor += 1
+
+            if end is None:
+                output.append(words[position])
+                position += 1
+                continue
+            logger.debug(f"Correction : '{' '.join(words[position:end])}' -> '{replacement}'")
+            if replacement:
+                output.append(replacement)
+            position = end
+
+        return ' '.join(output)
@@ -5,45 +5,63 @@ Analyse les commandes vocales et extrait les intentions + paramètres.
 
 import re
 import logging
-from typing import Dict, Any, Optional, List
-from difflib import get_close_matches
+from typing import Dict, Any, Optional, List, Tuple
+
+from utils.tracing import tracer
+from .app_registry import AppRegistry
+from .corrections import PhraseCorrector
 
 logger = logging.getLogger(__name__)
 
+# Début de pattern "(?:ouvre|lance|...)\s" : mots déclencheurs suivis d'un espace
+LEADING_KEYWORDS = re.compile(r"\(\?:((?:[^\W\d_]|\\'|['-])+(?:\|(?:[^\W\d_]|\\'|['-])+)*)\)\\s")
+
+# Mots/expressions parasites à supprimer des noms d'applications et requêtes,
+# en une seule alternance (expressions avant les mots qu'elles contiennent)
+PARASITIC_WORDS = re.compile(
+    r"\b(?:s'il te pla[îi]t|s'il vous pla[îi]t|stp|svp"
+    r"|merci|vite|maintenant|tout de suite"
+    r"|le|la|les|l'|un|une|des"
+    r"|mon|ma|mes|ton|ta|tes"
+    r"|ce|cette|ces|cet)\b",
+    re.IGNORECASE
+)
+WHITESPACE = re.compile(r'\s+')
+PUNCTUATION = re.compile(r'[^\w\s]')
+
 
 class IntentParser:
     """Analyseur d'intentions basé sur des règles."""
     
-    def __init__(self, app_aliases: Optional[Dict[str, str]] = None, app_paths: Optional[Dict[str, str]] = None):
+    def __init__(self, app_aliases: Optional[Dict[str, str]] = None, app_paths: Optional[Dict[str, str]] = None,
+                 registry: Optional[AppRegistry] = None, corrections: Optional[Dict[str, str]] = None):
         """
         Initialise le parseur d'intentions.
         
         Args:
             app_aliases: Dictionnaire des alias d'applications (ex: {"navigateur": "chrome"})
             app_paths: Dictionnaire des chemins d'applications (pour fuzzy matching)
+            registry: Registre partagé avec le contrôleur (prioritaire sur app_aliases/app_paths)
+            corrections: Corrections de transcription supplémentaires (mot ou phrase -> remplacement),
+                section transcription_corrections de config.yaml
         """
-        self.app_aliases = app_aliases or {}
-        self.app_paths = app_paths or {}
+        self.registry = registry or AppRegistry(app_paths, app_aliases)
         
         # Corrections communes de transcription (erreurs fréquentes de Whisper)
+        # Les graphies homophones ("crom", "chrom", "naviguateur"...) sont
+        # résolues par les clés phonétiques de l'index des applications
         self.transcription_corrections = {
             'recalculate': 'calculatrice',
             'recalculatrice': 'calculatrice',
             'calculette': 'calculatrice',
             'calcul': 'calculatrice',
             'calculate': 'calculatrice',
-            'chrome': 'chrome',
-            'crom': 'chrome',
-            'naviguateur': 'chrome',
-            'navigateur': 'navigateur',
-            'navigater': 'navigateur',
-            'explorateur': 'explorateur',
             'explorer': 'explorateur',
             'explorate': 'explorateur',
             'côme': 'chrome',
-            'crome': 'chrome',
-            'chrom': 'chrome',
         }
+        self.transcription_corrections.update(corrections or {})
+        self._compile_corrections()
         
         # Patterns pour chaque type d'intention
         # ORDRE IMPORTANT : Les intentions spécifiques doivent être avant les génériques (open_app)
@@ -98,6 +116,58 @@ class IntentParser:
                 r'^([a-zA-Z0-9\s]+)$', # Nom d'app direct (ex: "Chrome") - TRÈS GÉNÉRIQUE, DOIT ÊTRE EN DERNIER
             ],
         }
+        self._compile_patterns()
+    
+    @property
+    def app_paths(self) -> Dict[str, str]:
+        """Applications connues (nom -> chemin), lues dans le registre."""
+        return self.registry.apps
+    
+    @app_paths.setter
+    def app_paths(self, app_paths: Dict[str, str]):
+        """Remplace les applications du registre (et reconstruit son index)."""
+        self.registry.update(apps=app_paths)
+    
+    @property
+    def app_aliases(self) -> Dict[str, str]:
+        """Alias d'applications (alias -> nom), lus dans le registre."""
+        return self.registry.aliases
+    
+    @app_aliases.setter
+    def app_aliases(self, app_aliases: Dict[str, str]):
+        """Remplace les alias du registre (et reconstruit son index)."""
+        self.registry.update(aliases=app_aliases)
+    
+    def _compile_patterns(self):
+        """
+        Compile les patterns une fois pour toutes et indexe leurs mots déclencheurs.
+        
+        Un pattern qui commence par "(?:ferme|quitte|...)\\s" ne peut
+        correspondre que si le texte contient l'un de ces mots suivi d'un
+        espace : il n'est testé que dans ce cas. Les autres (ex: nom d'app
+        seul) sont toujours testés. À rappeler après toute modification de
+        self.patterns.
+        """
+        # (intention, pattern compilé) dans l'ordre de priorité
+        self._compiled: List[Tuple[str, re.Pattern]] = []
+        # mot déclencheur -> indices des patterns qu'il rend possibles
+        self._keyword_index: Dict[str, List[int]] = {}
+        # indices des patterns sans mot déclencheur
+        self._always_tested: List[int] = []
+        
+        for intent, patterns in self.patterns.items():
+            for pattern in patterns:
+                index = len(self._compiled)
+                self._compiled.append((intent, re.compile(pattern, re.IGNORECASE)))
+                leading = LEADING_KEYWORDS.match(pattern)
+                if not leading:
+                    self._always_tested.append(index)
+                    continue
+                for keyword in leading.group(1).replace("\\'", "'").split('|'):
+                    self._keyword_index.setdefault(keyword.lower(), []).append(index)
+        # Longueurs extrêmes des mots déclencheurs : bornes des suffixes à chercher
+        lengths = [len(keyword) for keyword in self._keyword_index] or [1]
+        self._keyword_lengths = (min(lengths), max(lengths))
     
     def _correct_transcription_errors(self, texte: str) -> str:
         """
@@ -109,18 +179,15 @@ class IntentParser:
         Returns:
             Texte corrigé
         """
-        words = texte.split()
-        corrected_words = []
-        
-        for word in words:
-            # Vérifier si le mot a une correction connue
-            if word in self.transcription_corrections:
-                corrected_words.append(self.transcription_corrections[word])
-                logger.debug(f"Correction : '{word}' -> '{self.transcription_corrections[word]}'")
-            else:
-                corrected_words.append(word)
-        
-        return ' '.join(corrected_words)
+        return self._corrector.correct(texte)
+    
+    def _compile_corrections(self):
+        """
+        Range self.transcription_corrections (mots et phrases) dans le trie
+        du correcteur. À rappeler après toute modification du dictionnaire.
+        """
+        self._corrector = PhraseCorrector(self.transcription_corrections)
+        logger.debug(f"Corrections de transcription : {len(self._corrector)} entrées")
 
     def _clean_parasitic_words(self, texte: str) -> str:
         """
@@ -132,22 +199,9 @@ class IntentParser:
         Returns:
             Texte nettoyé
         """
-        # Liste de mots/expressions parasites à supprimer
-        parasites = [
-            r"\bs'il te pla[îi]t\b", r"\bs'il vous pla[îi]t\b", r"\bstp\b", r"\bsvp\b",
-            r"\bmerci\b", r"\bvite\b", r"\bmaintenant\b", r"\btout de suite\b",
-            r"\ble\b", r"\bla\b", r"\bles\b", r"\bl'\b", r"\bun\b", r"\bune\b", r"\bdes\b",
-            r"\bmon\b", r"\bma\b", r"\bmes\b", r"\bton\b", r"\bta\b", r"\btes\b",
-            r"\bce\b", r"\bcette\b", r"\bces\b", r"\bcet\b"
-        ]
-        
-        cleaned = texte
-        for p in parasites:
-            cleaned = re.sub(p, "", cleaned, flags=re.IGNORECASE)
-            
+        cleaned = PARASITIC_WORDS.sub('', texte)
         # Nettoyer les espaces multiples
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        return cleaned
+        return WHITESPACE.sub(' ', cleaned).strip()
     
     def _resolve_app_name(self, app_name: str) -> str:
         """
@@ -159,34 +213,136 @@ class IntentParser:
         Returns:
             Nom résolu de l'application
         """
-        # 1. Vérifier d'abord les alias exacts
-        if app_name in self.app_aliases:
-            resolved = self.app_aliases[app_name]
-            logger.debug(f"Alias trouvé : '{app_name}' -> '{resolved}'")
-            return resolved
-        
-        # 2. Vérifier si le nom existe directement dans les applications
-        if app_name in self.app_paths:
-            return app_name
-        
-        # 3. Fuzzy matching avec les noms d'applications et alias disponibles
-        all_possible_names = list(self.app_paths.keys()) + list(self.app_aliases.keys())
-        matches = get_close_matches(app_name, all_possible_names, n=1, cutoff=0.6)
-        
-        if matches:
-            match = matches[0]
-            # Si c'est un alias, résoudre
-            if match in self.app_aliases:
-                resolved = self.app_aliases[match]
-                logger.info(f"Fuzzy match via alias : '{app_name}' -> '{match}' -> '{resolved}'")
-                return resolved
-            else:
-                logger.info(f"Fuzzy match : '{app_name}' -> '{match}'")
-                return match
+        # Alias, nom exact, phonétique, partiel puis approché (résultat mis en
+        # cache par le registre : le contrôleur retrouvera ce nom directement)
+        # Aucune correspondance : le nom original est conservé
+        return self.registry.resolve(app_name) or app_name
+    
+    def _normalize(self, texte: str) -> str:
+        """
+        Normalise un texte transcrit avant l'analyse.
+        
+        Args:
+            texte: Texte brut
+            
+        Returns:
+            Texte en minuscules, sans ponctuation, erreurs de transcription corrigées
+        """
+        # Normaliser le texte
+        texte = texte.lower().strip()
+        
+        # Supprimer la ponctuation (garder lettres, chiffres et espaces)
+        texte = PUNCTUATION.sub('', texte)
+        
+        # Corriger les erreurs de transcription courantes
+        return self._correct_transcription_errors(texte)
+    
+    def _match(self, texte: str) -> Optional[Tuple[str, re.Match]]:
+        """
+        Cherche le premier pattern correspondant (dans l'ordre de priorité).
+        
+        Seuls les patterns dont un mot déclencheur termine un mot du texte
+        suivi d'un espace ("referme chrome" contient "ferme ") sont testés,
+        avec ceux qui n'en ont pas : le résultat est celui d'un parcours de
+        tous les patterns, quel que soit leur nombre.
+        
+        Args:
+            texte: Texte normalisé
+            
+        Returns:
+            (intention, match) ou None
+        """
+        candidates = set(self._always_tested)
+        keyword_index = self._keyword_index
+        shortest, longest = self._keyword_lengths
+        # Le dernier mot n'est suivi d'aucun espace
+        for word in texte.lower().split()[:-1]:
+            for start in range(max(0, len(word) - longest), len(word) - shortest + 1):
+                indices = keyword_index.get(word[start:])
+                if indices:
+                    candidates.update(indices)
+        
+        for index in sorted(candidates):
+            intent, pattern = self._compiled[index]
+            match = pattern.search(texte)
+            if match:
+                return intent, match
+        return None
+    
+    def is_complete_command(self, texte: str) -> bool:
+        """
+        Indique si un texte (éventuellement partiel) forme déjà une commande
+        complète, sans attendre la suite de la phrase. Utilisé par l'endpointing
+        pour arrêter l'enregistrement plus tôt.
         
-        # 4. Aucune correspondance, retourner le nom original
-        logger.debug(f"Aucune correspondance pour : '{app_name}'")
-        return app_name
+        Les commandes à texte libre (recherche, dictée) ne sont jamais
+        considérées complètes : l'utilisateur peut encore les prolonger.
+        
+        Args:
+            texte: Texte transcrit
+            
+        Returns:
+            True si la commande est complète
+        """
+        if not texte or not texte.strip():
+            return False
+        
+        texte = self._normalize(texte)
+        found = self._match(texte)
+        if not found:
+            return False
+        
+        intent, match = found
+        if intent in ('scroll_down', 'scroll_up', 'close_window', 'small_talk'):
+            return True
+        
+        if intent in ('open_app', 'close_app'):
+            # Complète seulement si le nom désigne une application connue
+            return self._is_known_app(match.group(1))
+        
+        return False
+    
+    def _is_known_app(self, app_name: str) -> bool:
+        """
+        Indique si un nom extrait d'une commande désigne une application connue.
+        
+        Args:
+            app_name: Nom brut capturé par le pattern
+            
+        Returns:
+            True si alias, application indexée, homophone ou nom très proche (AppRegistry.is_known)
+        """
+        app_name = self._clean_parasitic_words(app_name.strip())
+        if not app_name:
+            return False
+        return self.registry.is_known(app_name)
+    
+    def is_known_command(self, texte: str) -> bool:
+        """
+        Indique si un texte transcrit donne une intention exploitable.
+        Utilisé par le STT pour décider d'un second décodage (modèle plus gros).
+        
+        Contrairement à is_complete_command, les commandes à texte libre
+        (recherche, dictée) sont acceptées ; ouvrir/fermer exige une
+        application connue ("ouvre crôme" -> False).
+        
+        Args:
+            texte: Texte transcrit
+            
+        Returns:
+            True si l'intention est reconnue
+        """
+        if not texte or not texte.strip():
+            return False
+        
+        found = self._match(self._normalize(texte))
+        if not found:
+            return False
+        
+        intent, match = found
+        if intent in ('open_app', 'close_app'):
+            return self._is_known_app(match.group(1))
+        return True
     
     def parse(self, texte: str) -> Dict[str, Any]:
         """
@@ -198,36 +354,30 @@ class IntentParser:
         Returns:
             Dictionnaire contenant 'intent' et 'parameters'
         """
-        if not texte or not texte.strip():
-            return {'intent': 'unknown', 'parameters': {}}
+        with tracer.span('intent_parsing'):
+            if not texte or not texte.strip():
+                return {'intent': 'unknown', 'parameters': {}}
         
-        # Normaliser le texte
-        texte = texte.lower().strip()
-        
-        # Supprimer la ponctuation (garder lettres, chiffres et espaces)
-        texte = re.sub(r'[^\w\s]', '', texte)
+            texte = self._normalize(texte)
         
-        # Corriger les erreurs de transcription courantes
-        texte = self._correct_transcription_errors(texte)
+            # Formatage différé : parse() est sur le chemin critique de chaque commande
+            logger.info("Analyse de l'intention : '%s'", texte)
         
-        logger.info(f"Analyse de l'intention : '{texte}'")
+            # Tester chaque pattern
+            found = self._match(texte)
+            if found:
+                intent, match = found
+                parameters = self._extract_parameters(intent, match, texte)
+                result = {
+                    'intent': intent,
+                    'parameters': parameters
+                }
+                logger.info("Intention détectée : %s", result)
+                return result
         
-        # Tester chaque pattern
-        for intent, patterns in self.patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, texte, re.IGNORECASE)
-                if match:
-                    parameters = self._extract_parameters(intent, match, texte)
-                    result = {
-                        'intent': intent,
-                        'parameters': parameters
-                    }
-                    logger.info(f"Intention détectée : {result}")
-                    return result
-        
-        # Aucune intention reconnue
-        logger.warning(f"Intention inconnue pour : '{texte}'")
-        return {'intent': 'unknown', 'parameters': {'text': texte}}
+            # Aucune intention reconnue
+            logger.warning(f"Intention inconnue pour : '{texte}'")
+            return {'intent': 'unknown', 'parameters': {'text': texte}}
     
     def _extract_parameters(
         self,
@@ -336,7 +486,7 @@ class IntentParser:
             alias: L'alias (ex: "navigateur")
             app_name: Le nom réel de l'app (ex: "chrome")
         """
-        self.app_aliases[alias.lower()] = app_name.lower()
+        self.registry.add_alias(alias, app_name)
         logger.info(f"Alias ajouté : '{alias}' -> '{app_name}'")
     
     def set_app_aliases(self, aliases: Dict[str, str]):
@@ -346,7 +496,7 @@ class IntentParser:
         Args:
             aliases: Dictionnaire des alias
         """
-        self.app_aliases = {k.lower(): v.lower() for k, v in aliases.items()}
+        self.app_aliases = aliases
         logger.info(f"Aliases d'applications configurés : {len(self.app_aliases)} entrées")
     
     def get_supported_intents(self) -> List[str]:
@@ -357,3 +507,40 @@ class IntentParser:
             Liste des noms d'intentions
         """
         return list(self.patterns.keys()) + ['unknown']
+    
+    def get_command_vocabulary(self, max_apps: int = 40) -> Tuple[List[str], List[str]]:
+        """
+        Vocabulaire des commandes, pour orienter le décodage Whisper.
+        
+        Les verbes sont extraits du premier groupe d'alternatives de chaque
+        pattern ("(?:ouvre|lance|...)") ; les applications sont les alias
+        configurés, leurs cibles puis les applications indexées.
+        
+        Args:
+            max_apps: Nombre maximal de noms d'applications
+            
+        Returns:
+            (verbes, noms d'applications), sans doublons, par ordre de priorité
+        """
+        verbs: List[str] = []
+        # Ouvrir/fermer d'abord : ce sont les commandes les plus fréquentes
+        intents = sorted(self.patterns, key=lambda intent: {'open_app': 0, 'close_app': 1}.get(intent, 2))
+        for intent in intents:
+            for pattern in self.patterns[intent]:
+                group = re.match(r'\^?\(\?:([^()]+)\)', pattern)
+                if not group:
+                    continue
+                for word in group.group(1).split('|'):
+                    if re.fullmatch(r'[^\W\d_]+', word) and word not in verbs:
+                        verbs.append(word)
+        
+        apps: List[str] = []
+        candidates = list(self.app_aliases.keys()) + list(self.app_aliases.values()) + list(self.app_paths.keys())
+        for name in candidates:
+            name = name.replace('_', ' ').strip().lower()
+            if name and name not in apps:
+                apps.append(name)
+            if len(apps) >= max_apps:
+                break
+        
+        return verbs, apps
@@ -0,0 +1,64 @@
+"""
+Clés phonétiques (français) des noms d'applications pour Jarvis Commander.
+
+Whisper écrit souvent un nom comme il l'entend ("crom", "bambou", "comète")
+plutôt que comme il est indexé ("chrome", "bambu", "comet"). Deux graphies
+qui se prononcent de la même façon reçoivent la même clé : une table
+clé -> noms, construite une fois, remplace l'énumération des variantes
+à la main (corrections de transcription, alias dupliqués dans la config).
+
+Règles dans l'esprit de Soundex/Phonex, simplifiées pour des noms courts :
+accents retirés, graphies équivalentes unifiées (ph/f, qu/k, c doux/s,
+au/eau/o, ou/oo/u...), h muet, e et s finaux muets, lettres doublées
+fusionnées. Les voyelles sont conservées (sinon "code" et "cad" se
+confondent).
+"""
+
+import re
+import unicodedata
+
+# (pattern, remplacement), appliqués dans l'ordre sur le nom en minuscules sans accents
+PHONETIC_RULES = [
+    (re.compile(r'[^a-z0-9]'), ''),
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'th'), 't'),
+    (re.compile(r'sch|sh'), 'ch'),
+    (re.compile(r'ch(?=[^aeiouy]|$)'), 'k'),  # chrome, christophe
+    (re.compile(r'ch'), 'X'),                  # chat, chercher
+    (re.compile(r'qu|q|ck|c(?![eiy])'), 'k'),
+    (re.compile(r'c'), 's'),                   # c doux (ce, ci, cy)
+    (re.compile(r'gu(?=[aeiouy])'), 'g'),
+    (re.compile(r'g(?=[eiy])'), 'j'),
+    (re.compile(r'x'), 'ks'),
+    (re.compile(r'z'), 's'),
+    (re.compile(r'w'), 'v'),
+    (re.compile(r'y'), 'i'),
+    (re.compile(r'h'), ''),
+    (re.compile(r'm(?=[bp])'), 'n'),           # nasales : bambu = banbu
+    (re.compile(r'eau|au'), 'o'),
+    (re.compile(r'ou|oo'), 'u'),
+    (re.compile(r'ai|ei|eu'), 'e'),
+    (re.compile(r'(?<=.)(?:e?s|e)$'), ''),     # e et s finaux muets
+    (re.compile(r'(.)\1+'), r'\1'),
+]
+
+
+def strip_accents(text: str) -> str:
+    """Retire les accents (é -> e, ç -> c...)."""
+    return ''.join(c for c in unicodedata.normalize('NFD', text) if not unicodedata.combining(c))
+
+
+def phonetic_key(name: str) -> str:
+    """
+    Clé phonétique d'un nom d'application.
+
+    Args:
+        name: Nom tel qu'indexé ou transcrit (ex: "Bambou", "bambu_studio")
+
+    Returns:
+        Clé en majuscules (ex: "BANBU"), vide si le nom ne contient ni lettre ni chiffre
+    """
+    key = strip_accents(name.lower().replace('ç', 's'))
+    for pattern, replacement in PHONETIC_RULES:
+        key = pattern.sub(replacement, key)
+    return key.upper()
@@ -0,0 +1,312 @@
+"""
+Rejeu hors ligne du pipeline vocal complet (sans micro, sans Windows).
+
+Chaque fichier WAV passe par la vraie chaîne de JarvisController :
+capture partagée (source fichier, cadence réelle) -> wake word -> STT
+(streaming, endpointing, cascade...) -> IntentParser -> action. Le
+SystemController est remplacé par un enregistreur : aucune application
+n'est lancée, les actions demandées sont comparées aux attentes.
+
+Scénario facultatif à côté de chaque `nom.wav` :
+- `nom.json` : {"wake_at": 0.9, "text": "ouvre chrome", "intent": "open_app",
+  "action": ["open_app", "chrome"]} (toutes les clés sont facultatives) ;
+- sinon `nom.txt` : texte de référence.
+
+Wake word : déclenché à `wake_at` secondes (0 par défaut, fin supposée de
+"Jarvis") ; --porcupine utilise le vrai détecteur (clé Picovoice requise).
+
+Mesures par commande (instants relatifs au wake word) : fin de parole,
+arrêt de l'enregistrement, texte, intention, action ; et la latence fin de
+parole -> action. Les seuils --max-latency-ms et --min-accuracy font
+échouer le rejeu (code 1) pour une utilisation en CI.
+
+Exemple : python replay.py scenarios/ --output replay.jsonl --max-latency-ms 1500
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+import yaml
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from audio.capture import AudioCaptureService, ArraySource
+from audio.stt import STTEngine
+from nlu.intent_parser import IntentParser
+from nlu.app_registry import AppRegistry
+from actions.dispatch import execute_intent
+from transcribe_batch import wav_files, load_corpus, words, word_errors
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+# Silence ajouté après chaque fichier (laisse l'endpointing conclure)
+TAIL_SILENCE = 2.0
+
+
+class RecordingSystemController:
+    """SystemController factice : mémorise les actions au lieu de les exécuter."""
+
+    def __init__(self, app_paths: Optional[Dict[str, str]] = None, registry: Optional[AppRegistry] = None):
+        """
+        Args:
+            app_paths: Applications connues (nom -> chemin), comme le vrai contrôleur
+            registry: Registre partagé avec le parseur (prioritaire sur app_paths)
+        """
+        self.registry = registry or AppRegistry(app_paths)
+        self.actions: List[Tuple[str, Any]] = []
+
+    def get_app_path(self, app_name: str) -> Optional[str]:
+        """Chemin d'une application connue (résolution du registre, comme le vrai contrôleur)."""
+        return self.registry.get_path(app_name)
+
+    def open_app(self, app_name: str) -> Tuple[bool, str]:
+        self.actions.append(('open_app', app_name))
+        return True, app_name
+
+    def close_app(self, app_name: str) -> Tuple[bool, str]:
+        self.actions.append(('close_app', app_name))
+        return True, app_name
+
+    def web_search(self, query: str) -> bool:
+        self.actions.append(('web_search', query))
+        return True
+
+
+def execute_action(controller: RecordingSystemController, intent: str, params: Dict[str, Any]) -> Optional[Tuple[str, Any]]:
+    """
+    Exécute l'intention comme JarvisController._execute_action (même
+    execute_intent ; les réponses vocales et le repli LLM sont ignorés).
+
+    Returns:
+        Action enregistrée (nom, argument), ou None
+    """
+    count = len(controller.actions)
+    if execute_intent(controller, intent, params) is None:
+        # Commande non système : le contrôleur passe la main au cerveau (LLM)
+        controller.actions.append(('brain', params.get('text', '')))
+    return controller.actions[-1] if len(controller.actions) > count else None
+
+
+class ScriptedWakeWord:
+    """Wake word déclenché à une position fixée du flux (pas de Porcupine)."""
+
+    def __init__(self):
+        self.last_detection_position: Optional[int] = None
+
+    def wait(self, capture: AudioCaptureService, position: int, timeout: float) -> bool:
+        """Attend que le flux atteigne `position` et y place la détection."""
+        # Au moins un bloc reçu : time_at() a besoin d'un instant de référence
+        if not capture.wait_for_data(max(position, 1), timeout):
+            return False
+        self.last_detection_position = position
+        return True
+
+
+class PorcupineWakeWord:
+    """Vrai détecteur Porcupine branché sur la capture rejouée."""
+
+    def __init__(self, access_key: str, sensitivity: float):
+        from audio.wake_word import WakeWordDetector
+        self._detected = threading.Event()
+        self.detector = WakeWordDetector(
+            access_key=access_key,
+            sensitivity=sensitivity,
+            callback=self._detected.set
+        )
+
+    @property
+    def last_detection_position(self) -> Optional[int]:
+        return self.detector.last_detection_position
+
+    def wait(self, capture: AudioCaptureService, position: int, timeout: float) -> bool:
+        """Écoute le flux jusqu'à la détection de "Jarvis"."""
+        self._detected.clear()
+        self.detector.capture_service = capture
+        if not self.detector.start_listening():
+            return False
+        try:
+            return self._detected.wait(timeout)
+        finally:
+            self.detector.stop_listening()
+
+
+class ReplayRunner:
+    """Rejoue des fichiers WAV à travers le pipeline et mesure chaque étape."""
+
+    def __init__(self, config: Dict[str, Any], model: Optional[str] = None, porcupine: bool = False):
+        """
+        Args:
+            config: Contenu de config.yaml
+            model: Modèle Whisper (prioritaire sur la config)
+            porcupine: Utiliser le vrai détecteur de wake word
+        """
+        stt_conf = dict(config.get('stt', {}))
+        if model:
+            stt_conf['model'] = model
+        self.engine = STTEngine.from_config(stt_conf, config.get('audio', {}), background_load=False)
+
+        registry = AppRegistry(config.get('applications', {}), config.get('app_aliases', {}))
+        self.intent_parser = IntentParser(registry=registry, corrections=config.get('transcription_corrections', {}))
+        self.system_controller = RecordingSystemController(registry=registry)
+        # Même câblage que JarvisController.initialize_components
+        self.engine.set_command_checker(self.intent_parser.is_complete_command)
+        self.engine.set_intent_checker(self.intent_parser.is_known_command)
+        if stt_conf.get('dynamic_vocabulary', True):
+            self.engine.set_vocabulary(*self.intent_parser.get_command_vocabulary())
+
+        if porcupine:
+            ww_conf = config.get('wake_word', {})
+            self.wake_word = PorcupineWakeWord(ww_conf.get('access_key', ''), ww_conf.get('sensitivity', 0.7))
+        else:
+            self.wake_word = ScriptedWakeWord()
+
+    def run(self, audio: np.ndarray, wake_at: float = 0.0) -> Dict[str, Any]:
+        """
+        Rejoue une commande.
+
+        Args:
+            audio: Audio float32 à 16 kHz
+            wake_at: Fin du wake word dans le fichier (secondes)
+
+        Returns:
+            Texte, intention, action et instants de chaque étape (ms après le wake word)
+        """
+        capture = AudioCaptureService(
+            sample_rate=SAMPLE_RATE,
+            source=ArraySource(audio, realtime=True, pad_silence=TAIL_SILENCE)
+        )
+        self.engine.capture_service = capture
+        result: Dict[str, Any] = {'text': None, 'intent': None, 'action': None, 'stages_ms': {}}
+
+        capture.start()
+        try:
+            duration = len(audio) / SAMPLE_RATE + TAIL_SILENCE
+            if not self.wake_word.wait(capture, int(wake_at * SAMPLE_RATE), timeout=duration + 1.0):
+                result['error'] = "wake word non détecté"
+                return result
+            wake_position = self.wake_word.last_detection_position
+            t_wake = capture.time_at(wake_position)
+
+            texte = self.engine.ecouter_et_transcrire(start_position=wake_position)
+            t_text = time.monotonic()
+            intent_data = self.intent_parser.parse(texte or "")
+            t_intent = time.monotonic()
+            action = execute_action(self.system_controller, intent_data['intent'], intent_data['parameters']) if texte else None
+            t_action = time.monotonic()
+
+            stages = {'text': t_text, 'intent': t_intent, 'action': t_action}
+            recording = self.engine.last_recording
+            if recording.get('stopped_at'):
+                stages['stop'] = recording['stopped_at']
+            if recording.get('speech_end') is not None and recording.get('start_position') is not None:
+                stages['speech_end'] = capture.time_at(recording['start_position'] + recording['speech_end'])
+
+            result.update(
+                text=texte,
+                intent=intent_data['intent'],
+                action=list(action) if action else None,
+                stages_ms={name: (t - t_wake) * 1000 for name, t in stages.items()},
+            )
+            if 'speech_end' in stages:
+                result['latency_ms'] = (t_action - stages['speech_end']) * 1000
+            return result
+        finally:
+            capture.stop()
+            self.engine.capture_service = None
+
+
+def load_scenario(wav_path: str, reference: Optional[str]) -> Dict[str, Any]:
+    """Attentes d'un fichier : nom.json à côté du WAV, sinon le texte de référence (nom.txt)."""
+    json_path = os.path.splitext(wav_path)[0] + '.json'
+    if os.path.exists(json_path):
+        with open(json_path, encoding='utf-8') as f:
+            return json.load(f)
+    return {'text': reference} if reference else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help="Fichiers WAV ou dossiers de scénarios")
+    parser.add_argument('--model', help="Modèle Whisper (sinon celui de config.yaml)")
+    parser.add_argument('--porcupine', action='store_true', help="Utiliser le vrai détecteur de wake word")
+    parser.add_argument('--output', help="Résultats détaillés (JSON lines)")
+    parser.add_argument('--max-latency-ms', type=float, help="Échec si la latence p95 fin de parole -> action dépasse ce seuil")
+    parser.add_argument('--min-accuracy', type=float, help="Échec si la part d'intentions correctes est inférieure (0-1)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(name)s - %(message)s')
+
+    corpus = load_corpus(args.paths)
+    if not corpus:
+        print("Aucun fichier WAV trouvé")
+        return 2
+
+    config_path = os.path.join(os.path.dirname(__file__), 'config', 'config.yaml')
+    with open(config_path, encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    runner = ReplayRunner(config, model=args.model, porcupine=args.porcupine)
+    if not runner.engine.is_ready:
+        print("Modèle Whisper indisponible (faster-whisper absent ou téléchargement impossible)")
+        return 2
+
+    # Chemins relatifs (même ordre que le corpus) : deux dossiers peuvent contenir le même nom de fichier
+    paths = [os.path.relpath(path) for path in wav_files(args.paths)]
+    results = []
+    errors = total_words = intents_ok = intents_expected = 0
+    for name, (_, audio, reference) in zip(paths, corpus):
+        scenario = load_scenario(name, reference)
+        result = runner.run(audio, scenario.get('wake_at', 0.0))
+        result['file'] = name
+
+        if scenario.get('text'):
+            errors += word_errors(scenario['text'], result['text'])
+            total_words += len(words(scenario['text']))
+        expected_intent = scenario.get('intent') or (
+            runner.intent_parser.parse(scenario['text'])['intent'] if scenario.get('text') else None
+        )
+        if expected_intent:
+            intents_expected += 1
+            result['intent_ok'] = result['intent'] == expected_intent
+            intents_ok += result['intent_ok']
+        if 'action' in scenario:
+            result['action_ok'] = result['action'] == scenario['action']
+        results.append(result)
+
+        stages = " ".join(f"{stage} {ms:.0f}" for stage, ms in sorted(result['stages_ms'].items(), key=lambda item: item[1]))
+        marker = {True: "✅", False: "❌"}.get(result.get('intent_ok'), "")
+        print(f"  {name}: '{result['text']}' -> {result['intent']} {result['action'] or ''} {marker} | {stages} ms")
+
+    latencies = [r['latency_ms'] for r in results if 'latency_ms' in r]
+    print(f"{len(results)} commandes rejouées")
+    if total_words:
+        print(f"  WER {errors / total_words * 100:.1f}%")
+    if intents_expected:
+        print(f"  intentions correctes {intents_ok}/{intents_expected}")
+    if latencies:
+        print(f"  fin de parole -> action p50 {np.percentile(latencies, 50):.0f} ms p95 {np.percentile(latencies, 95):.0f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    failed = False
+    if args.max_latency_ms is not None and latencies and np.percentile(latencies, 95) > args.max_latency_ms:
+        print(f"❌ Latence p95 au-dessus de {args.max_latency_ms:.0f} ms")
+        failed = True
+    if args.min_accuracy is not None and intents_expected and intents_ok / intents_expected < args.min_accuracy:
+        print(f"❌ Précision des intentions sous {args.min_accuracy:.0%}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ import webbrowser
 import platform
 import subprocess
 from config_manager import config
+from nlu.app_registry import app_registry
 
 def execute_skill(skill_name):
     """Exécute une compétence par son nom."""
@@ -22,7 +23,8 @@ def execute_skill(skill_name):
 
 def open_chrome():
     """Ouvre Google Chrome."""
-    path = config.get_app_path("chrome")
+    # Registre des applications (config.yaml + indexées), sinon config.json de l'UI
+    path = app_registry.get_path("chrome") or config.get_app_path("chrome")
     
     # Si le chemin est défini et existe, on l'utilise
     if path and os.path.exists(path):
@@ -0,0 +1,97 @@
+"""
+Test du service de capture partagé (réveil des abonnés, retards).
+
+Une source rejoue une rampe (chaque échantillon vaut sa position absolue) :
+chaque abonné doit la relire sans trou ni doublon. Un abonné en retard
+reçoit la suite du flux et la perte est comptée. L'arrêt du service
+réveille un lecteur en attente sans délai.
+
+Exécuter depuis src_v2 : python test_capture.py (ou via pytest)
+"""
+
+import os
+import sys
+import time
+import threading
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from audio.capture import AudioCaptureService, ArraySource
+
+SAMPLE_RATE = 16000
+BLOCK = 512
+
+
+class SilentSource:
+    """Source qui ne produit rien (lecteurs en attente)."""
+
+    def start(self, push, sample_rate: int, blocksize: int):
+        pass
+
+    def stop(self):
+        pass
+
+
+def test_subscribers_read_whole_stream():
+    # Cadence réelle : les lecteurs attendent chaque bloc (réveil par Event)
+    ramp = np.arange(16 * BLOCK, dtype=np.float32)
+    service = AudioCaptureService(SAMPLE_RATE, BLOCK, source=ArraySource(ramp, realtime=True))
+    subscriptions = [service.subscribe("a", 0), service.subscribe("b", 0)]
+    received = {subscription.name: [] for subscription in subscriptions}
+
+    def reader(subscription):
+        while subscription.position < len(ramp):
+            samples = subscription.read(BLOCK, timeout=2.0)
+            if samples is None:
+                break
+            received[subscription.name].append(samples.copy())
+
+    assert service.start()
+    threads = [threading.Thread(target=reader, args=(s,)) for s in subscriptions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5.0)
+    service.stop()
+
+    for subscription in subscriptions:
+        assert np.array_equal(np.concatenate(received[subscription.name]), ramp)
+        assert subscription.overruns == 0
+
+
+def test_overrun_is_counted():
+    service = AudioCaptureService(SAMPLE_RATE, BLOCK, buffer_duration=4 * BLOCK / SAMPLE_RATE, source=SilentSource())
+    subscription = service.subscribe("stt", 0)
+    for i in range(10):
+        service._push(np.arange(i * BLOCK, (i + 1) * BLOCK, dtype=np.float32))
+
+    samples = subscription.read(BLOCK, timeout=0.1)
+    assert samples is not None and samples[0] == 6 * BLOCK
+    assert subscription.overruns == 1
+    assert subscription.lost_samples == 6 * BLOCK
+
+
+def test_stop_wakes_waiting_reader():
+    service = AudioCaptureService(SAMPLE_RATE, BLOCK, source=SilentSource())
+    assert service.start()
+    subscription = service.subscribe("wake_word")
+    result = {}
+
+    def reader():
+        result['samples'] = subscription.read(BLOCK)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    time.sleep(0.05)
+    service.stop()
+    thread.join(timeout=2.0)
+    assert not thread.is_alive()
+    assert result['samples'] is None
+
+
+if __name__ == "__main__":
+    test_subscribers_read_whole_stream()
+    test_overrun_is_counted()
+    test_stop_wakes_waiting_reader()
+    print("✅ OK")
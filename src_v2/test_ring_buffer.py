@@ -0,0 +1,98 @@
+"""
+Test du buffer circulaire audio (un écrivain, des lecteurs concurrents).
+
+Un écrivain remplit le buffer d'une rampe (chaque échantillon vaut sa
+position absolue) pendant que des lecteurs lisent juste au-dessus de la
+limite d'écrasement. Toute lecture acceptée doit contenir exactement sa
+rampe : une lecture déchirée (écrasée pendant la copie) doit être refusée.
+
+Exécuter depuis src_v2 : python test_ring_buffer.py (ou via pytest)
+"""
+
+import os
+import sys
+import threading
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from audio.ring_buffer import AudioRingBuffer
+
+CAPACITY = 4096
+BLOCK = 1024
+READ = 2048
+WRITES = 50000
+
+
+def run_concurrent(readers: int = 2):
+    """
+    Lance l'écrivain et les lecteurs.
+
+    Returns:
+        (lectures acceptées, lectures refusées, lectures déchirées)
+    """
+    ring = AudioRingBuffer(CAPACITY, dtype=np.int64)
+    done = threading.Event()
+    counts = {'accepted': 0, 'rejected': 0, 'torn': 0}
+    lock = threading.Lock()
+
+    def writer():
+        block = np.arange(BLOCK, dtype=np.int64)
+        for i in range(WRITES):
+            ring.write(block + i * BLOCK)
+        done.set()
+
+    def reader():
+        out = np.empty(READ, dtype=np.int64)
+        accepted = rejected = torn = 0
+        while not done.is_set():
+            # Lecteur en retard : juste au-dessus de la limite d'écrasement
+            position = ring.oldest_position
+            samples = ring.read(position, READ, out)
+            if samples is None:
+                rejected += 1
+            elif np.array_equal(samples, np.arange(position, position + READ)):
+                accepted += 1
+            else:
+                torn += 1
+        with lock:
+            counts['accepted'] += accepted
+            counts['rejected'] += rejected
+            counts['torn'] += torn
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    # Bascules de threads fréquentes : maximise les entrelacements
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    return counts['accepted'], counts['rejected'], counts['torn']
+
+
+def test_concurrent_reads_never_torn():
+    accepted, rejected, torn = run_concurrent()
+    assert torn == 0, f"{torn} lectures déchirées acceptées"
+    assert accepted > 0
+
+
+def test_read_bounds():
+    ring = AudioRingBuffer(8, dtype=np.int64)
+    ring.write(np.arange(12))
+    assert ring.oldest_position == 4
+    assert ring.read(3, 2) is None
+    assert ring.read(10, 4) is None
+    assert ring.read(4, 8).tolist() == list(range(4, 12))
+    assert ring.latest(3).tolist() == [9, 10, 11]
+
+
+if __name__ == "__main__":
+    accepted, rejected, torn = run_concurrent()
+    print(f"lectures acceptées {accepted}, refusées {rejected}, déchirées {torn}")
+    test_read_bounds()
+    print("✅ OK" if torn == 0 else "❌ lectures déchirées")
@@ -0,0 +1,144 @@
+"""
+Transcription par lot de commandes enregistrées (WAV).
+
+Usages :
+- non-régression du STT : chaque `nom.wav` accompagné de `nom.txt`
+  (transcription de référence) donne un WER et un taux de phrases exactes ;
+- retranscription de l'audio journalisé après un changement de modèle
+  (--output : fichier TSV nom<TAB>texte).
+
+Le débit (extraits/s, facteur temps réel) est toujours affiché ;
+--compare mesure aussi la transcription un extrait à la fois.
+
+Exemple : python transcribe_batch.py enregistrements/ --model small --batch-size 8 --output small.tsv
+"""
+
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+import logging
+from typing import List, Tuple, Optional
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+SAMPLE_RATE = 16000
+
+
+def wav_files(paths: List[str]) -> List[str]:
+    """Fichiers .wav désignés (fichiers ou contenu des dossiers, triés)."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.wav'))))
+        else:
+            files.append(path)
+    return files
+
+
+def load_corpus(paths: List[str]) -> List[Tuple[str, np.ndarray, Optional[str]]]:
+    """
+    Charge les WAV désignés (fichiers ou dossiers) et leurs références.
+
+    Args:
+        paths: Fichiers .wav ou dossiers en contenant
+
+    Returns:
+        Liste de (nom, audio float32, référence ou None)
+    """
+    from audio.capture import load_wav
+    corpus = []
+    for wav_path in wav_files(paths):
+        reference = None
+        txt_path = os.path.splitext(wav_path)[0] + '.txt'
+        if os.path.exists(txt_path):
+            with open(txt_path, encoding='utf-8') as f:
+                reference = f.read().strip()
+        corpus.append((os.path.basename(wav_path), load_wav(wav_path, SAMPLE_RATE), reference))
+    return corpus
+
+
+def words(texte: Optional[str]) -> List[str]:
+    """Mots normalisés (minuscules, sans ponctuation)."""
+    return re.sub(r'[^\w\s]', ' ', (texte or '').lower()).split()
+
+
+def word_errors(reference: str, hypothesis: Optional[str]) -> int:
+    """Distance d'édition en mots (substitutions + insertions + suppressions)."""
+    ref, hyp = words(reference), words(hypothesis)
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (r != h))
+    return row[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help="Fichiers WAV ou dossiers")
+    parser.add_argument('--model', default='tiny', help="Taille du modèle Whisper")
+    parser.add_argument('--batch-size', type=int, default=8, help="Extraits décodés ensemble")
+    parser.add_argument('--output', help="Fichier TSV des transcriptions")
+    parser.add_argument('--compare', action='store_true', help="Mesurer aussi la transcription extrait par extrait")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    corpus = load_corpus(args.paths)
+    if not corpus:
+        print("Aucun fichier WAV trouvé")
+        return
+
+    from audio.stt import STTEngine
+    engine = STTEngine(
+        model_size=args.model,
+        use_gpu=False,
+        enable_vad=False,
+        background_load=False,
+        cache_size=0
+    )
+    if not engine.is_ready:
+        print("Modèle Whisper indisponible (faster-whisper absent ou téléchargement impossible)")
+        return
+
+    clips = [audio for _, audio, _ in corpus]
+    audio_s = sum(len(audio) for audio in clips) / SAMPLE_RATE
+    print(f"{len(clips)} extraits ({audio_s:.1f}s d'audio), modèle '{args.model}'")
+
+    start = time.perf_counter()
+    texts = engine.transcribe_batch(clips, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    label = f"par lot ({args.batch_size})"
+    print(f"  {label:<18} {len(clips) / elapsed:6.1f} extraits/s | {audio_s / elapsed:5.1f}x temps réel")
+
+    if args.compare:
+        start = time.perf_counter()
+        for audio in clips:
+            engine._decode(engine._preprocess_audio(audio), cascade=False)
+        elapsed = time.perf_counter() - start
+        print(f"  {'un par un':<18} {len(clips) / elapsed:6.1f} extraits/s | {audio_s / elapsed:5.1f}x temps réel")
+
+    references = [(reference, texte) for (_, _, reference), texte in zip(corpus, texts) if reference is not None]
+    if references:
+        errors = sum(word_errors(reference, texte) for reference, texte in references)
+        total = sum(len(words(reference)) for reference, _ in references)
+        exact = sum(words(reference) == words(texte) for reference, texte in references)
+        print(f"  WER {errors / max(total, 1) * 100:.1f}% | phrases exactes {exact}/{len(references)}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for (name, _, _), texte in zip(corpus, texts):
+                f.write(f"{name}\t{texte or ''}\n")
+        print(f"  transcriptions écrites dans {args.output}")
+    else:
+        for (name, _, reference), texte in zip(corpus, texts):
+            marker = "" if reference is None else (" ✅" if words(reference) == words(texte) else f" ❌ (attendu : {reference})")
+            print(f"  {name}: {texte}{marker}")
+
+
+if __name__ == "__main__":
+    main()
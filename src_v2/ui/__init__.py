@@ -6,6 +6,20 @@ from datetime import datetime
 from nicegui import ui, app
 import queue
 from config_manager import config
+from utils.tracing import tracer
+
+# Étapes tracées affichées dans le panneau DIAGNOSTICS (ordre du pipeline)
+LATENCY_STAGES = [
+    ('wake_word', 'WAKE WORD'),
+    ('endpointing', 'FIN DE PAROLE'),
+    ('filtering', 'FILTRAGE'),
+    ('whisper_decode', 'WHISPER'),
+    ('whisper_fallback', 'WHISPER REPLI'),
+    ('transcription', 'TEXTE FINAL'),
+    ('intent_parsing', 'INTENTION'),
+    ('action', 'ACTION'),
+    ('end_to_end', 'BOUT EN BOUT'),
+]
 
 # --- CSS GLOBAL & THEME V2.0 ---
 THEME_CSS = """
@@ -190,6 +204,8 @@ class JarvisUI:
         self.start_overlay = None
         self.start_overlay = None
         self.reactor_core = None
+        self.latency_container = None
+        self._latency_version = -1
         self.controller = None # Référence au contrôleur principal
         
         # Configuration de l'app
@@ -200,6 +216,8 @@ class JarvisUI:
         
         # Timer pour l'heure
         self.timer = ui.timer(1.0, self.update_time)
+        # Timer pour les latences (rafraîchies après chaque commande)
+        self.latency_timer = ui.timer(2.0, self.update_latency_panel)
 
         # --- GESTION THREAD-SAFE ---
         self._ui_queue = queue.Queue()
@@ -278,10 +296,11 @@ class JarvisUI:
                     
                     ui.separator().classes('bg-cyan-900/50 my-2')
                     
-                    # Fake Terminal Output
-                    with ui.column().classes('w-full font-mono text-[10px] text-cyan-600 opacity-70 gap-1'):
-                        for i in range(5):
-                            ui.label(f"> CHECKING SECTOR {i+1}0{i}... OK")
+                    # Latences par étape (p50 / p95 des dernières commandes)
+                    ui.label('LATENCES P50 / P95 (MS)').classes('text-xs font-bold tracking-wider')
+                    self.latency_container = ui.column().classes('w-full font-mono text-[10px] text-cyan-600 opacity-70 gap-1 whitespace-pre')
+                    with self.latency_container:
+                        ui.label("> EN ATTENTE D'UNE COMMANDE...")
 
                 # Footer Panel
                 ui.label('STARK INDUSTRIES // CONFIDENTIAL').classes('text-[9px] text-center w-full opacity-40 tracking-widest mt-2')
@@ -342,6 +361,20 @@ class JarvisUI:
         if self.time_label: self.time_label.text = now.strftime('%H:%M:%S')
         if self.date_label: self.date_label.text = now.strftime('%A %d %B %Y').upper()
 
+    def update_latency_panel(self):
+        """Affiche les percentiles par étape du traceur (si de nouvelles commandes sont terminées)."""
+        if not self.latency_container or tracer.completed == self._latency_version:
+            return
+        self._latency_version = tracer.completed
+        summary = tracer.summary()
+        self.latency_container.clear()
+        with self.latency_container:
+            for stage, label in LATENCY_STAGES:
+                if stage in summary:
+                    stats = summary[stage]
+                    ui.label(f"> {label:<14} {stats['p50']:6.0f} / {stats['p95']:6.0f}")
+            ui.label(f"> {tracer.completed} COMMANDES TRACÉES")
+
     def add_log(self, message, source="SYS"):
         if self.logs_container:
             timestamp = datetime.now().strftime('%H:%M:%S')
@@ -437,16 +470,18 @@ class JarvisUI:
                     indexer = AppIndexer()
                     apps = indexer.get_installed_apps(force_refresh=True)
                     
-                    # Mise à jour du contrôleur via queue thread-safe si possible, ou direct (attention)
-                    # Ici on le fait direct car c'est des dicts python (atomic operations mostly)
+                    # Le registre partagé par le parseur et le contrôleur remplace son
+                    # index d'un bloc (les alias configurés sont conservés)
                     if self.controller.system_controller:
                         conf_apps = self.controller.backend_config.get('applications', {})
-                        all_apps = apps.copy()
-                        all_apps.update(conf_apps)
-                        self.controller.system_controller.set_app_paths(all_apps)
-                        if self.controller.intent_parser:
-                            self.controller.intent_parser.app_paths = all_apps
-                    
+                        self.controller.system_controller.registry.load(apps, conf_apps)
+
+                    # Vocabulaire du décodage reconstruit sur les nouvelles applications (comme au démarrage)
+                    stt_conf = self.controller.backend_config.get('stt', {})
+                    if self.controller.stt_engine and self.controller.intent_parser \
+                            and stt_conf.get('dynamic_vocabulary', True):
+                        self.controller.stt_engine.set_vocabulary(*self.controller.intent_parser.get_command_vocabulary())
+
                     self.add_log_threadsafe(f"INDEXATION TERMINÉE: {len(apps)} APPS", "SYS")
                     self.run_threadsafe(lambda: ui.notify(f"Indexation terminée : {len(apps)} apps trouvées", type='positive'))
                     self.run_threadsafe(dialog.close)
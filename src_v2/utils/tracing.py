@@ -0,0 +1,231 @@
+"""
+Traçage de la latence de bout en bout pour Jarvis Commander.
+
+Chaque commande vocale reçoit un identifiant au wake word ; les étapes du
+pipeline (wake word, enregistrement, fin de parole, filtrage, Whisper,
+intention, action, début de la réponse vocale) y ajoutent des intervalles
+mesurés sur l'horloge monotone. Une commande terminée est exportée en JSON
+lines et alimente les percentiles p50/p95 par étape affichés dans l'interface.
+
+Une seule commande est traitée à la fois (le wake word est en pause
+pendant le traitement) : les étapes s'attachent à la commande courante,
+quel que soit le thread qui les mesure.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Latence perçue : de la fin de parole au début de la réponse (ou de l'action)
+END_TO_END = 'end_to_end'
+
+
+class Tracer:
+    """Intervalles horodatés par commande, export JSON lines et percentiles par étape."""
+
+    def __init__(self, max_commands: int = 200, export_path: Optional[str] = None, enabled: bool = True):
+        """
+        Initialise le traceur.
+
+        Args:
+            max_commands: Commandes conservées pour les percentiles
+            export_path: Fichier JSON lines des commandes terminées (None = pas d'export)
+            enabled: Traçage actif
+        """
+        self.enabled = enabled
+        self.export_path = export_path
+        self.commands: deque = deque(maxlen=max_commands)
+        # Commandes terminées depuis le lancement
+        self.completed = 0
+        self._current: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool = True, export_path: Optional[str] = None, max_commands: Optional[int] = None):
+        """
+        Applique la section `tracing` de la configuration.
+
+        Args:
+            enabled: Traçage actif
+            export_path: Fichier JSON lines (relatif au dossier de l'application)
+            max_commands: Commandes conservées pour les percentiles
+        """
+        self.enabled = enabled
+        if export_path and not os.path.isabs(export_path):
+            export_path = os.path.join(os.path.dirname(__file__), '..', export_path)
+        self.export_path = export_path
+        if max_commands:
+            self.commands = deque(self.commands, maxlen=max_commands)
+
+    @property
+    def current_id(self) -> Optional[str]:
+        """Identifiant de la commande en cours (None hors commande)."""
+        current = self._current
+        return current['id'] if current else None
+
+    def start_command(self, at: Optional[float] = None) -> Optional[str]:
+        """
+        Ouvre une nouvelle commande (au wake word).
+
+        Args:
+            at: Instant de départ (time.monotonic), maintenant si None
+
+        Returns:
+            Identifiant de la commande, ou None si le traçage est désactivé
+        """
+        if not self.enabled:
+            return None
+        command = {
+            'id': uuid.uuid4().hex[:8],
+            'start': time.monotonic() if at is None else at,
+            'wall_time': time.time(),
+            'spans': [],
+            'marks': {},
+        }
+        with self._lock:
+            self._current = command
+        return command['id']
+
+    def add_span(self, name: str, start: float, end: float, **attrs):
+        """
+        Ajoute une étape déjà mesurée à la commande courante.
+
+        Args:
+            name: Nom de l'étape
+            start: Début (time.monotonic)
+            end: Fin (time.monotonic)
+            **attrs: Détails (modèle, méthode, ...)
+        """
+        with self._lock:
+            if self._current is None:
+                return
+            span = {'name': name, 'start': start, 'end': end}
+            if attrs:
+                span['attrs'] = attrs
+            self._current['spans'].append(span)
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Mesure le bloc `with` comme une étape de la commande courante."""
+        if not self.enabled or self._current is None:
+            yield
+            return
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.monotonic(), **attrs)
+
+    def traced(self, name: str):
+        """Décorateur : chaque appel est une étape `name` (attribut `method` = nom de la fonction)."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, method=func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def mark(self, name: str, at: Optional[float] = None):
+        """
+        Note un instant de la commande courante (ex: fin de parole). Seule la
+        première occurrence est conservée.
+
+        Args:
+            name: Nom de l'instant
+            at: Instant (time.monotonic), maintenant si None
+        """
+        with self._lock:
+            if self._current is None:
+                return
+            self._current['marks'].setdefault(name, time.monotonic() if at is None else at)
+
+    def end_command(self) -> Optional[Dict[str, Any]]:
+        """
+        Clôt la commande courante, la mémorise et l'exporte.
+
+        Returns:
+            Commande exportée (durées en ms relatives au wake word), ou None
+        """
+        with self._lock:
+            command, self._current = self._current, None
+        if command is None:
+            return None
+
+        origin = command['start']
+        record = {
+            'id': command['id'],
+            'time': command['wall_time'],
+            'spans': [
+                dict(
+                    name=span['name'],
+                    start_ms=round((span['start'] - origin) * 1000, 2),
+                    duration_ms=round((span['end'] - span['start']) * 1000, 2),
+                    **({'attrs': span['attrs']} if 'attrs' in span else {})
+                )
+                for span in command['spans']
+            ],
+            'marks': {name: round((at - origin) * 1000, 2) for name, at in command['marks'].items()},
+        }
+        speech_end = command['marks'].get('speech_end')
+        response = command['marks'].get('tts_start')
+        if response is None and command['spans']:
+            response = max(span['end'] for span in command['spans'])
+        if speech_end is not None and response is not None:
+            record[END_TO_END + '_ms'] = round((response - speech_end) * 1000, 2)
+
+        self.commands.append(record)
+        self.completed += 1
+        self._export(record)
+        return record
+
+    def _export(self, record: Dict[str, Any]):
+        """Ajoute la commande au fichier JSON lines."""
+        if not self.export_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.export_path)), exist_ok=True)
+            with open(self.export_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.error(f"Export des traces impossible : {e}")
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Percentiles par étape sur les commandes conservées. Les étapes
+        répétées dans une commande (ex: décodages partiels) sont cumulées.
+
+        Returns:
+            {étape: {'count', 'p50', 'p95'}} en ms
+        """
+        durations: Dict[str, List[float]] = {}
+        for record in list(self.commands):
+            per_command: Dict[str, float] = {}
+            for span in record['spans']:
+                per_command[span['name']] = per_command.get(span['name'], 0.0) + span['duration_ms']
+            for name, duration in per_command.items():
+                durations.setdefault(name, []).append(duration)
+            if END_TO_END + '_ms' in record:
+                durations.setdefault(END_TO_END, []).append(record[END_TO_END + '_ms'])
+        return {
+            name: {
+                'count': len(values),
+                'p50': float(np.percentile(values, 50)),
+                'p95': float(np.percentile(values, 95)),
+            }
+            for name, values in durations.items()
+        }
+
+
+# Traceur partagé par tout le pipeline
+tracer = Tracer()